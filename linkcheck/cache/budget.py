@@ -0,0 +1,71 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Limit the memory used by page content across checker threads.
+"""
+import threading
+
+
+class ContentBudget:
+    """
+    Thread-safe count of the bytes of downloaded and parsed page content
+    held in memory by all checker threads. While the count is at or over
+    the budget, new downloads wait until content is released. A single
+    page larger than the budget is still checked, when no other content
+    is held in memory.
+    """
+
+    def __init__(self, max_bytes):
+        """Initialize the count.
+
+        @param max_bytes: the budget in bytes, 0 for no limit
+        @type max_bytes: int
+        """
+        self.max_bytes = max_bytes
+        self.used = 0
+        self.peak = 0
+        # number of downloads that had to wait
+        self.waits = 0
+        self.cond = threading.Condition()
+
+    def wait(self):
+        """Wait until the content held in memory is below the budget."""
+        if not self.max_bytes:
+            return
+        with self.cond:
+            if self.used >= self.max_bytes:
+                self.waits += 1
+                while self.used >= self.max_bytes:
+                    self.cond.wait()
+
+    def add(self, numbytes):
+        """Count content of given size held in memory."""
+        with self.cond:
+            self.used += numbytes
+            self.peak = max(self.peak, self.used)
+
+    def remove(self, numbytes):
+        """Count released content of given size and wake up waiting
+        downloads."""
+        with self.cond:
+            self.used -= numbytes
+            self.cond.notify_all()
+
+    def status(self):
+        """Get a tuple (used bytes, budget in bytes) for status
+        messages."""
+        with self.cond:
+            return self.used, self.max_bytes
@@ -0,0 +1,257 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Connection pool shared by the request sessions of all checker threads.
+"""
+import socket
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.poolmanager import PoolManager
+from urllib3.util.connection import allowed_gai_family
+
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:
+    # urllib3 < 2 reports resolution errors as connection errors
+    NameResolutionError = None
+
+
+def create_connection(dns_cache, address, timeout, source_address, socket_options):
+    """Connect to the first reachable address of a host resolved with
+    the DNS cache, like urllib3.util.connection.create_connection().
+
+    @param dns_cache: the cache resolving the host
+    @type dns_cache: DnsCache
+    @param address: the host and port
+    @type address: tuple
+    @return: the connected socket
+    @raises OSError: if the host cannot be resolved or connected
+    """
+    host, port = address
+    if host.startswith("["):
+        host = host.strip("[]")
+    # the addresses of all families are cached, and the families which
+    # are not supported are skipped
+    family = allowed_gai_family()
+    err = None
+    for af, socktype, proto, dummy, sa in dns_cache.getaddrinfo(
+        host, port, type=socket.SOCK_STREAM
+    ):
+        if family != socket.AF_UNSPEC and af != family:
+            continue
+        sock = None
+        try:
+            sock = socket.socket(af, socktype, proto)
+            for option in socket_options or ():
+                sock.setsockopt(*option)
+            if isinstance(timeout, (int, float)):
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sa)
+            return sock
+        except OSError as exc:
+            err = exc
+            if sock is not None:
+                sock.close()
+    if err is not None:
+        raise err
+    raise OSError("getaddrinfo returns an empty list")
+
+
+class CachedDnsMixin:
+    """
+    Connection resolving its host with the DNS cache of its pool,
+    instead of resolving it again for each new connection.
+    """
+
+    dns_cache = None
+
+    def _new_conn(self):
+        """Establish a socket connection to the host."""
+        if self.dns_cache is None:
+            return super()._new_conn()
+        try:
+            sock = create_connection(
+                self.dns_cache,
+                (getattr(self, "_dns_host", self.host), self.port),
+                self.timeout,
+                self.source_address,
+                self.socket_options,
+            )
+        except socket.gaierror as exc:
+            if NameResolutionError is None:
+                raise NewConnectionError(
+                    self, f"Failed to establish a new connection: {exc}"
+                ) from exc
+            raise NameResolutionError(self.host, self, exc) from exc
+        except socket.timeout as exc:
+            raise ConnectTimeoutError(
+                self,
+                f"Connection to {self.host} timed out."
+                f" (connect timeout={self.timeout})",
+            ) from exc
+        except OSError as exc:
+            raise NewConnectionError(
+                self, f"Failed to establish a new connection: {exc}"
+            ) from exc
+        return sock
+
+
+class CachedDnsHTTPConnection(CachedDnsMixin, HTTPConnection):
+    """HTTP connection resolving its host with the DNS cache."""
+
+
+class CachedDnsHTTPSConnection(CachedDnsMixin, HTTPSConnection):
+    """HTTPS connection resolving its host with the DNS cache."""
+
+
+class IdleExpiryMixin:
+    """
+    Connection pool closing kept-alive connections which have been idle
+    longer than the idle time of its adapter, and counting reused and
+    new connections. The adapter is set by SharedPoolManager.
+    New connections resolve their host with the DNS cache of the adapter.
+    """
+
+    adapter = None
+
+    def _new_conn(self):
+        """Create a connection using the DNS cache."""
+        conn = super()._new_conn()
+        conn.dns_cache = self.adapter.dns_cache
+        return conn
+
+    def _get_conn(self, timeout=None):
+        """Get a kept-alive connection or a new one."""
+        conn = super()._get_conn(timeout=timeout)
+        idle_since = getattr(conn, "idle_since", None)
+        if getattr(conn, "sock", None) is None or idle_since is None:
+            self.adapter.count("misses")
+        elif time.time() - idle_since > self.adapter.idle_time:
+            conn.close()
+            self.adapter.count("expired")
+            self.adapter.count("misses")
+        else:
+            self.adapter.count("hits")
+        return conn
+
+    def _put_conn(self, conn):
+        """Put a connection back into the pool to be borrowed by the
+        next request to its host."""
+        if conn is not None:
+            conn.idle_since = time.time()
+        super()._put_conn(conn)
+
+
+class SharedHTTPConnectionPool(IdleExpiryMixin, HTTPConnectionPool):
+    """HTTP connection pool of one host."""
+
+    ConnectionCls = CachedDnsHTTPConnection
+
+
+class SharedHTTPSConnectionPool(IdleExpiryMixin, HTTPSConnectionPool):
+    """HTTPS connection pool of one host."""
+
+    ConnectionCls = CachedDnsHTTPSConnection
+
+
+class SharedPoolManager(PoolManager):
+    """
+    Pool manager creating connection pools with idle expiry.
+    """
+
+    def __init__(self, adapter, *args, **kwargs):
+        """Store the adapter owning this manager."""
+        super().__init__(*args, **kwargs)
+        self.adapter = adapter
+        self.pool_classes_by_scheme = {
+            "http": SharedHTTPConnectionPool,
+            "https": SharedHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        """Create a connection pool for given host."""
+        pool = super()._new_pool(
+            scheme, host, port, request_context=request_context
+        )
+        pool.adapter = self.adapter
+        return pool
+
+
+class SharedAdapter(HTTPAdapter):
+    """
+    Thread-safe transport adapter mounted on the request sessions of all
+    checker threads, so that the threads borrow kept-alive connections
+    from a common pool instead of each opening its own connections.
+    The connections of at most max_connections / max_host_connections
+    hosts are kept, those of the least recently used host are closed
+    first.
+    """
+
+    def __init__(
+        self, max_connections, max_host_connections, idle_time, dns_cache=None
+    ):
+        """Initialize the pool.
+
+        @param max_connections: number of connections kept open
+        @type max_connections: int
+        @param max_host_connections: number of connections kept open
+            to one host
+        @type max_host_connections: int
+        @param idle_time: seconds after which an unused connection is
+            closed
+        @type idle_time: number
+        @param dns_cache: the cache resolving the hosts of new
+            connections, None to resolve them without cache
+        @type dns_cache: DnsCache or None
+        """
+        self.idle_time = idle_time
+        self.dns_cache = dns_cache
+        self.lock = threading.Lock()
+        self.stats = dict(hits=0, misses=0, expired=0)
+        super().__init__(
+            pool_connections=max(1, max_connections // max_host_connections),
+            pool_maxsize=max_host_connections,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        """Create the shared pool manager."""
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = SharedPoolManager(
+            self, num_pools=connections, maxsize=maxsize, block=block, **pool_kwargs
+        )
+
+    def count(self, name):
+        """Increase the counter of reused, new or expired connections."""
+        with self.lock:
+            self.stats[name] += 1
+
+    def get_stats(self):
+        """Return the number of reused connections, new connections and
+        connections closed after being idle too long.
+
+        @rtype: dict
+        """
+        with self.lock:
+            return dict(self.stats)
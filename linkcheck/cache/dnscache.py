@@ -0,0 +1,281 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Cache of host name resolutions shared by all checker threads.
+"""
+import collections
+import copy
+import socket
+import threading
+import time
+import urllib.parse
+
+from dns import rdatatype, resolver
+from dns.exception import DNSException
+from requests.utils import get_environ_proxies, select_proxy
+
+from .. import log, LOG_CACHE
+from ..network import iputil
+
+# maximum number of cached resolutions
+DNS_CACHE_SIZE = 10000
+# seconds a failed resolution without SOA record is cached
+NEGATIVE_TIME = 60
+# maximum number of threads resolving queued hosts in the background
+PREFETCH_THREADS = 4
+# getaddrinfo() errors for names that do not exist; other errors, eg.
+# EAI_AGAIN, are temporary and not cached
+NEGATIVE_ERRORS = tuple(
+    getattr(socket, name)
+    for name in ("EAI_NONAME", "EAI_NODATA")
+    if hasattr(socket, name)
+)
+
+
+def get_negative_time(exc, max_time):
+    """Return the number of seconds a resolution error is cached.
+    Negative DNS answers are cached for the TTL of their SOA record as
+    described in RFC 2308, errors of the system resolver for a fixed
+    time, and temporary errors not at all.
+
+    @param exc: the resolution error
+    @type exc: OSError or DNSException
+    @param max_time: the maximum number of seconds
+    @type max_time: int
+    @rtype: int
+    """
+    if isinstance(exc, socket.gaierror):
+        if exc.errno not in NEGATIVE_ERRORS:
+            return 0
+        return min(max_time, NEGATIVE_TIME)
+    if isinstance(exc, resolver.NXDOMAIN):
+        responses = exc.kwargs.get("responses", {}).values()
+    elif isinstance(exc, resolver.NoAnswer):
+        responses = [exc.kwargs.get("response")]
+    else:
+        return 0
+    for response in responses:
+        for rrset in getattr(response, "authority", ()):
+            if rrset.rdtype == rdatatype.SOA:
+                return min(max_time, rrset.ttl, rrset[0].minimum)
+    return min(max_time, NEGATIVE_TIME)
+
+
+class DnsCache:
+    """
+    Thread-safe cache of address lookups with getaddrinfo() and of DNS
+    queries with dnspython, including names that do not exist.
+    DNS answers are cached for their TTL; the system resolver does not
+    tell the TTL, so its addresses are cached for the maximum time.
+    A name resolved by one thread is waited for by other threads
+    instead of being resolved again, and hosts of queued URLs can be
+    resolved in the background before they are checked.
+    format: {(query type, name, ...) -> (expiry time, result or error)}
+    """
+
+    def __init__(self, max_time, size=DNS_CACHE_SIZE):
+        """Initialize the cache.
+
+        @param max_time: maximum number of seconds a resolution is
+            cached, 0 to disable caching
+        @type max_time: int
+        @param size: maximum number of cached resolutions; the least
+            recently used are removed first
+        @type size: int
+        """
+        self.max_time = max_time
+        self.size = size
+        self.lock = threading.Lock()
+        # mapping {key -> (expiry time, result)} in order of use
+        self.cache = collections.OrderedDict()
+        # mapping {key -> threading.Event} of resolutions in progress
+        self.pending = {}
+        self.stats = dict(hits=0, misses=0, prefetched=0)
+        # hosts queued for prefetching or prefetched
+        self.prefetched = set()
+        # (host, URL) tuples waiting to be prefetched
+        self.prefetch_queue = collections.deque()
+        self.prefetch_ready = threading.Condition(threading.Lock())
+        self.threads = []
+        self.closed = False
+
+    def lookup(self, key, resolve):
+        """Return the cached result of given key, or resolve and cache
+        it. A cached error is raised again.
+
+        @param resolve: function returning a tuple (result, number of
+            seconds the result is cached)
+        @type resolve: function
+        """
+        while True:
+            with self.lock:
+                entry = self.cache.get(key)
+                if entry is not None and entry[0] > time.time():
+                    self.cache.move_to_end(key)
+                    self.stats["hits"] += 1
+                    break
+                event = self.pending.get(key)
+                if event is None:
+                    self.stats["misses"] += 1
+                    self.pending[key] = threading.Event()
+            if event is None:
+                return self.resolve(key, resolve)
+            # another thread is resolving this key
+            event.wait()
+        result = entry[1]
+        if isinstance(result, Exception):
+            # a new error for each lookup, without the traceback of
+            # earlier lookups keeping their frames alive
+            raise copy.copy(result)
+        return result
+
+    def resolve(self, key, resolve):
+        """Resolve a key which is pending in this thread and cache the
+        result or error."""
+        result, seconds = None, 0
+        try:
+            result, seconds = resolve()
+            return result
+        except (OSError, DNSException) as exc:
+            # cache a copy without traceback
+            result, seconds = copy.copy(exc), get_negative_time(exc, self.max_time)
+            raise
+        finally:
+            with self.lock:
+                if seconds > 0:
+                    self.cache[key] = (time.time() + seconds, result)
+                    self.cache.move_to_end(key)
+                    if len(self.cache) > self.size:
+                        self.cache.popitem(last=False)
+                self.pending.pop(key).set()
+
+    def getaddrinfo(self, host, port, family=0, type=0):
+        """Cached socket.getaddrinfo(). The addresses of a host are
+        cached once for all ports.
+
+        @param port: port number or None
+        @type port: int or None
+        @raises socket.gaierror: if the host cannot be resolved
+        """
+        host = host.lower()
+
+        def resolve():
+            """Resolve the host addresses with port zero."""
+            return socket.getaddrinfo(host, 0, family, type), self.max_time
+
+        addresses = self.lookup(("getaddrinfo", host, family, type), resolve)
+        port = port or 0
+        return [
+            (af, socktype, proto, canonname, (sa[0], port) + sa[2:])
+            for af, socktype, proto, canonname, sa in addresses
+        ]
+
+    def query(self, name, rdtype):
+        """Cached DNS query with the configured search domains.
+
+        @param rdtype: the record type, eg. 'MX'
+        @type rdtype: string
+        @return: the answer
+        @rtype: dns.resolver.Answer
+        @raises DNSException: if the query fails
+        """
+        name = name.lower()
+
+        def resolve():
+            """Query the records and get their TTL."""
+            answer = resolver.resolve(name, rdtype, search=True)
+            return answer, min(self.max_time, answer.rrset.ttl)
+
+        return self.lookup(("query", name, rdtype), resolve)
+
+    def start_prefetch(self, num_threads):
+        """Start threads resolving the hosts given to prefetch().
+
+        @param num_threads: number of threads, at most PREFETCH_THREADS
+        @type num_threads: int
+        """
+        if not self.max_time:
+            return
+        for num in range(min(num_threads, PREFETCH_THREADS)):
+            thread = threading.Thread(
+                target=self.prefetch_hosts, name="DnsPrefetch-%d" % num, daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def prefetch(self, url):
+        """Resolve the host of a URL in the background when it is seen
+        for the first time. The host is not resolved if the URL is
+        requested through a proxy. Does nothing if no prefetch threads
+        are started.
+
+        @param url: the URL to check
+        @type url: string
+        """
+        if not self.threads or not url:
+            return
+        try:
+            host = urllib.parse.urlsplit(url).hostname
+        except ValueError:
+            return
+        if not host or iputil.is_valid_ip(host):
+            return
+        with self.prefetch_ready:
+            if host in self.prefetched:
+                return
+            if len(self.prefetched) >= self.size:
+                self.prefetched.clear()
+            self.prefetched.add(host)
+            self.prefetch_queue.append((host, url))
+            self.prefetch_ready.notify()
+
+    def prefetch_hosts(self):
+        """Resolve queued hosts until the cache is closed."""
+        while True:
+            with self.prefetch_ready:
+                while not self.prefetch_queue and not self.closed:
+                    self.prefetch_ready.wait()
+                if self.closed:
+                    return
+                host, url = self.prefetch_queue.popleft()
+            if select_proxy(url, get_environ_proxies(url)):
+                log.debug(LOG_CACHE, "not prefetching %s, it uses a proxy", host)
+                continue
+            log.debug(LOG_CACHE, "prefetching address of %s", host)
+            try:
+                self.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            except (OSError, UnicodeError):
+                pass
+            with self.lock:
+                self.stats["prefetched"] += 1
+
+    def close(self):
+        """Stop the prefetch threads."""
+        with self.prefetch_ready:
+            self.closed = True
+            self.prefetch_queue.clear()
+            self.prefetch_ready.notify_all()
+        for thread in self.threads:
+            thread.join(timeout=1.0)
+
+    def get_stats(self):
+        """Return the number of cache hits and misses and of hosts
+        resolved in the background.
+
+        @rtype: dict
+        """
+        with self.lock:
+            return dict(self.stats)
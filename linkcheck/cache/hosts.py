@@ -0,0 +1,256 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Schedule requests to hosts.
+"""
+import random
+import threading
+import time
+
+# number of independently locked partitions of the host table
+NUM_SHARDS = 32
+
+# Adaptive control of the request rate and number of connections per host:
+# both are increased additively while the response time of the host is
+# steady and decreased multiplicatively when the host is congested.
+# requests per second at start, if the maximum rate is higher
+INITIAL_RATE = 10.0
+# requests per second added to the rate after a timely response
+RATE_INCREASE = 0.5
+# lowest request rate per second a host is slowed down to
+MIN_RATE = 0.05
+# number of concurrent connections to a host at start
+INITIAL_CONNECTIONS = 2
+# factor rate and connections are multiplied with on congestion
+DECREASE_FACTOR = 0.5
+# a response time above this factor times the fastest response time
+# plus LATENCY_SLACK seconds indicates congestion
+LATENCY_FACTOR = 2.0
+LATENCY_SLACK = 0.05
+# weight of a new response time in the moving average
+LATENCY_WEIGHT = 0.2
+# minimum seconds between two decreases
+DECREASE_INTERVAL = 1.0
+
+
+class HostScheduler:
+    """
+    Thread-safe table of request slots per host.
+    Each host has its own next allowed request time. Reserving a slot
+    only locks the shard the host is stored in, and the caller waits
+    for its slot without holding any lock, so threads requesting
+    different hosts never block each other.
+    format: {host (string) -> next allowed request time (float)}
+    """
+
+    def __init__(self, num_shards=NUM_SHARDS, max_connections=None):
+        """Initialize the sharded host table.
+
+        @param max_connections: upper limit of concurrent connections
+            to one host, None for no limit
+        @type max_connections: int or None
+        """
+        self.shards = [(threading.Lock(), {}, {}) for dummy in range(num_shards)]
+        self.max_connections = max_connections
+
+    def get_shard(self, host):
+        """Return tuple (lock, times, controllers) of the shard storing
+        given host."""
+        return self.shards[hash(host) % len(self.shards)]
+
+    def get_controller(self, host):
+        """Get the rate and connection controller of given host.
+
+        @rtype: HostController
+        """
+        lock, times, controllers = self.get_shard(host)
+        with lock:
+            controller = controllers.get(host)
+            if controller is None:
+                controller = HostController(self.max_connections)
+                controllers[host] = controller
+            return controller
+
+    def reserve(self, host, wait_time_min, wait_time_max):
+        """Reserve the next request slot for given host. The slot after
+        this one is scheduled a random time between wait_time_min and
+        wait_time_max later.
+
+        @return: time when the request to the host may be sent
+        @rtype: float
+        """
+        lock, times, controllers = self.get_shard(host)
+        with lock:
+            now = time.time()
+            due_time = max(now, times.get(host, now))
+            times[host] = due_time + random.uniform(wait_time_min, wait_time_max)
+        return due_time
+
+    def wait(self, host, wait_time_min, wait_time_max):
+        """Reserve a request slot for given host and sleep until it is due.
+
+        @return: number of seconds waited
+        @rtype: float
+        """
+        wait = self.reserve(host, wait_time_min, wait_time_max) - time.time()
+        if wait > 0:
+            time.sleep(wait)
+            return wait
+        return 0.0
+
+    def delay(self, host, seconds):
+        """Do not send requests to given host for the given number of
+        seconds, eg. as requested by a Retry-After header."""
+        lock, times, controllers = self.get_shard(host)
+        with lock:
+            times[host] = max(times.get(host, 0.0), time.time() + seconds)
+
+    def ready_time(self, host):
+        """Return time when the next request to given host may be sent,
+        without reserving it."""
+        lock, times, controllers = self.get_shard(host)
+        with lock:
+            return times.get(host, 0.0)
+
+    def status(self):
+        """Get number of hosts, number of hosts slowed down below their
+        maximum rate and the slowest of them. This is not thread-safe
+        and only meant for status messages.
+
+        @return: (hosts, throttled, slowest) where slowest is None or a
+            tuple (host, rate, connections)
+        @rtype: tuple
+        """
+        throttled = 0
+        slowest = None
+        for lock, times, controllers in self.shards:
+            for host, controller in list(controllers.items()):
+                if not controller.is_throttled():
+                    continue
+                throttled += 1
+                if slowest is None or controller.rate < slowest[1]:
+                    slowest = (host, controller.rate, controller.connections)
+        return len(self), throttled, slowest
+
+    def __len__(self):
+        """Get number of known hosts. This is not thread-safe and is
+        likely to change before the returned value is used."""
+        return sum(len(times) for lock, times, controllers in self.shards)
+
+
+class HostController:
+    """
+    Adaptive limit of the request rate and the number of concurrent
+    connections of one host (additive increase, multiplicative decrease).
+    The limits grow while the response times of the host are steady
+    and are cut down on 429 or 503 responses, timeouts or rising
+    response times.
+    """
+
+    def __init__(self, max_connections=None):
+        """Initialize the controller with no known maximum rate.
+
+        @param max_connections: upper limit of concurrent connections,
+            None for no limit
+        @type max_connections: int or None
+        """
+        self.cond = threading.Condition()
+        # maximum and current requests per second
+        self.max_rate = self.rate = None
+        self.max_connections = max_connections
+        self.connections = INITIAL_CONNECTIONS
+        if max_connections is not None:
+            self.connections = min(self.connections, max_connections)
+        # number of requests currently sent to the host
+        self.active = 0
+        # number of timely responses since the last connection increase
+        self.good = 0
+        # fastest and moving average response time in seconds
+        self.min_latency = self.latency = None
+        self.last_decrease = 0.0
+
+    def acquire(self, max_rate):
+        """Wait until a connection to the host is allowed and take it.
+        The rate starts at INITIAL_RATE and grows up to the given
+        maximum rate.
+
+        @return: allowed requests per second
+        @rtype: float
+        """
+        with self.cond:
+            if self.rate is None:
+                self.rate = INITIAL_RATE
+            self.max_rate = max_rate
+            self.rate = min(self.rate, max_rate)
+            while self.active >= self.connections:
+                self.cond.wait()
+            self.active += 1
+            return self.rate
+
+    def release(self, latency, congested=False):
+        """Release a connection and adapt the limits with the response
+        time of the request in seconds. A congested response, eg. with
+        status 429 or 503 or a timeout, decreases the limits."""
+        with self.cond:
+            self.active -= 1
+            if latency is not None:
+                self.add_latency(latency)
+            if congested or self.is_slow():
+                self.decrease()
+            else:
+                self.increase()
+            self.cond.notify_all()
+
+    def add_latency(self, latency):
+        """Add a response time to the statistics."""
+        if self.latency is None:
+            self.latency = self.min_latency = latency
+        else:
+            self.latency += LATENCY_WEIGHT * (latency - self.latency)
+            self.min_latency = min(self.min_latency, latency)
+
+    def is_slow(self):
+        """Check if the average response time has risen."""
+        if self.latency is None:
+            return False
+        return self.latency > LATENCY_FACTOR * self.min_latency + LATENCY_SLACK
+
+    def increase(self):
+        """Increase the rate by RATE_INCREASE and the connections by one
+        after one timely response per allowed connection."""
+        if self.rate is not None:
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+        self.good += 1
+        if self.good >= self.connections:
+            self.good = 0
+            if self.max_connections is None or self.connections < self.max_connections:
+                self.connections += 1
+
+    def decrease(self):
+        """Cut down the rate and connections by DECREASE_FACTOR, at most
+        once per DECREASE_INTERVAL seconds."""
+        now = time.time()
+        if now - self.last_decrease < DECREASE_INTERVAL:
+            return
+        self.last_decrease = now
+        self.good = 0
+        if self.rate is not None:
+            self.rate = max(MIN_RATE, self.rate * DECREASE_FACTOR)
+        self.connections = max(1, int(self.connections * DECREASE_FACTOR))
+
+    def is_throttled(self):
+        """Check if the host has been slowed down below its maximum rate."""
+        return self.rate is not None and self.rate < self.max_rate
@@ -0,0 +1,283 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+HTTP/2 transport of the request sessions, using the optional httpx
+package with h2 support.
+"""
+import http.client
+import os
+import ssl
+import threading
+import types
+import weakref
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import (
+    DEFAULT_CA_BUNDLE_PATH,
+    get_encoding_from_headers,
+    select_proxy,
+)
+
+try:
+    import h2  # noqa: F401
+    import httpx
+except ImportError:
+    has_h2 = False
+else:
+    has_h2 = True
+
+# connection-specific request headers, which are not allowed in HTTP/2
+HOP_BY_HOP_HEADERS = (
+    "connection",
+    "keep-alive",
+    "proxy-connection",
+    "transfer-encoding",
+    "upgrade",
+)
+
+
+def get_ssl_context(verify, cert):
+    """Get an SSL context for the verify and cert arguments of a
+    requests adapter."""
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    else:
+        cafile = DEFAULT_CA_BUNDLE_PATH if verify is True else verify
+        if os.path.isdir(cafile):
+            context = ssl.create_default_context(capath=cafile)
+        else:
+            context = ssl.create_default_context(cafile=cafile)
+    if cert:
+        if isinstance(cert, str):
+            context.load_cert_chain(cert)
+        else:
+            context.load_cert_chain(*cert)
+    return context
+
+
+def get_timeout(timeout):
+    """Convert the timeout argument of a requests adapter, seconds or a
+    tuple (connect, read), to a httpx timeout."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def convert_error(exc, request):
+    """Get the requests exception for a httpx exception, so that errors
+    are handled the same as with the HTTP/1.1 transport."""
+    if isinstance(exc, httpx.ConnectTimeout):
+        cls = requests.exceptions.ConnectTimeout
+    elif isinstance(exc, httpx.TimeoutException):
+        cls = requests.exceptions.ReadTimeout
+    elif isinstance(exc, httpx.ProxyError):
+        cls = requests.exceptions.ProxyError
+    elif isinstance(exc, httpx.UnsupportedProtocol):
+        cls = requests.exceptions.InvalidSchema
+    elif isinstance(exc, httpx.DecodingError):
+        cls = requests.exceptions.ContentDecodingError
+    elif isinstance(exc, httpx.ConnectError) and is_ssl_error(exc):
+        cls = requests.exceptions.SSLError
+    elif isinstance(exc, httpx.TransportError):
+        cls = requests.exceptions.ConnectionError
+    else:
+        cls = requests.exceptions.RequestException
+    return cls(str(exc), request=request)
+
+
+def is_ssl_error(exc):
+    """Check if an exception was caused by an SSL error."""
+    while exc is not None:
+        if isinstance(exc, ssl.SSLError):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class Http2Response:
+    """
+    Raw response of the HTTP/2 transport, with the methods of a urllib3
+    response which are used by requests.Response.
+    """
+
+    def __init__(self, response, request):
+        """Store the httpx response and its headers for cookie
+        extraction."""
+        self.response = response
+        self.request = request
+        msg = http.client.HTTPMessage()
+        for name, value in response.headers.multi_items():
+            msg[name] = value
+        self._original_response = types.SimpleNamespace(msg=msg)
+
+    def stream(self, amt=2 ** 16, decode_content=True):
+        """Iterate over the content in chunks of the given size."""
+        try:
+            if decode_content:
+                yield from self.response.iter_bytes(amt)
+            else:
+                yield from self.response.iter_raw(amt)
+        except httpx.HTTPError as exc:
+            raise convert_error(exc, self.request) from exc
+
+    def read(self, amt=None, decode_content=True):
+        """Read the whole content."""
+        return b"".join(self.stream(decode_content=decode_content))
+
+    def close(self):
+        """Close the response stream. The connection stays open."""
+        self.response.close()
+
+    def get_ssl_object(self):
+        """Get the SSL object of the connection, or None if the
+        connection is not encrypted."""
+        stream = self.response.extensions.get("network_stream")
+        if stream is None:
+            return None
+        return stream.get_extra_info("ssl_object")
+
+
+class Http2Adapter(BaseAdapter):
+    """
+    Thread-safe transport adapter mounted on the request sessions of all
+    checker threads, sending requests over HTTP/2 to hosts supporting it
+    and over HTTP/1.1 to other hosts. Concurrent requests of all threads
+    to one origin are multiplexed over one HTTP/2 connection.
+    Redirections, authentication and cookies are handled by the request
+    sessions as with the HTTP/1.1 transport.
+    """
+
+    def __init__(self, max_connections, max_host_connections, idle_time):
+        """Initialize the transport.
+
+        @param max_connections: number of connections kept open
+        @type max_connections: int
+        @param max_host_connections: unused, since all requests to a host
+            share one HTTP/2 connection; the concurrent requests per host
+            are limited by the host scheduler
+        @type max_host_connections: int
+        @param idle_time: seconds after which an unused connection is
+            closed
+        @type idle_time: number
+        """
+        super().__init__()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=idle_time,
+        )
+        self.lock = threading.Lock()
+        # httpx transports for each combination of SSL settings and proxy
+        self.transports = {}
+        # connections which have been used, to count reused connections
+        self.streams = weakref.WeakSet()
+        self.stats = dict(hits=0, misses=0, expired=None)
+
+    def get_transport(self, verify, cert, proxy):
+        """Get the httpx transport for the given SSL settings and proxy."""
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        key = (verify, cert, proxy)
+        with self.lock:
+            transport = self.transports.get(key)
+            if transport is None:
+                transport = httpx.HTTPTransport(
+                    verify=get_ssl_context(verify, cert),
+                    http2=True,
+                    limits=self.limits,
+                    proxy=proxy,
+                )
+                self.transports[key] = transport
+            return transport
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        """Send a prepared request and return a requests.Response."""
+        transport = self.get_transport(
+            verify, cert, select_proxy(request.url, proxies)
+        )
+        headers = [
+            (name, value)
+            for name, value in request.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        h2_request = httpx.Request(
+            request.method,
+            request.url,
+            headers=headers,
+            content=request.body,
+            extensions={"timeout": get_timeout(timeout).as_dict()},
+        )
+        try:
+            h2_response = transport.handle_request(h2_request)
+        except httpx.HTTPError as exc:
+            raise convert_error(exc, request) from exc
+        h2_response.request = h2_request
+        self.count_connection(h2_response)
+        response = self.build_response(request, h2_response)
+        if not stream:
+            response.content
+        return response
+
+    def build_response(self, request, h2_response):
+        """Build a requests.Response from a httpx response."""
+        response = requests.Response()
+        response.status_code = h2_response.status_code
+        response.headers = CaseInsensitiveDict(h2_response.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = Http2Response(h2_response, request)
+        response.reason = h2_response.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        extract_cookies_to_jar(response.cookies, request, response.raw)
+        return response
+
+    def count_connection(self, h2_response):
+        """Count a response sent over a new or a reused connection."""
+        stream = h2_response.extensions.get("network_stream")
+        with self.lock:
+            if stream is None or stream not in self.streams:
+                self.stats["misses"] += 1
+                if stream is not None:
+                    self.streams.add(stream)
+            else:
+                self.stats["hits"] += 1
+
+    def close(self):
+        """Close all connections."""
+        with self.lock:
+            transports = list(self.transports.values())
+            self.transports.clear()
+        for transport in transports:
+            transport.close()
+
+    def get_stats(self):
+        """Return the number of requests sent over reused connections and
+        over new connections. Connections closed after being idle are
+        not counted.
+
+        @rtype: dict
+        """
+        with self.lock:
+            return dict(self.stats)
@@ -0,0 +1,74 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Persistent store of the links found in pages, for checking unchanged
+pages again without downloading them.
+"""
+import collections
+import json
+
+from .store import SqliteStore
+
+# Validator headers, content type and links of a parsed page.
+# The links are tuples of the LinkRecord fields without the recursion
+# level and the aggregate.
+StoredPage = collections.namedtuple(
+    "StoredPage", "etag modified content_type links"
+)
+
+
+class LinkStore(SqliteStore):
+    """
+    Thread-safe SQLite database storing the ETag and Last-Modified
+    headers and the found links of parsed pages across check runs.
+    format: {url (string) -> StoredPage}
+    """
+
+    Schema = (
+        "CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY,"
+        " etag TEXT, modified TEXT, content_type TEXT, links TEXT)"
+    )
+
+    def get_page(self, url):
+        """Get the stored data of a page.
+
+        @return: the stored page or None if the page is not stored
+        @rtype: StoredPage or None
+        """
+        row = self.query(
+            "SELECT etag, modified, content_type, links FROM pages WHERE url = ?",
+            (url,),
+        )
+        if row is None:
+            return None
+        etag, modified, content_type, links = row
+        links = [tuple(link) for link in json.loads(links)]
+        return StoredPage(etag, modified, content_type, links)
+
+    def put_page(self, url, page):
+        """Store the data of a page, replacing previously stored data.
+
+        @param page: the page data
+        @type page: StoredPage
+        """
+        self.update(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+            (url, page.etag, page.modified, page.content_type, json.dumps(page.links)),
+        )
+
+    def remove_page(self, url):
+        """Remove the stored data of a page."""
+        self.update("DELETE FROM pages WHERE url = ?", (url,))
@@ -16,6 +16,10 @@
 """
 Cache check results.
 """
+import collections
+import hashlib
+
+from ..containers import BloomFilter, FingerprintSet
 from ..decorators import synchronized
 from ..lock import get_lock
 
@@ -24,45 +28,154 @@ from ..lock import get_lock
 cache_lock = get_lock("results_cache_lock")
 
 
+def hash_key(key):
+    """Return a 64 bit hash of a cache key, which takes less memory than
+    the key. Collisions are unlikely even for billions of keys.
+
+    @param key: the cache key or None
+    @type key: string or None
+    @rtype: int or None
+    """
+    if key is None:
+        return None
+    digest = hashlib.blake2b(
+        key.encode("utf-8", "surrogatepass"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big")
+
+
 class ResultCache:
     """
     Thread-safe cache of UrlData.to_wire() results.
-    the cache is limited in size since we rather recheck the same URL
-    multiple times instead of running out of memory.
-    format: {cache key (string) -> result (UrlData.towire())}
+    The cache is limited in size and evicts the least recently used
+    results, since we rather recheck the same URL multiple times instead
+    of running out of memory. The keys of all queued or checked URLs are
+    kept in a separate fingerprint set without limit, so that duplicate
+    URLs are skipped regardless of the cache size. With a Bloom filter
+    instead of the set, some URLs are falsely skipped as duplicates.
+    format: {hashed cache key (int) -> result (UrlData.towire())}
     """
 
-    def __init__(self, result_cache_size):
-        """Initialize result cache."""
-        # mapping {URL -> cached result}
-        self.cache = {}
+    def __init__(self, result_cache_size, bloom_filter_size=0):
+        """Initialize result cache.
+
+        @param bloom_filter_size: expected number of URLs for a Bloom
+            filter of seen URLs, 0 to store them in a fingerprint set
+        @type bloom_filter_size: int
+        """
+        # mapping {hashed cache key -> cached result} in order of use
+        self.cache = collections.OrderedDict()
+        # hashed cache keys of all queued or checked URLs
+        if bloom_filter_size:
+            self.seen = BloomFilter(bloom_filter_size)
+        else:
+            self.seen = FingerprintSet()
         self.max_size = result_cache_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     @synchronized(cache_lock)
     def get_result(self, key):
         """Return cached result or None if not found."""
-        return self.cache.get(key)
+        key = hash_key(key)
+        result = self.cache.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.cache.move_to_end(key)
+        return result
 
     @synchronized(cache_lock)
     def add_result(self, key, result):
-        """Add result object to cache with given key.
-        The request is ignored when the cache is already full or the key
-        is None.
+        """Add result object to cache with given key. A None result only
+        marks the key as seen, to prevent checking a queued URL multiple
+        times. The request is ignored when the key is None.
         """
-        if len(self.cache) > self.max_size:
+        self._add_result(key, result)
+
+    @synchronized(cache_lock)
+    def add_results(self, results):
+        """Add several result objects to cache.
+
+        @param results: mapping {cache key -> result}
+        @type results: dict
+        """
+        for key, result in results.items():
+            self._add_result(key, result)
+
+    def _add_result(self, key, result):
+        """Add result object to cache. Not thread-safe!"""
+        if key is None:
+            return
+        key = hash_key(key)
+        self.seen.add(key)
+        if result is None:
             return
-        if key is not None:
+        self.cache[key] = result
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+    @synchronized(cache_lock)
+    def get_state(self, exclude=()):
+        """Return the seen keys and the cached results, eg. to store them
+        in a checkpoint.
+
+        @param exclude: cache keys whose results are left out, eg. of
+            queued URLs
+        @type exclude: iterable of string
+        @return: tuple (seen keys, {hashed cache key -> result})
+        @rtype: tuple (FingerprintSet or BloomFilter, dict)
+        """
+        exclude = {hash_key(key) for key in exclude}
+        results = {
+            key: result for key, result in self.cache.items() if key not in exclude
+        }
+        return (self.seen.copy(), results)
+
+    @synchronized(cache_lock)
+    def add_state(self, seen, results):
+        """Add the seen keys and cached results returned by get_state().
+
+        @raises ValueError: if the seen keys are stored in another kind
+            or size of container
+        """
+        if type(seen) is not type(self.seen):
+            raise ValueError("incompatible seen URLs")
+        self.seen.update(seen)
+        for key, result in results.items():
+            self.seen.add(key)
             self.cache[key] = result
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
 
-    def has_result(self, key):
-        """Non-thread-safe function for fast containment checks."""
-        return key in self.cache
+    def get_stats(self):
+        """Return the number of cache hits, misses and evictions, and the
+        number, memory size and false positive rate of the seen URLs.
 
-    def has_non_empty_result(self, key):
-        """Non-thread-safe function for fast containment checks."""
-        return self.cache.get(key)
+        @rtype: dict
+        """
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            seen=len(self.seen),
+            seen_memory=self.seen.get_memory(),
+            seen_error_rate=self.seen.get_error_rate(),
+        )
+
+    def has_result(self, key):
+        """Non-thread-safe function for fast containment checks.
+        Return True if the URL with given key has been queued or checked.
+        URLs without key, eg. with syntax errors, are never seen."""
+        if key is None:
+            return False
+        return hash_key(key) in self.seen
 
     def __len__(self):
-        """Get number of cached elements. This is not thread-safe and is
-        likely to change before the returned value is used."""
-        return len(self.cache)
+        """Get number of queued or checked URLs. This is not thread-safe
+        and is likely to change before the returned value is used."""
+        return len(self.seen)
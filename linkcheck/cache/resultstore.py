@@ -0,0 +1,88 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Persistent cache of check results with expiry times.
+"""
+import pickle
+import time
+
+from .. import log, LOG_CACHE
+from .store import SqliteStore
+
+
+class ResultStore(SqliteStore):
+    """
+    Thread-safe SQLite database caching UrlData.to_wire() results
+    across check runs. Results of valid URLs expire after another time
+    than results of invalid URLs.
+    format: {cache key (string) -> (expiry time, result)}
+    """
+
+    Schema = (
+        "CREATE TABLE IF NOT EXISTS results"
+        " (key TEXT PRIMARY KEY, expires REAL, result BLOB)"
+    )
+
+    def __init__(self, filename, valid_seconds, invalid_seconds):
+        """Open or create the database file.
+
+        @param valid_seconds: seconds results of valid URLs are kept
+        @type valid_seconds: int
+        @param invalid_seconds: seconds results of invalid URLs are kept
+        @type invalid_seconds: int
+        """
+        super().__init__(filename)
+        self.valid_seconds = valid_seconds
+        self.invalid_seconds = invalid_seconds
+
+    def get_result(self, key):
+        """Return the stored result or None if not found or expired.
+        A result that cannot be unpickled, eg. one stored by another
+        version, is removed."""
+        row = self.query(
+            "SELECT expires, result FROM results WHERE key = ?", (key,)
+        )
+        if row is None or row[0] < time.time():
+            return None
+        try:
+            return pickle.loads(row[1])
+        except (
+            pickle.UnpicklingError,
+            AttributeError,
+            EOFError,
+            ImportError,
+            TypeError,
+        ) as msg:
+            log.debug(LOG_CACHE, "removing unreadable result of %s: %s", key, msg)
+            self.update("DELETE FROM results WHERE key = ?", (key,))
+            return None
+
+    def add_result(self, key, result):
+        """Store a result object with given key, replacing a previously
+        stored result."""
+        seconds = self.valid_seconds if result.valid else self.invalid_seconds
+        if not seconds or key is None:
+            return
+        self.update(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+            (key, time.time() + seconds, pickle.dumps(result, pickle.HIGHEST_PROTOCOL)),
+        )
+
+    def close(self):
+        """Remove the expired results, commit the changes and close the
+        database."""
+        self.update("DELETE FROM results WHERE expires < ?", (time.time(),))
+        super().close()
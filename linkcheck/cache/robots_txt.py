@@ -43,6 +43,8 @@ class RobotsTxt:
         self.hits = self.misses = 0
         self.roboturl_locks = {}
         self.useragent = useragent
+        # mapping {host -> crawl delay in seconds}
+        self.crawl_delays = {}
 
     def allows_url(self, url_data, timeout=None):
         """Ask robots.txt allowance."""
@@ -65,9 +67,20 @@ class RobotsTxt:
         rp.read()
         with cache_lock:
             self.cache[roboturl] = rp
+            self.crawl_delays[rp.host] = rp.get_crawldelay(self.useragent)
         self.add_sitemap_urls(rp, url_data, roboturl)
         return rp.can_fetch(self.useragent, url_data.url)
 
+    def get_crawldelay(self, host):
+        """Get the crawl delay of given host.
+
+        @return: crawl delay in seconds, zero if the robots.txt of the
+            host has no delay, or None if it has not been read yet
+        @rtype: number or None
+        """
+        with cache_lock:
+            return self.crawl_delays.get(host)
+
     def add_sitemap_urls(self, rp, url_data, roboturl):
         """Add sitemap URLs to queue."""
         if not rp.sitemap_urls or not url_data.allows_simple_recursion():
@@ -0,0 +1,85 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+SQLite databases keeping data across check runs.
+"""
+import threading
+
+from .. import log, LOG_CACHE, LinkCheckerError
+
+# number of changes after which they are committed to the database file
+COMMIT_CHANGES = 100
+
+
+class SqliteStore:
+    """
+    Thread-safe SQLite database file. Subclasses set Schema to the
+    statement creating their table.
+    """
+
+    Schema = None
+
+    def __init__(self, filename):
+        """Open or create the database file.
+
+        @param filename: name of the database file
+        @type filename: string
+        @raises LinkCheckerError: if the file is no suitable database
+        """
+        import sqlite3
+
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.changes = 0
+        try:
+            self.connection = sqlite3.connect(filename, check_same_thread=False)
+            self.connection.execute(self.Schema)
+        except sqlite3.Error as msg:
+            raise LinkCheckerError(
+                _("Could not open database %(filename)s: %(msg)s")
+                % {"filename": filename, "msg": msg}
+            )
+
+    def query(self, sql, args):
+        """Return the first row selected by the given statement, or None
+        if there is no such row or the database is closed."""
+        with self.lock:
+            if self.connection is None:
+                return None
+            return self.connection.execute(sql, args).fetchone()
+
+    def update(self, sql, args):
+        """Execute the given changing statement. The changes are
+        committed every COMMIT_CHANGES changes, so that an aborted
+        check run keeps most of them."""
+        with self.lock:
+            if self.connection is None:
+                return
+            self.connection.execute(sql, args)
+            self.changes += 1
+            if self.changes >= COMMIT_CHANGES:
+                self.connection.commit()
+                self.changes = 0
+
+    def close(self):
+        """Commit the changes and close the database."""
+        with self.lock:
+            if self.connection is None:
+                return
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
+        log.debug(LOG_CACHE, "closed database %s", self.filename)
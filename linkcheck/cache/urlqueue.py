@@ -16,10 +16,16 @@
 """
 Handle a queue of URLs to check.
 """
+import os
+import pickle
+import tempfile
 import threading
 import collections
+import heapq
+import itertools
 from time import time as _time
 from .. import log, LOG_CACHE
+from ..containers import LFUCache
 
 
 class Timeout(Exception):
@@ -34,18 +40,297 @@ class Empty(Exception):
     pass
 
 
-NUM_PUTS_CLEANUP = 10000
+def get_host(url_data):
+    """Return the host key URL requests are throttled with."""
+    if url_data.is_record:
+        return url_data.get_host()
+    urlparts = getattr(url_data, "urlparts", None)
+    return urlparts[1] if urlparts else ""
+
+
+class FifoFrontier(collections.deque):
+    """Frontier handing out URLs in the order they were queued."""
+
+
+class HostFrontier:
+    """Frontier with one FIFO subqueue per host.
+    The hosts are ordered in a heap by the time their next request slot
+    is due, so popleft() returns a URL of the host that gets ready
+    first instead of the URL that was queued first.
+    """
+
+    def __init__(self, hosts, spacing):
+        """Initialize the frontier.
+
+        @param hosts: the scheduler reserving request slots per host
+        @type hosts: HostScheduler
+        @param spacing: minimum number of seconds between two requests
+            to one host
+        @type spacing: float
+        """
+        self.hosts = hosts
+        self.spacing = spacing
+        # mapping {host -> deque of URLs}
+        self.queues = {}
+        # heap entries [estimated ready time, sequence number, host]
+        self.heap = []
+        self.counter = itertools.count()
+        self.size = 0
+
+    def __len__(self):
+        """Return number of queued URLs."""
+        return self.size
+
+    def __iter__(self):
+        """Iterate over queued URLs."""
+        for queue in self.queues.values():
+            yield from queue
+
+    def append(self, url_data):
+        """Add URL to the subqueue of its host."""
+        host = get_host(url_data)
+        queue = self.queues.get(host)
+        if queue is None:
+            self.queues[host] = collections.deque([url_data])
+            entry = (self.hosts.ready_time(host), next(self.counter), host)
+            heapq.heappush(self.heap, entry)
+        else:
+            queue.append(url_data)
+        self.size += 1
+
+    def popleft(self):
+        """Remove and return a URL of the host that gets ready first."""
+        if not self.size:
+            raise IndexError("pop from an empty frontier")
+        while True:
+            estimate, dummy, host = self.heap[0]
+            # the estimate is a lower bound; correct it lazily with the
+            # slot that was reserved in the meantime
+            ready_time = self.hosts.ready_time(host)
+            if ready_time <= estimate:
+                break
+            heapq.heapreplace(self.heap, (ready_time, next(self.counter), host))
+        queue = self.queues[host]
+        url_data = queue.popleft()
+        if queue:
+            if ready_time:
+                # the URL just handed out occupies the next slot
+                ready_time = max(ready_time, _time()) + self.spacing
+            heapq.heapreplace(self.heap, (ready_time, next(self.counter), host))
+        else:
+            heapq.heappop(self.heap)
+            del self.queues[host]
+        self.size -= 1
+        return url_data
+
+    def clear(self):
+        """Remove all URLs."""
+        self.queues.clear()
+        self.heap = []
+        self.size = 0
+
+
+# number of spilled URLs written to disk at once
+SPILL_BATCH_SIZE = 1000
+
+# number of link keys remembered with the cache key of their URL
+LINK_CACHE_SIZE = 10000
+
+# marks the key of a queued link record that has not been claimed yet
+LINK_QUEUED = object()
+
+
+class SpillFrontier:
+    """Frontier keeping at most a given number of URLs in memory.
+    Further URLs are stored as compact records in a temporary SQLite
+    database and are read back in queue order when the URLs in memory
+    drop to half the limit. The database file is removed when no URLs
+    are spilled.
+    """
+
+    def __init__(self, head, max_size):
+        """Initialize the frontier.
+
+        @param head: the frontier holding the URLs in memory
+        @type head: FifoFrontier or HostFrontier
+        @param max_size: maximum number of URLs in memory
+        @type max_size: int
+        """
+        self.head = head
+        self.max_size = max_size
+        # number of URLs on disk or waiting to be written
+        self.spilled = 0
+        # records waiting to be written, list of (class name, record)
+        self.pending = []
+        # mapping {class name -> URL data class} of spilled URLs
+        self.classes = {}
+        self.aggregate = None
+        self.filename = self.connection = None
+
+    def __len__(self):
+        """Return number of queued URLs."""
+        return len(self.head) + self.spilled
+
+    def append(self, url_data):
+        """Add URL to the head, or spill it to disk if the head is full
+        or earlier URLs are spilled."""
+        if not self.spilled and len(self.head) < self.max_size:
+            self.head.append(url_data)
+            return
+        klass = url_data.__class__
+        self.classes[klass.__name__] = klass
+        self.aggregate = url_data.aggregate
+        record = pickle.dumps(url_data.to_record(), pickle.HIGHEST_PROTOCOL)
+        self.pending.append((klass.__name__, record))
+        self.spilled += 1
+        if len(self.pending) >= SPILL_BATCH_SIZE:
+            self.write_pending()
+
+    def __iter__(self):
+        """Iterate over the URLs in memory. Spilled URLs are returned by
+        copy_spilled()."""
+        return iter(self.head)
+
+    def copy_spilled(self):
+        """Copy the spilled URLs to another temporary database, so that
+        they can be read without holding the queue lock. No URL data is
+        constructed. Not thread-safe!
+
+        @return: iterator of (URL data class, record) tuples of the spilled
+            URLs in queue order; the copy is removed when the iterator is
+            exhausted or closed
+        @rtype: iterator
+        """
+        if not self.spilled:
+            return iter(())
+        import sqlite3
+
+        self.write_pending()
+        fd, filename = tempfile.mkstemp(prefix="linkchecker-", suffix=".sqlite")
+        os.close(fd)
+        connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.backup(connection)
+        return self.read_copy(connection, filename, dict(self.classes))
+
+    @staticmethod
+    def read_copy(connection, filename, classes):
+        """Yield the records of a database copied by copy_spilled() and
+        remove the copy afterwards."""
+        try:
+            rows = connection.execute("SELECT klass, record FROM frontier ORDER BY id")
+            for name, record in rows:
+                yield classes[name], pickle.loads(record)
+        finally:
+            connection.close()
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    def popleft(self):
+        """Remove and return the next URL of the head, after reading
+        spilled URLs into the head if it is half empty."""
+        if self.spilled and len(self.head) <= self.max_size // 2:
+            self.read_spilled(self.max_size - len(self.head))
+        return self.head.popleft()
+
+    def write_pending(self):
+        """Write the pending records to the database."""
+        if not self.pending:
+            return
+        if self.connection is None:
+            self.open()
+        self.connection.executemany(
+            "INSERT INTO frontier (klass, record) VALUES (?, ?)", self.pending
+        )
+        self.pending = []
+
+    def read_spilled(self, num):
+        """Move up to num spilled URLs to the head in queue order."""
+        self.write_pending()
+        rows = self.connection.execute(
+            "SELECT id, klass, record FROM frontier ORDER BY id LIMIT ?", (num,)
+        ).fetchall()
+        self.connection.execute("DELETE FROM frontier WHERE id <= ?", (rows[-1][0],))
+        for dummy, name, record in rows:
+            url_data = self.classes[name].from_record(
+                pickle.loads(record), self.aggregate
+            )
+            self.head.append(url_data)
+        self.spilled -= len(rows)
+        log.debug(LOG_CACHE, "read %d spilled URLs, %d left", len(rows), self.spilled)
+        if not self.spilled:
+            self.close()
+
+    def open(self):
+        """Create the temporary database."""
+        import sqlite3
+
+        fd, self.filename = tempfile.mkstemp(prefix="linkchecker-", suffix=".sqlite")
+        os.close(fd)
+        log.debug(LOG_CACHE, "spilling queued URLs to %s", self.filename)
+        self.connection = sqlite3.connect(
+            self.filename, isolation_level=None, check_same_thread=False
+        )
+        self.connection.execute("PRAGMA journal_mode=OFF")
+        self.connection.execute("PRAGMA synchronous=OFF")
+        self.connection.execute(
+            "CREATE TABLE frontier "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, klass TEXT, record BLOB)"
+        )
+
+    def close(self):
+        """Close and remove the temporary database."""
+        if self.connection is None:
+            return
+        self.connection.close()
+        self.connection = None
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+        self.filename = None
+
+    def clear(self):
+        """Remove all URLs."""
+        self.head.clear()
+        self.pending = []
+        self.spilled = 0
+        self.close()
 
 
 class UrlQueue:
     """A queue supporting several consumer tasks. The task_done() idea is
     from the Python 2.5 implementation of Queue.Queue()."""
 
-    def __init__(self, max_allowed_urls=None):
-        """Initialize the queue state and task counters."""
+    def __init__(self, max_allowed_urls=None, frontier=None, prefetch=None):
+        """Initialize the queue state and task counters.
+
+        @param frontier: the container storing queued URLs, the default
+            is a FifoFrontier
+        @type frontier: FifoFrontier, HostFrontier, SpillFrontier or None
+        @param prefetch: function called with the URL of each URL that
+            will be checked, eg. to resolve its host in the background, or
+            None; link records are passed when they are claimed
+        @type prefetch: function or None
+        """
         # Note: don't put a maximum size on the queue since it would
         # lead to deadlocks when all worker threads called put().
-        self.queue = collections.deque()
+        self.queue = FifoFrontier() if frontier is None else frontier
+        # URLs that need no connection since they have a result or their
+        # result is cached; they are returned before all others
+        self.fast = collections.deque()
+        # mapping {cache key -> URL in the frontier}
+        self.index = {}
+        # ids of URLs moved from the frontier to the fast lane; their
+        # frontier entries are skipped when they come up
+        self.moved = set()
+        # mapping {id -> URL} of URLs returned by get() and not yet done
+        self.active = {}
+        # mapping {link key -> cache key} of claimed link records, to skip
+        # links with cached results before their URL data is constructed;
+        # the cache key of queued records is LINK_QUEUED
+        self.links = LFUCache(size=LINK_CACHE_SIZE)
         # mutex must be held whenever the queue is mutating.  All methods
         # that acquire mutex must release it before returning.  mutex
         # is shared between the two conditions, so acquiring and
@@ -54,8 +339,15 @@ class UrlQueue:
         # Notify not_empty whenever an item is added to the queue; a
         # thread waiting to get is notified then.
         self.not_empty = threading.Condition(self.mutex)
+        # Notify not_full whenever an item is removed from the queue; a
+        # producer waiting in wait_for_space() is notified then.
+        self.not_full = threading.Condition(self.mutex)
+        # queue size below which waiting producers are notified
+        self.space_size = 0
         self.all_tasks_done = threading.Condition(self.mutex)
         self.unfinished_tasks = 0
+        # number of registered producer threads
+        self.producers = 0
         self.finished_tasks = 0
         self.in_progress = 0
         self.shutdown = False
@@ -66,12 +358,16 @@ class UrlQueue:
                 "Non-positive number of allowed URLs: %d" % max_allowed_urls
             )
         self.max_allowed_urls = max_allowed_urls
-        self.num_puts = 0
+        # heap of URLs to check again later, with entries
+        # (due time, sequence number, url_data)
+        self.deferred = []
+        self.deferred_counter = itertools.count()
+        self.prefetch = prefetch
 
     def qsize(self):
         """Return the approximate size of the queue (not reliable!)."""
         with self.mutex:
-            return len(self.queue)
+            return self._size() + len(self.deferred)
 
     def empty(self):
         """Return True if the queue is empty, False otherwise.
@@ -83,7 +379,12 @@ class UrlQueue:
     def _empty(self):
         """Return True if the queue is empty, False otherwise.
         Not thread-safe!"""
-        return not self.queue
+        return not self._size() and not self.deferred
+
+    def _size(self):
+        """Return the number of URLs that can be returned by get() now.
+        Not thread-safe!"""
+        return len(self.fast) + len(self.queue) - len(self.moved)
 
     def get(self, timeout=None):
         """Get first not-in-progress url from the queue and
@@ -94,73 +395,240 @@ class UrlQueue:
 
     def _get(self, timeout):
         """Non thread-safe utility function of self.get() doing the real
-        work."""
+        work. Deferred URLs that are due are queued first; while only
+        deferred URLs are left this waits until the next one is due."""
         if timeout is None:
-            while self._empty():
-                self.not_empty.wait()
+            endtime = None
         else:
             if timeout < 0:
                 raise ValueError("'timeout' must be a positive number")
             endtime = _time() + timeout
-            while self._empty():
-                remaining = endtime - _time()
-                if remaining <= 0.0:
-                    raise Empty()
-                self.not_empty.wait(remaining)
+        while True:
+            self._put_due_deferred()
+            if self._size():
+                break
+            remaining = None if endtime is None else endtime - _time()
+            if remaining is not None and remaining <= 0.0:
+                raise Empty()
+            if self.deferred:
+                due = self.deferred[0][0] - _time()
+                remaining = due if remaining is None else min(remaining, due)
+            self.not_empty.wait(remaining)
         self.in_progress += 1
-        return self.queue.popleft()
+        url_data = self._pop()
+        self.active[id(url_data)] = url_data
+        if self._size() < self.space_size:
+            self.space_size = 0
+            self.not_full.notify_all()
+        return url_data
+
+    def _pop(self):
+        """Remove and return the next URL, first from the fast lane.
+        Not thread-safe!"""
+        if self.fast:
+            return self.fast.popleft()
+        while True:
+            url_data = self.queue.popleft()
+            if id(url_data) in self.moved:
+                # stale entry of a URL returned from the fast lane
+                self.moved.remove(id(url_data))
+                continue
+            key = url_data.cache_url
+            if self.index.get(key) is url_data:
+                del self.index[key]
+            return url_data
+
+    def claim(self, url_data, record=None):
+        """Claim URL data built from a queued link record for checking.
+        The cache key of the URL is remembered for the key of the record,
+        so later occurrences of the link are skipped when they are put.
+        Links without cache key are not skipped.
+
+        @param record: the link record the URL data was built from
+        @type record: LinkRecord or None
+        @return: False if the URL is already queued or checked or the
+            maximum number of URLs is reached, else True
+        @rtype: bool
+        """
+        with self.mutex:
+            key = url_data.cache_url
+            if record is not None:
+                if id(record) in self.active:
+                    # URL data being checked, eg. for checkpoints
+                    self.active[id(record)] = url_data
+                link_key = record.get_key()
+                if key is not None:
+                    self.links[link_key] = key
+                elif link_key in self.links:
+                    del self.links[link_key]
+            if self.max_allowed_urls == 0:
+                return False
+            cache = url_data.aggregate.result_cache
+            if cache.has_result(key):
+                log.debug(
+                    LOG_CACHE, "skipping %s, %s already cached", url_data.url, key
+                )
+                return False
+            if not url_data.has_result and self.max_allowed_urls is not None:
+                self.max_allowed_urls -= 1
+            # add none value to cache to prevent checking this url
+            # multiple times
+            cache.add_result(key, None)
+            if self.prefetch is not None and not url_data.has_result:
+                self.prefetch(url_data.url)
+            return True
+
+    def results_cached(self, keys):
+        """Move queued URLs with the given cache keys to the fast lane,
+        since their results have been cached. Their entries in the
+        frontier are left in place and skipped later."""
+        with self.mutex:
+            for key in keys:
+                url_data = self.index.pop(key, None)
+                if url_data is not None:
+                    log.debug(LOG_CACHE, "moving cached %s to fast lane", url_data.url)
+                    self.moved.add(id(url_data))
+                    self.fast.append(url_data)
+
+    def defer(self, url_data, delay):
+        """Queue a URL to be checked again after the given number of
+        seconds, eg. after a temporary failure. The URL does not count
+        as a new URL and is not skipped for its pending cache entry.
+        The URL counts as unfinished task until it is checked."""
+        with self.mutex:
+            if self.shutdown:
+                return
+            log.debug(LOG_CACHE, "deferring %s for %.1f seconds", url_data.url, delay)
+            entry = (_time() + delay, next(self.deferred_counter), url_data)
+            heapq.heappush(self.deferred, entry)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def _put_due_deferred(self):
+        """Move deferred URLs that are due to the queue. Not thread-safe!"""
+        now = _time()
+        while self.deferred and self.deferred[0][0] <= now:
+            url_data = heapq.heappop(self.deferred)[2]
+            log.debug(LOG_CACHE, "queueing deferred %s", url_data.url)
+            self.queue.append(url_data)
 
     def put(self, item):
         """Put an item into the queue.
         Block if necessary until a free slot is available.
         """
         with self.mutex:
-            self._put(item)
-            self.not_empty.notify()
+            if self._put(item):
+                # add none value to cache to prevent checking this url
+                # multiple times
+                item.aggregate.result_cache.add_result(item.cache_url, None)
+                self.not_empty.notify()
+
+    def put_many(self, items):
+        """Put several items into the queue, eg. all URLs found in one
+        page. The items are checked against the result cache and queued
+        with one acquisition of the queue mutex and of the cache lock, and
+        as many waiting threads are notified as items were queued.
+        """
+        with self.mutex:
+            pending = {}
+            num = 0
+            for url_data in items:
+                if self._put(url_data, pending):
+                    num += 1
+                    if url_data.cache_url is not None:
+                        pending[url_data.cache_url] = None
+            if num:
+                # add none values to cache to prevent checking these urls
+                # multiple times
+                items[0].aggregate.result_cache.add_results(pending)
+                self.not_empty.notify(num)
+
+    def _put(self, url_data, pending=()):
+        """Put URL in queue, increase number of unfinished tasks.
+        URLs in the result cache or in the given pending cache keys are
+        skipped.
 
-    def _put(self, url_data):
-        """Put URL in queue, increase number of unfinished tasks."""
+        @return: True if the URL was queued
+        @rtype: bool
+        """
         if self.shutdown or self.max_allowed_urls == 0:
-            return
+            return False
+        if url_data.is_record:
+            # link records are checked against the cache by claim()
+            # when they are taken from the queue, unless the link is
+            # queued already or the cache key of the link is known
+            link_key = url_data.get_key()
+            key = self.links.get(link_key)
+            if key is LINK_QUEUED:
+                log.debug(LOG_CACHE, "skipping %s, already queued", url_data.url)
+                return False
+            if key is None:
+                self.links[link_key] = LINK_QUEUED
+            else:
+                cache = url_data.aggregate.result_cache
+                if cache.has_result(key) or key in pending:
+                    log.debug(
+                        LOG_CACHE, "skipping %s, %s already cached", url_data.url, key
+                    )
+                    return False
+            self.queue.append(url_data)
+            self.unfinished_tasks += 1
+            return True
         key = url_data.cache_url
         cache = url_data.aggregate.result_cache
-        if cache.has_result(key):
+        if cache.has_result(key) or key in pending:
             log.debug(LOG_CACHE, "skipping %s, %s already cached", url_data.url, key)
-            return
+            return False
         log.debug(LOG_CACHE, "queueing %s", url_data.url)
         if url_data.has_result:
-            self.queue.appendleft(url_data)
+            self.fast.appendleft(url_data)
         else:
             assert key is not None, "no result for None key: %s" % url_data
             if self.max_allowed_urls is not None:
                 self.max_allowed_urls -= 1
-            self.num_puts += 1
-            if self.num_puts >= NUM_PUTS_CLEANUP:
-                self.cleanup()
             self.queue.append(url_data)
+            if self.prefetch is not None:
+                self.prefetch(url_data.url)
+            # URLs spilled to disk are not indexed; a cached result is
+            # found when they are checked
+            if not getattr(self.queue, "spilled", 0):
+                self.index[key] = url_data
         self.unfinished_tasks += 1
-        # add none value to cache to prevent checking this url multiple times
-        cache.add_result(key, None)
-
-    def cleanup(self):
-        """Move cached elements to top."""
-        self.num_puts = 0
-        cached = []
-        for i, url_data in enumerate(self.queue):
-            key = url_data.cache_url
-            cache = url_data.aggregate.result_cache
-            if cache.has_non_empty_result(key):
-                cached.append(i)
-        for pos in cached:
-            self._move_to_top(pos)
-
-    def _move_to_top(self, pos):
-        """Move element at given position to top of queue."""
-        if pos > 0:
-            self.queue.rotate(-pos)
-            item = self.queue.popleft()
-            self.queue.rotate(pos)
-            self.queue.appendleft(item)
+        return True
+
+    def add_producer(self):
+        """Register a thread putting URLs into the queue, eg. read from
+        stdin. It counts as unfinished task, so join() does not return
+        while the queue is empty until producer_done() is called."""
+        with self.mutex:
+            self.producers += 1
+            self.unfinished_tasks += 1
+
+    def producer_done(self):
+        """Unregister a producer thread registered with add_producer()."""
+        with self.all_tasks_done:
+            if not self.producers:
+                # the queue has been shut down
+                return
+            self.producers -= 1
+            self.unfinished_tasks -= 1
+            if self.unfinished_tasks <= 0:
+                self.all_tasks_done.notify_all()
+
+    def wait_for_space(self, max_size):
+        """If max_size or more URLs can be returned by get(), block until
+        less than half of them are left, so a producer does not wake up
+        for each removed URL.
+
+        @return: False if the queue has been shut down, else True
+        @rtype: bool
+        """
+        with self.not_full:
+            if self._size() >= max_size:
+                while self._size() >= max_size // 2 and not self.shutdown:
+                    self.space_size = max(self.space_size, max_size // 2)
+                    self.not_full.wait()
+            return not self.shutdown
 
     def task_done(self, url_data):
         """
@@ -179,6 +647,7 @@ class UrlQueue:
         """
         with self.all_tasks_done:
             log.debug(LOG_CACHE, "task_done %s", url_data.url)
+            self.active.pop(id(url_data), None)
             self.finished_tasks += 1
             self.unfinished_tasks -= 1
             self.in_progress -= 1
@@ -213,8 +682,17 @@ class UrlQueue:
     def do_shutdown(self):
         """Shutdown the queue by not accepting any more URLs."""
         with self.mutex:
-            unfinished = self.unfinished_tasks - len(self.queue)
+            unfinished = self.unfinished_tasks - self._size() - len(self.deferred)
+            # producers stop putting URLs into the queue now
+            unfinished -= self.producers
+            self.producers = 0
+            self.not_full.notify_all()
             self.queue.clear()
+            self.fast.clear()
+            self.index.clear()
+            self.moved.clear()
+            self.links.clear()
+            self.deferred = []
             if unfinished <= 0:
                 if unfinished < 0:
                     raise ValueError('shutdown is in error')
@@ -222,7 +700,39 @@ class UrlQueue:
             self.unfinished_tasks = unfinished
             self.shutdown = True
 
+    def get_urls(self, get_state=None):
+        """Get the URLs being checked, the queued URLs and the deferred
+        URLs, eg. to store them in a checkpoint. URLs spilled to disk
+        are copied as records, without constructing their URL data.
+
+        @param get_state: function called with the URLs being checked
+            while no URL is claimed or done, eg. to get the seen URLs
+            matching the returned URLs, or None
+        @type get_state: function or None
+        @return: tuple (URLs being checked, other URLs in memory in the
+            order they will be returned by get(), number of spilled URLs,
+            iterator of (URL data class, record) tuples of the spilled URLs,
+            result of get_state or None)
+        @rtype: tuple (list, list, int, iterator, object)
+        """
+        with self.mutex:
+            active = list(self.active.values())
+            urls = list(self.fast)
+            urls.extend(
+                url_data for url_data in self.queue if id(url_data) not in self.moved
+            )
+            urls.extend(entry[2] for entry in sorted(self.deferred))
+            spilled = getattr(self.queue, "spilled", 0)
+            records = self.queue.copy_spilled() if spilled else iter(())
+            state = None if get_state is None else get_state(active)
+            return active, urls, spilled, records, state
+
     def status(self):
-        """Get tuple (finished tasks, in progress, queue size)."""
+        """Get tuple (finished tasks, in progress, queue size). The queue
+        size includes deferred URLs."""
         # no need to acquire self.mutex since the numbers are unreliable anyways.
-        return (self.finished_tasks, self.in_progress, len(self.queue))
+        return (
+            self.finished_tasks,
+            self.in_progress,
+            self._size() + len(self.deferred),
+        )
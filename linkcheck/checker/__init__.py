@@ -17,6 +17,7 @@
 Main functions for link checking.
 """
 
+import collections
 import os
 import html
 import urllib.parse
@@ -150,6 +151,115 @@ def get_url_from(
     )
 
 
+class LinkRecord(
+    collections.namedtuple(
+        "LinkRecord",
+        "base_url recursion_level aggregate parent_url base_ref line column page"
+        " name parent_content_type url_encoding",
+    )
+):
+    """
+    Compact data of a link found in a page, queued instead of the URL
+    data checking it. The URL data is constructed with build() when the
+    link is taken from the queue.
+    The parameters are the same as for get_url_from().
+    """
+
+    __slots__ = ()
+    is_record = True
+    has_result = False
+    cache_url = None
+
+    @property
+    def url(self):
+        """The link as found in the page."""
+        return self.base_url
+
+    def get_host(self):
+        """Return the network location the link is requested from,
+        without constructing the URL data. Like the network location of
+        the URL data, the host is lowercase and a default port is
+        removed. Invalid URLs have an empty host."""
+        url = absolute_url(self.base_url, self.base_ref, self.parent_url)
+        try:
+            split = urllib.parse.urlsplit(url.strip())
+            port = split.port
+        except ValueError:
+            return ""
+        userinfo = urlutil.split_netloc(split.netloc)[0]
+        host = split.hostname or ""
+        if port and port != urlutil.default_ports.get(split.scheme.lower()):
+            host = f"{host}:{port}"
+        if userinfo:
+            host = f"{userinfo}@{host}"
+        return host
+
+    def get_key(self):
+        """Return a key identifying the URL of the link without
+        constructing the URL data: the link, its encoding and the part
+        of the base URL the link is resolved against. Links with equal
+        keys have the same cache key, so site-wide navigation links
+        share a key across pages.
+
+        @rtype: tuple
+        """
+        href = self.base_url
+        base = self.base_ref
+        if base and ":" not in base:
+            # relative base reference, resolved against the parent URL
+            return ((self.parent_url, base), href, self.url_encoding)
+        base = base or self.parent_url or ""
+        stripped = href.lstrip() if href else ""
+        if urlutil.url_is_absolute(stripped):
+            base = None
+        elif stripped.startswith("//"):
+            base = urllib.parse.urlsplit(base).scheme
+        elif stripped.startswith("/"):
+            base = urllib.parse.urlsplit(base)[:2]
+        elif stripped and stripped[0] not in "?#":
+            path = urllib.parse.urlsplit(stripped).path
+            segments = path.split("/")
+            if not (
+                "." in segments
+                or ".." in segments
+                or "\\" in path
+                or "%2e" in path.lower()
+            ):
+                # only the directory of the base URL path is used
+                parts = urllib.parse.urlsplit(base)
+                base = (parts.scheme, parts.netloc, parts.path.rpartition("/")[0])
+        return (base, href, self.url_encoding)
+
+    def build(self):
+        """Construct the URL data of the link.
+
+        @rtype: UrlBase
+        """
+        return get_url_from(
+            self.base_url,
+            self.recursion_level,
+            self.aggregate,
+            parent_url=self.parent_url,
+            base_ref=self.base_ref,
+            line=self.line,
+            column=self.column,
+            page=self.page,
+            name=self.name,
+            parent_content_type=self.parent_content_type,
+            url_encoding=self.url_encoding,
+        )
+
+    def to_record(self, results=True):
+        """Get the link data without the aggregate, see
+        UrlBase.to_record(). Link records have no results."""
+        return tuple(self[:2] + self[3:])
+
+    @classmethod
+    def from_record(cls, record, aggregate):
+        """Construct a link record from a tuple returned by to_record()."""
+        return cls(*record[:2], aggregate, *record[2:])
+
+
 def get_urlclass_from(scheme, assume_local_file=False):
     """Return checker class for given URL scheme. If the scheme
     cannot be matched and assume_local_file is True, assume a local file.
@@ -27,6 +27,8 @@ class DnsUrl(urlbase.UrlBase):
     Url link with dns scheme.
     """
 
+    __slots__ = ()
+
     def can_get_content(self):
         """
         dns: URLs do not have any content
@@ -39,7 +41,9 @@ class DnsUrl(urlbase.UrlBase):
     def check_connection(self):
         """Resolve hostname."""
         host = self.urlparts[1]
-        addresses = socket.getaddrinfo(host, 80, 0, 0, socket.SOL_TCP)
+        addresses = self.aggregate.dns_cache.getaddrinfo(
+            host, 80, type=socket.SOCK_STREAM
+        )
         args = {'host': host}
         if addresses:
             args['ips'] = [x[4][0] for x in addresses]
@@ -30,6 +30,8 @@ class FtpUrl(internpaturl.InternPatternUrl):
     Url link with ftp scheme.
     """
 
+    __slots__ = ("files", "filename", "filename_encoding")
+
     def reset(self):
         """
         Initialize FTP url data.
@@ -32,6 +32,8 @@ warnings.simplefilter(
 
 from io import BytesIO
 import re
+import time
+import urllib.parse
 
 from .. import (
     log,
@@ -40,15 +42,27 @@ from .. import (
     url as urlutil,
     LinkCheckerError,
     httputil,
+    parser,
 )
 from . import internpaturl
+from ..cache.linkstore import StoredPage
 
 # import warnings
 from .const import WARN_HTTP_EMPTY_CONTENT, WARN_HTTP_RATE_LIMITED, WARN_HTTP_REDIRECTED
 from requests.sessions import REDIRECT_STATI
+from requests.utils import requote_uri
 
 HTTP_SCHEMAS = ('http://', 'https://')
 
+# request headers of a conditional GET
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+# content types that are checked for a parseable type with the content
+READ_MIMETYPES = ("application/xml", "text/xml")
+
+# response status codes of servers not supporting HEAD requests
+HEAD_UNSUPPORTED_STATI = (405, 501)
+
 # match for robots meta element content attribute
 nofollow_re = re.compile(r"\bnofollow\b", re.IGNORECASE)
 
@@ -58,17 +72,25 @@ class HttpUrl(internpaturl.InternPatternUrl):
     Url link with http scheme.
     """
 
+    __slots__ = ("auth", "headers", "session", "ssl_cert", "ssl_cipher", "stored_page")
+
+    LazyAttributes = dict(
+        internpaturl.InternPatternUrl.LazyAttributes,
+        # server headers
+        headers=dict,
+        ssl_cipher=None,
+        ssl_cert=None,
+    )
+
     def reset(self):
         """
         Initialize HTTP specific variables.
         """
         super().reset()
         # initialize check data
-        # server headers
-        self.headers = {}
         self.auth = None
-        self.ssl_cipher = None
-        self.ssl_cert = None
+        # page stored in the link store by a previous check run
+        self.stored_page = None
 
     def allows_robots(self, url):
         """
@@ -91,6 +113,9 @@ class HttpUrl(internpaturl.InternPatternUrl):
         Return False if the content of this URL forbids robots to
         search for recursive links.
         """
+        if self.stored_links is not None:
+            # links are stored only if robots were allowed
+            return True
         if not self.is_html():
             return True
 
@@ -140,20 +165,96 @@ class HttpUrl(internpaturl.InternPatternUrl):
             self.do_check_content = False
             return
         # check the http connection
-        request = self.build_request()
-        self.send_request(request)
-        self._add_response_info()
-        self.follow_redirections(request)
+        method = self.get_request_method()
+        self.send_request_and_redirects(method)
+        if method == "HEAD" and self.redirect_result is None and self.needs_get():
+            self.close_connection()
+            self.send_request_and_redirects("GET")
+        if self.redirect_result is not None:
+            # the redirection target has been checked already
+            self.do_check_content = False
+            return
         self.check_response()
         if self.allows_simple_recursion():
             self.parse_header_links()
 
-    def build_request(self):
+    def close_connection(self):
+        """Close the response. The connection of a HEAD response is given
+        back to the connection pool for further requests, while the
+        connection of a response with unread content is closed, so that
+        the content is not downloaded."""
+        if (
+            self.url_connection is not None
+            and self.url_connection.request.method == "HEAD"
+        ):
+            try:
+                # reading the empty content releases the connection
+                self.url_connection.content
+            except Exception:
+                pass
+        super().close_connection()
+
+    def send_request_and_redirects(self, method):
+        """Send a request with the given method and follow its
+        redirections."""
+        request = self.build_request(method)
+        self.send_request(request)
+        self.check_not_modified(request)
+        self._add_response_info()
+        self.follow_redirections(request)
+
+    def get_request_method(self):
+        """Get the method of the first request. HEAD is used if the
+        content is not needed: the URL is not recursed into or its name
+        is of a file type which is not parseable. Content plugins need
+        the content of all URLs, and hosts known to not support HEAD
+        get a GET request."""
+        if (
+            self.aggregate.plugin_manager.content_plugins
+            or self.urlparts[1] in self.aggregate.nohead_hosts
+        ):
+            return "GET"
+        if not self.allows_simple_recursion():
+            return "HEAD"
+        mime = mimeutil.guess_mimetype(self.urlparts[2])
+        if (
+            mime == "application/octet-stream"
+            or mime in self.ContentMimetypes
+            or mime in READ_MIMETYPES
+        ):
+            return "GET"
+        return "HEAD"
+
+    def needs_get(self):
+        """Check if a GET request must follow the HEAD request: the
+        server does not support HEAD, or the content can be parsed for
+        recursion. Other error responses are the result of the check."""
+        status = self.url_connection.status_code
+        if status in HEAD_UNSUPPORTED_STATI:
+            self.aggregate.set_nohead_for_host(self.urlparts[1])
+            return True
+        if status >= 400:
+            return False
+        return self.allows_simple_recursion() and (
+            self.content_type in self.ContentMimetypes
+            or self.content_type in READ_MIMETYPES
+        )
+
+    def build_request(self, method="GET"):
         """Build a prepared request object."""
         clientheaders = {}
         if self.parent_url and self.parent_url.lower().startswith(HTTP_SCHEMAS):
             clientheaders["Referer"] = self.parent_url
-        kwargs = dict(method='GET', url=self.url, headers=clientheaders)
+        # a stored page is only used for GET requests, since with a HEAD
+        # request the content is not needed
+        self.stored_page = self.get_stored_page() if method == "GET" else None
+        if self.stored_page is not None:
+            # conditional GET
+            if self.stored_page.etag:
+                clientheaders["If-None-Match"] = self.stored_page.etag
+            if self.stored_page.modified:
+                clientheaders["If-Modified-Since"] = self.stored_page.modified
+        kwargs = dict(method=method, url=self.url, headers=clientheaders)
         if self.auth:
             kwargs['auth'] = self.auth
         log.debug(LOG_CHECK, "Prepare request with %s", kwargs)
@@ -163,10 +264,72 @@ class HttpUrl(internpaturl.InternPatternUrl):
     def send_request(self, request):
         """Send request and store response in self.url_connection."""
         # throttle the number of requests to each host
-        self.aggregate.wait_for_host(self.urlparts[1])
+        host = self.urlparts[1]
+        self.aggregate.wait_for_host(host)
         kwargs = self.get_request_kwargs()
         kwargs["allow_redirects"] = False
-        self._send_request(request, **kwargs)
+        latency = retry_after = None
+        congested = True
+        start = time.time()
+        try:
+            self._send_request(request, **kwargs)
+            latency = time.time() - start
+            congested = self.url_connection.status_code in (429, 503)
+            if congested:
+                retry_after = httputil.get_retry_after(self.headers)
+        finally:
+            self.aggregate.release_host(
+                host, latency=latency, congested=congested, retry_after=retry_after
+            )
+
+    def get_stored_page(self):
+        """Get the page stored by a previous check run if its links can
+        be checked instead of parsing unchanged content. Content plugins
+        need the content, so no page is used with content plugins.
+
+        @return: the stored page or None
+        @rtype: StoredPage or None
+        """
+        link_store = self.aggregate.link_store
+        if (
+            link_store is None
+            or self.aggregate.plugin_manager.content_plugins
+            or not self.allows_simple_recursion()
+        ):
+            return None
+        return link_store.get_page(self.url)
+
+    def check_not_modified(self, request):
+        """Use the stored links if the server answered the conditional
+        GET with 304 Not Modified. The validators of this URL are not
+        sent to redirection targets."""
+        if self.stored_page is None:
+            return
+        for name in CONDITIONAL_HEADERS:
+            request.headers.pop(name, None)
+        if self.url_connection.status_code == 304:
+            self.stored_links = self.stored_page.links
+            self.add_info(_("Content not modified, checking the stored links."))
+
+    def store_links(self, links):
+        """Store the validator headers and the links of a parsed page in
+        the link store. Pages without validators and pages reached by
+        redirection are not stored."""
+        link_store = self.aggregate.link_store
+        if (
+            link_store is None
+            or self.aggregate.plugin_manager.content_plugins
+            or self.aliases
+        ):
+            return
+        etag = self.headers.get("ETag")
+        modified = self.headers.get("Last-Modified")
+        if etag or modified:
+            links = [link[:1] + link[3:] for link in links]
+            page = StoredPage(etag, modified, self.content_type, links)
+            link_store.put_page(self.url, page)
+        elif self.stored_page is not None:
+            link_store.remove_page(self.url)
 
     def _send_request(self, request, **kwargs):
         """Send GET request."""
@@ -189,6 +352,9 @@ class HttpUrl(internpaturl.InternPatternUrl):
     def _get_ssl_sock(self):
         """Get raw SSL socket."""
         assert self.scheme == "https", self
+        if hasattr(self.url_connection.raw, "get_ssl_object"):
+            # response of the HTTP/2 transport
+            return self.url_connection.raw.get_ssl_object()
         raw_connection = self.url_connection.raw._connection
         if not raw_connection:
             # this happens with newer requests versions:
@@ -228,8 +394,12 @@ class HttpUrl(internpaturl.InternPatternUrl):
             self.auth = (_user, _password)
 
     def set_content_type(self):
-        """Set MIME type from HTTP response headers."""
-        self.content_type = httputil.get_content_type(self.headers)
+        """Set MIME type from HTTP response headers, or of the stored
+        page if the content is not modified."""
+        if self.stored_links is not None:
+            self.content_type = self.stored_page.content_type
+        else:
+            self.content_type = httputil.get_content_type(self.headers)
         log.debug(LOG_CHECK, "MIME type: %s", self.content_type)
 
     def set_encoding(self, encoding):
@@ -274,20 +444,20 @@ class HttpUrl(internpaturl.InternPatternUrl):
             # run connection plugins for old connection
             self.aggregate.plugin_manager.run_connection_plugins(self)
         response = None
-        for response in self.get_redirects(request):
+        redirects = self.get_redirects(request)
+        while not self.follow_cached_redirection():
+            response = next(redirects, None)
+            if response is None:
+                break
             newurl = response.url
             log.debug(LOG_CHECK, "Redirected to %r", newurl)
-            self.aliases.append(newurl)
             # XXX on redirect errors this is not printed
-            self.add_warning(
-                _("Redirected to `%(url)s' status: %(code)d %(reason)s.")
-                % {'url': newurl, 'code': self.url_connection.status_code,
-                   'reason': self.url_connection.reason},
-                tag=WARN_HTTP_REDIRECTED)
+            self.add_redirect_warning(newurl)
             # Reset extern and recalculate
             self.extern = None
             self.set_extern(newurl)
             self.urlparts = self.build_url_parts(newurl)
+            self.aliases.append(self.get_cache_url(self.urlparts))
             self.url_connection = response
             self.headers = response.headers
             self.url = urlutil.urlunsplit(self.urlparts)
@@ -303,8 +473,85 @@ class HttpUrl(internpaturl.InternPatternUrl):
             log.debug(
                 LOG_CHECK, "Redirected response encoding %s", self.content_encoding)
 
+    def add_redirect_warning(self, newurl):
+        """Add a warning about the redirection of the current response to
+        the given URL."""
+        self.add_warning(
+            _("Redirected to `%(url)s' status: %(code)d %(reason)s.")
+            % {'url': newurl, 'code': self.url_connection.status_code,
+               'reason': self.url_connection.reason},
+            tag=WARN_HTTP_REDIRECTED)
+
+    def get_redirect_target(self):
+        """Get the URL the current response redirects to, resolved as by
+        Session.resolve_redirects(), or None if the response is no
+        redirection."""
+        if not self.is_redirect():
+            return None
+        url = self.session.get_redirect_target(self.url_connection)
+        if url.startswith("//"):
+            url = "%s:%s" % (self.urlparts[0], url)
+        parts = urllib.parse.urlsplit(url)
+        if not parts.fragment and self.urlparts[4]:
+            # the anchor is kept if the new URL has none
+            url = urllib.parse.urlunsplit(parts._replace(fragment=self.urlparts[4]))
+        if not parts.netloc:
+            return urllib.parse.urljoin(self.url_connection.url, requote_uri(url))
+        return requote_uri(url)
+
+    def follow_cached_redirection(self):
+        """Take the cached result of the redirection target of the
+        current response instead of following the redirection. Since
+        every redirected URL is cached, links which are redirected to an
+        URL seen before skip the remaining redirections.
+
+        @return: True if the cached result has been taken, else False
+        @rtype: bool
+        """
+        newurl = self.get_redirect_target()
+        if newurl is None:
+            return False
+        try:
+            urlparts = self.build_url_parts(newurl)
+        except LinkCheckerError:
+            # the redirection error is reported by the request
+            return False
+        result = self.aggregate.result_cache.get_result(self.get_cache_url(urlparts))
+        if result is None:
+            return False
+        log.debug(LOG_CHECK, "Redirected to cached URL %r", newurl)
+        self.add_redirect_warning(newurl)
+        self.redirect_result = result
+        return True
+
+    def to_wire_dict(self):
+        """Return the cached result of the redirection target with the
+        cache key, link information, warnings and infos of this URL if
+        the redirection target has been checked already."""
+        wire = super().to_wire_dict()
+        result = self.redirect_result
+        if result is not None:
+            for attr in ("valid", "extern", "result", "title", "url", "domain",
+                         "dltime", "size", "modified", "content_type"):
+                wire[attr] = getattr(result, attr)
+            wire["warnings"].extend(
+                warning for warning in result.warnings
+                if warning not in wire["warnings"]
+            )
+            wire["info"] = self.info + result.info
+        return wire
+
     def check_response(self):
-        """Check final result and log it."""
+        """Check final result and log it. Responses with status 429 or
+        503 are retried later if the maximum number of retries is not
+        reached."""
+        if (
+            self.url_connection.status_code in (429, 503)
+            and self.attempts < self.aggregate.config["maxretries"]
+        ):
+            self.retry_after = self.aggregate.get_retry_delay(
+                self.attempts, httputil.get_retry_after(self.headers)
+            )
         if (
             self.url_connection.status_code >= 400
             and self.url_connection.status_code != 429
@@ -335,9 +582,6 @@ class HttpUrl(internpaturl.InternPatternUrl):
             else:
                 self.set_result(_("OK"))
 
-    def get_content(self):
-        return super().get_content(self.content_encoding)
-
     def read_content(self):
         """Return data and data size for this URL.
         Can be overridden in subclasses."""
@@ -379,12 +623,15 @@ class HttpUrl(internpaturl.InternPatternUrl):
         if not self.valid:
             return False
         # some content types must be validated with the page content
-        if self.content_type in ("application/xml", "text/xml"):
+        if self.stored_links is None and self.content_type in READ_MIMETYPES:
             rtype = mimeutil.guess_mimetype_read(self.get_content)
             if rtype is not None:
                 # XXX side effect
                 self.content_type = rtype
                 log.debug(LOG_CHECK, "Read MIME type: %s", self.content_type)
+                # keep the content the parser of the new type uses, since
+                # the response cannot be read again
+                self.add_content_users(parser.get_content_forms(self))
         return self.is_content_type_parseable()
 
     def get_robots_txt_url(self):
@@ -24,6 +24,8 @@ from .. import log, LOG_CHECK
 class ItmsServicesUrl(urlbase.UrlBase):
     """Apple iOS application download URLs."""
 
+    __slots__ = ()
+
     def check_syntax(self):
         """Only logs that this URL is unknown."""
         super().check_syntax()
@@ -23,7 +23,6 @@ from email._parseaddr import AddressList
 
 from . import urlbase
 from .. import log, LOG_CHECK, strformat, url as urlutil
-from dns import resolver
 from ..network import iputil
 from .const import WARN_MAIL_NO_MX_HOST
 
@@ -70,6 +69,8 @@ class MailtoUrl(urlbase.UrlBase):
     Url link with mailto scheme.
     """
 
+    __slots__ = ("addresses", "subject")
+
     def build_url(self):
         """Call super.build_url(), extract list of mail addresses from URL,
         and check their syntax.
@@ -319,7 +320,7 @@ class MailtoUrl(urlbase.UrlBase):
         username, domain = mail.rsplit('@', 1)
         log.debug(LOG_CHECK, "looking up MX mailhost %r", domain)
         try:
-            answers = resolver.resolve(domain, 'MX', search=True)
+            answers = self.aggregate.dns_cache.query(domain, 'MX')
         except DNSException:
             answers = []
         if len(answers) == 0:
@@ -328,7 +329,7 @@ class MailtoUrl(urlbase.UrlBase):
                 tag=WARN_MAIL_NO_MX_HOST,
             )
             try:
-                answers = resolver.resolve(domain, 'A', search=True)
+                answers = self.aggregate.dns_cache.query(domain, 'A')
             except DNSException:
                 answers = []
             if len(answers) == 0:
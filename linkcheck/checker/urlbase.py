@@ -18,6 +18,7 @@ Base URL handler.
 """
 # pylint: disable=assignment-from-none, catching-non-exception, no-member
 
+import copy
 import sys
 import os
 import urllib.parse
@@ -27,7 +28,7 @@ import errno
 import socket
 from io import BytesIO
 
-from . import absolute_url, get_url_from
+from . import absolute_url, LinkRecord
 from .. import (
     log,
     LOG_CHECK,
@@ -40,6 +41,7 @@ from .. import (
 from ..htmlutil import htmlsoup
 from ..network import iputil
 from .const import (
+    WARN_HTTP_REDIRECTED,
     WARN_URL_EFFECTIVE_URL,
     WARN_URL_ERROR_GETTING_CONTENT,
     WARN_URL_OBFUSCATED_IP,
@@ -111,6 +113,90 @@ class UrlBase:
     # Read in 16kb chunks
     ReadChunkBytes = 1024 * 16
 
+    # estimated memory used by a Beautiful Soup tree per byte of HTML
+    SoupSizeFactor = 30
+
+    # queued URL data is not a LinkRecord
+    is_record = False
+
+    # The check data; see reset() for the meaning of each attribute.
+    # Slots instead of an instance dictionary keep the URL objects in
+    # the queue and in the checker threads small. Subclasses declare
+    # slots for their own attributes.
+    __slots__ = (
+        "aggregate",
+        "aliases",
+        "anchor",
+        "attempts",
+        "base_ref",
+        "base_url",
+        "cache_url",
+        "caching",
+        "checktime",
+        "column",
+        "content_encoding",
+        "content_released",
+        "content_sizes",
+        "content_type",
+        "content_users",
+        "data",
+        "dltime",
+        "do_check_content",
+        "encoding",
+        "extern",
+        "has_result",
+        "host",
+        "ignore_errors",
+        "info",
+        "line",
+        "modified",
+        "name",
+        "page",
+        "parent_url",
+        "port",
+        "recursion_level",
+        "redirect_result",
+        "result",
+        "retry_after",
+        "scheme",
+        "size",
+        "soup",
+        "stored_links",
+        "text",
+        "title",
+        "url",
+        "url_batch",
+        "url_connection",
+        "urlparts",
+        "userinfo",
+        "valid",
+        "warnings",
+    )
+
+    # Rarely used attributes which are not set by reset() but on first
+    # access: {name -> default value, or function returning a new one}
+    LazyAttributes = {
+        # cache keys of the URLs seen through redirections
+        "aliases": list,
+        # cached result of a redirection target, which is taken instead
+        # of following the remaining redirections
+        "redirect_result": None,
+        # number of users of each content form, see add_content_users()
+        "content_users": dict,
+        # bytes of each content form counted in the content budget
+        "content_sizes": dict,
+        # True after the downloaded data has been released
+        "content_released": False,
+    }
+
+    # The content forms: raw data, decoded text and Beautiful Soup tree,
+    # mapped to the forms they are produced from.
+    ContentSources = {
+        "data": (),
+        "soup": ("data",),
+        "text": ("data", "soup"),
+    }
+
     def __init__(
         self,
         base_url,
@@ -272,10 +358,33 @@ class UrlBase:
         self.do_check_content = True
         # MIME content type
         self.content_type = ""
-        # URLs seen through redirections
-        self.aliases = []
         # error messages (regular expressions) to ignore
         self.ignore_errors = []
+        # seconds after which a temporarily failed check is retried,
+        # None if the result is final
+        self.retry_after = None
+        # number of previous checks of this URL that were retried
+        self.attempts = 0
+        # list collecting URLs found while parsing, None to queue each
+        # URL when it is found
+        self.url_batch = None
+        # links found in the unchanged content by a previous check run,
+        # None if the content has to be parsed
+        self.stored_links = None
+
+    def __getattr__(self, name):
+        """
+        Set a rarely used attribute to its default value on first access.
+        """
+        try:
+            default = self.LazyAttributes[name]
+        except KeyError:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            ) from None
+        value = default() if callable(default) else default
+        setattr(self, name, value)
+        return value
 
     def set_result(self, msg, valid=True, overwrite=False):
         """
@@ -306,7 +415,7 @@ class UrlBase:
                 self.result = f"Ignored: {self.result}"
 
         # free content data
-        self.data = None
+        self.remove_content("data")
 
     def get_title(self):
         """Return title of page the URL refers to.
@@ -423,14 +532,17 @@ class UrlBase:
 
     def set_cache_url(self):
         """Set the URL to be used for caching."""
-        if "AnchorCheck" in self.aggregate.config["enabledplugins"]:
-            self.cache_url = self.url
-        else:
-            # remove anchor from cached target url since we assume
-            # URLs with different anchors to have the same content
-            self.cache_url = urlutil.urlunsplit(self.urlparts[:4] + [''])
+        self.cache_url = self.get_cache_url(self.urlparts)
         log.debug(LOG_CHECK, "cache_url '%s'", self.cache_url)
 
+    def get_cache_url(self, urlparts):
+        """Get the URL to be used for caching of the given URL parts."""
+        if "AnchorCheck" in self.aggregate.config["enabledplugins"]:
+            return urlutil.urlunsplit(urlparts)
+        # remove anchor from cached target url since we assume
+        # URLs with different anchors to have the same content
+        return urlutil.urlunsplit(urlparts[:4] + [''])
+
     def check_syntax(self):
         """
         Called before self.check(), this function inspects the
@@ -548,7 +660,9 @@ class UrlBase:
         # check if self.host can be an IP address
         # check for obfuscated IP address
         if iputil.is_obfuscated_ip(self.host):
-            ips = iputil.resolve_host(self.host)
+            ips = iputil.resolve_host(
+                self.host, self.aggregate.dns_cache.getaddrinfo
+            )
             if ips:
                 self.host = ips[0]
                 self.add_warning(
@@ -754,6 +868,7 @@ class UrlBase:
         return self.size <= self.aggregate.config["maxfilesizedownload"]
 
     def download_content(self):
+        self.aggregate.content_budget.wait()
         log.debug(LOG_CHECK, "Get content of %r", self.url)
         t = time.time()
         content = self.read_content()
@@ -767,18 +882,9 @@ class UrlBase:
 
     def get_soup(self):
         if self.soup is None:
-            self.get_content()
-        return self.soup
-
-    def get_raw_content(self):
-        if self.data is None:
-            self.data = self.download_content()
-        return self.data
-
-    def get_content(self, encoding=None):
-        if self.text is None:
-            self.get_raw_content()
-            self.soup = htmlsoup.make_soup(self.data, encoding)
+            data = self.get_raw_content()
+            soup = htmlsoup.make_soup(data, self.content_encoding)
+            self.set_content("soup", soup, len(data) * self.SoupSizeFactor)
             # Sometimes soup.original_encoding is None!  Better mangled text
             # than an internal crash, eh?  ISO-8859-1 is a safe fallback in the
             # sense that any binary blob can be decoded, it'll never cause a
@@ -788,9 +894,84 @@ class UrlBase:
             )
             self.content_encoding = self.soup.original_encoding or 'ISO-8859-1'
             log.debug(LOG_CHECK, "Content encoding %s", self.content_encoding)
-            self.text = self.data.decode(self.content_encoding)
+        return self.soup
+
+    def get_raw_content(self):
+        if self.data is None:
+            if self.content_released:
+                # the response has been read already
+                raise LinkCheckerError(_("The content has been released"))
+            data = self.download_content()
+            self.set_content("data", data, len(data))
+        return self.data
+
+    def get_content(self):
+        if self.text is None:
+            self.get_soup()
+            text = self.get_raw_content().decode(self.content_encoding)
+            self.set_content("text", text, sys.getsizeof(text))
         return self.text
 
+    def set_content(self, form, value, size):
+        """Set a content form and count its size in the content budget.
+
+        @param form: one of "data", "text" and "soup"
+        @type form: string
+        @param size: estimated memory used by the content in bytes
+        @type size: int
+        """
+        setattr(self, form, value)
+        self.content_sizes[form] = size
+        self.aggregate.content_budget.add(size)
+
+    def remove_content(self, form):
+        """Release a content form and its size in the content budget."""
+        if getattr(self, form) is None:
+            return
+        setattr(self, form, None)
+        if form == "data":
+            self.content_released = True
+        size = self.content_sizes.pop(form, 0)
+        if size:
+            self.aggregate.content_budget.remove(size)
+
+    def add_content_users(self, forms):
+        """Register a user of the given content forms. The forms, and the
+        forms needed to produce them, are kept until the user is removed
+        with remove_content_users().
+
+        @param forms: any of "data", "text" and "soup"
+        @type forms: sequence of string
+        """
+        for form in forms:
+            self.content_users[form] = self.content_users.get(form, 0) + 1
+
+    def remove_content_users(self, forms):
+        """Unregister a user of the given content forms and release the
+        content no other user needs."""
+        for form in forms:
+            self.content_users[form] -= 1
+        self.release_unused_content()
+
+    def release_unused_content(self):
+        """Release the content forms which are not needed by a
+        registered user."""
+        keep = set()
+        for form, users in self.content_users.items():
+            if users:
+                keep.add(form)
+                if getattr(self, form) is None:
+                    keep.update(self.ContentSources[form])
+        for form in self.ContentSources:
+            if form not in keep:
+                self.remove_content(form)
+
+    def release_content(self):
+        """Release all content forms after the last user is done."""
+        self.content_users.clear()
+        for form in self.ContentSources:
+            self.remove_content(form)
+
     def read_content(self):
         """Return data for this URL. Can be overridden in subclasses."""
         buf = BytesIO()
@@ -824,20 +1005,127 @@ class UrlBase:
             base_ref = urlutil.url_norm(base, encoding=self.content_encoding)[0]
         else:
             base_ref = None
-        url_data = get_url_from(
+        # the URL data is constructed when the link is taken from the queue
+        url_data = LinkRecord(
             url,
             self.recursion_level + 1,
             self.aggregate,
-            parent_url=self.url if parent is None else parent,
-            base_ref=base_ref,
-            line=line,
-            column=column,
-            page=page,
-            name=name,
-            parent_content_type=self.content_type,
-            url_encoding=self.content_encoding,
+            self.url if parent is None else parent,
+            base_ref,
+            line,
+            column,
+            page,
+            name,
+            self.content_type,
+            self.content_encoding,
         )
-        self.aggregate.urlqueue.put(url_data)
+        if self.url_batch is None:
+            self.aggregate.urlqueue.put(url_data)
+        else:
+            self.url_batch.append(url_data)
+
+    def add_stored_links(self):
+        """Add the links stored by a previous check run to the queue,
+        instead of parsing the content."""
+        for link in self.stored_links:
+            url_data = LinkRecord(
+                link[0], self.recursion_level + 1, self.aggregate, *link[1:]
+            )
+            if self.url_batch is None:
+                self.aggregate.urlqueue.put(url_data)
+            else:
+                self.url_batch.append(url_data)
+
+    def store_links(self, links):
+        """Store the links found in the content for later check runs.
+        Can be overridden in subclasses.
+
+        @param links: the links found in the content
+        @type links: list of LinkRecord
+        """
+        pass
+
+    def get_retry(self):
+        """Get new URL data to check this URL again after a temporary
+        failure. The new URL data has the same class and extern state,
+        and does not add intern patterns again.
+
+        @return: new URL data with increased number of attempts
+        @rtype: UrlBase
+        """
+        url_data = self.from_record(self.to_record(results=False), self.aggregate)
+        url_data.attempts += 1
+        return url_data
+
+    def to_record(self, results=True):
+        """Get a compact tuple of the data needed to construct this URL
+        data again with from_record(), eg. to store it on disk.
+
+        @param results: if False, the warnings and info are left out, eg.
+            of a URL being checked, and from_record() adds the warnings
+            of the syntax check
+        @type results: bool
+        @rtype: tuple
+        """
+        return (
+            self.base_url,
+            self.recursion_level,
+            self.parent_url,
+            self.base_ref,
+            self.line,
+            self.column,
+            self.page,
+            self.name,
+            self.encoding,
+            self.extern,
+            self.attempts,
+            self.warnings if results else None,
+            self.info if results else None,
+        )
+
+    @classmethod
+    def from_record(cls, record, aggregate):
+        """Construct URL data from a tuple returned by to_record().
+        Unlike the constructor this does not add intern patterns again.
+
+        @rtype: UrlBase
+        """
+        (
+            base_url,
+            recursion_level,
+            parent_url,
+            base_ref,
+            line,
+            column,
+            page,
+            name,
+            url_encoding,
+            extern,
+            attempts,
+            warnings,
+            info,
+        ) = record
+        url_data = cls.__new__(cls)
+        url_data.reset()
+        url_data.init(
+            base_ref,
+            base_url,
+            parent_url,
+            recursion_level,
+            aggregate,
+            line,
+            column,
+            page,
+            name,
+            url_encoding,
+            extern,
+        )
+        url_data.check_syntax()
+        url_data.attempts = attempts
+        if warnings is not None:
+            url_data.warnings = warnings
+            url_data.info = info
+        return url_data
 
     def serialized(self, sep=os.linesep):
         """
@@ -983,6 +1271,29 @@ class UrlBase:
         """
         return CompactUrlData(self.to_wire_dict())
 
+    def get_alias_results(self, result):
+        """Get the results to be cached for the redirect aliases. The
+        result of an alias has the alias as cache key and only the
+        redirection warnings of the redirections following it.
+
+        @param result: the result of this URL
+        @type result: CompactUrlData
+        @return: list of (cache key, result) tuples
+        @rtype: list
+        """
+        alias_results = []
+        for redirects, alias in enumerate(self.aliases, 1):
+            alias_result = copy.copy(result)
+            alias_result.cache_url = alias
+            alias_result.warnings = []
+            for tag, msg in result.warnings:
+                if redirects and tag == WARN_HTTP_REDIRECTED:
+                    redirects -= 1
+                else:
+                    alias_result.warnings.append((tag, msg))
+            alias_results.append((alias, alias_result))
+        return alias_results
+
 
 urlDataAttr = [
     'valid',
@@ -1019,3 +1330,6 @@ class CompactUrlData:
         '''Set all attributes according to the dictionary wired_url_data'''
         for attr in urlDataAttr:
             setattr(self, attr, wired_url_data[attr])
+        if self.cache_url == self.url:
+            # share the string
+            self.cache_url = self.url
@@ -66,9 +66,12 @@ def print_usage(msg, exit_code=2):
     sys.exit(exit_code)
 
 
+def get_url_data(aggregate, url):
+    """Get URL data of given commandline URL."""
+    url = checker.guess_url(url)
+    return checker.get_url_from(url, 0, aggregate, extern=(0, 0))
+
+
 def aggregate_url(aggregate, url, err_exit_code=2):
     """Append given commandline URL to input queue."""
-    get_url_from = checker.get_url_from
-    url = checker.guess_url(url)
-    url_data = get_url_from(url, 0, aggregate, extern=(0, 0))
-    aggregate.urlqueue.put(url_data)
+    aggregate.urlqueue.put(get_url_data(aggregate, url))
@@ -245,6 +245,21 @@ class ArgParser(LCArgumentParser):
             action="store_true",
             help=_("Read list of white-space separated URLs to check from stdin."),
         )
+        group.add_argument(
+            "--checkpoint",
+            dest="checkpoint",
+            metavar="FILENAME",
+            help=_(
+                "Write the state of the check to FILENAME every five minutes and\n"
+                "when checking is interrupted. The file is removed when all URLs\n"
+                "have been checked."
+            ),
+        )
+        group.add_argument(
+            "--resume",
+            action="store_true",
+            help=_("Continue the check stored in the --checkpoint file."),
+        )
 
         # ================== output options =====================
         group = self.add_argument_group(_("Output options"))
@@ -33,8 +33,9 @@ from .. import fileutil
 from .. import log
 from .. import logconf
 from .. import LinkCheckerError
-from ..cmdline import aggregate_url, print_usage
+from ..cmdline import aggregate_url, get_url_data, print_usage
 from ..director import console, check_urls, get_aggregate
+from ..director.checkpoint import read_checkpoint
 from ..logconf import LOG_CHECK, LOG_CMDLINE, LOG_THREAD
 from ..strformat import stripurl
 
@@ -156,7 +157,10 @@ def linkchecker():
     log.debug(LOG_CMDLINE, "configuration: %s", pprint.pformat(sorted(config.items())))
 
     # prepare checking queue
-    aggregate = get_aggregate(config)
+    try:
+        aggregate = get_aggregate(config)
+    except LinkCheckerError as msg:
+        print_usage(str(msg))
     if options.trace:
         # enable thread tracing
         config["trace"] = True
@@ -165,14 +169,28 @@ def linkchecker():
 
         trace.trace_filter([r"^linkcheck"])
         trace.trace_on()
+    if options.resume:
+        if os.path.exists(config["checkpoint"]):
+            try:
+                read_checkpoint(aggregate, config["checkpoint"])
+            except LinkCheckerError as msg:
+                print_usage(str(msg))
+        else:
+            log.warn(
+                LOG_CMDLINE,
+                _("Checkpoint file %(filename)s not found; starting a new check.")
+                % {"filename": config["checkpoint"]},
+            )
     # add urls to queue
     if options.stdin:
-        for url in read_stdin_urls():
-            aggregate_url(aggregate, url)
+        # the URLs are queued while they are checked
+        aggregate.add_producer(
+            get_url_data(aggregate, url) for url in read_stdin_urls()
+        )
     elif options.url:
         for url in options.url:
             aggregate_url(aggregate, stripurl(url))
-    else:
+    elif not options.resume:
         log.warn(LOG_CMDLINE, _("no files or URLs given"))
     # set up profiling
     do_profile = False
@@ -19,6 +19,7 @@ Configure linkchecker using command-line options and configuration.
 
 import codecs
 import getpass
+import os
 
 from .. import fileutil
 from .. import i18n
@@ -169,6 +170,10 @@ def setup_config(config, options):
         config["recursionlevel"] = options.recursionlevel
     if options.status is not None:
         config["status"] = options.status
+    if options.checkpoint:
+        config["checkpoint"] = os.path.expanduser(options.checkpoint)
+    elif options.resume:
+        print_usage(_("The --resume option requires the --checkpoint option."))
     if options.threads is not None:
         if options.threads < 1:
             options.threads = 0
@@ -73,6 +73,7 @@ Modules = (
     ("GeoIP", "GeoIP", 'lib_version'),  # on Unix systems
     ("pygeoip", "GeoIP", 'lib_version'),  # on Windows systems
     ("sqlite3", "SQLite", 'sqlite_version'),
+    ("httpx", "HTTPX", "__version__"),
     ("meliae", "Meliae", '__version__'),
 )
 
@@ -148,6 +149,19 @@ class Configuration(dict):
         self["maxnumurls"] = None
         self["maxrunseconds"] = None
         self["maxrequestspersecond"] = 10
+        self["hostfrontier"] = False
+        self["maxretries"] = 2
+        self["maxurlsinmemory"] = 0
+        self["maxcontentinmemory"] = 0
+        self["maxconnections"] = 100
+        self["maxconnectionsperhost"] = 10
+        self["connectionidletime"] = 30
+        self["http2"] = False
+        self["dnscachetime"] = 300
+        self["linkstore"] = None
+        self["externcache"] = None
+        self["externcachevalid"] = 7 * 24 * 60 * 60
+        self["externcacheinvalid"] = 60 * 60
         self["maxhttpredirects"] = 10
         self["sslverify"] = True
         self["threads"] = 10
@@ -156,6 +170,7 @@ class Configuration(dict):
         self["recursionlevel"] = -1
         self["useragent"] = UserAgent
         self["resultcachesize"] = 100000
+        self["bloomfiltersize"] = 0
         # authentication
         self["authentication"] = []
         self["loginurl"] = None
@@ -181,6 +196,8 @@ class Configuration(dict):
         self['output'] = 'text'
         self["status"] = True
         self["status_wait_seconds"] = 5
+        self["checkpoint"] = None
+        self["checkpoint_wait_seconds"] = 300
         self['logger'] = None
         self.status_logger = None
         self.loggers = {}
@@ -264,6 +281,11 @@ class Configuration(dict):
         if self['loginurl']:
             self.sanitize_loginurl()
         self.sanitize_plugins()
+        if self["maxurlsinmemory"]:
+            self.sanitize_maxurlsinmemory()
+        for key in ("linkstore", "externcache"):
+            if self[key]:
+                self.sanitize_database(key)
         self.sanitize_ssl()
         # set default socket timeout
         socket.setdefaulttimeout(self['timeout'])
@@ -296,6 +318,27 @@ class Configuration(dict):
             log.warn(LOG_CHECK, _("disabling login URL %(url)s.") % {"url": url})
             self["loginurl"] = None
 
+    def sanitize_maxurlsinmemory(self):
+        """Disable spilling queued URLs to disk without SQLite."""
+        if not fileutil.has_module("sqlite3"):
+            log.warn(
+                LOG_CHECK,
+                _("SQLite is not available, keeping all queued URLs in memory."),
+            )
+            self["maxurlsinmemory"] = 0
+
+    def sanitize_database(self, key):
+        """Disable the option naming a database file without SQLite."""
+        if not fileutil.has_module("sqlite3"):
+            log.warn(
+                LOG_CHECK,
+                _("SQLite is not available, disabling the %(option)s option.")
+                % {"option": key},
+            )
+            self[key] = None
+        else:
+            self[key] = os.path.expanduser(self[key])
+
     def sanitize_plugins(self):
         """Ensure each plugin is configurable."""
         for plugin in self["enabledplugins"]:
@@ -199,6 +199,19 @@ class LCConfigParser(RawConfigParser):
         self.read_int_option(section, "recursionlevel", min=-1)
         self.read_string_option(section, "useragent")
         self.read_float_option(section, "maxrequestspersecond", min=0.001)
+        self.read_boolean_option(section, "hostfrontier")
+        self.read_int_option(section, "maxretries", min=0)
+        self.read_int_option(section, "maxurlsinmemory", min=0)
+        self.read_int_option(section, "maxcontentinmemory", min=0)
+        self.read_int_option(section, "maxconnections", min=1)
+        self.read_int_option(section, "maxconnectionsperhost", min=1)
+        self.read_int_option(section, "connectionidletime", min=0)
+        self.read_boolean_option(section, "http2")
+        self.read_int_option(section, "dnscachetime", min=0)
+        self.read_string_option(section, "linkstore")
+        self.read_string_option(section, "externcache")
+        self.read_int_option(section, "externcachevalid", min=0)
+        self.read_int_option(section, "externcacheinvalid", min=0)
         self.read_int_option(section, "maxnumurls", min=0)
         self.read_int_option(section, "maxfilesizeparse", min=1)
         self.read_int_option(section, "maxfilesizedownload", min=1)
@@ -217,6 +230,7 @@ class LCConfigParser(RawConfigParser):
             self.read_string_option(section, "sslverify")
         self.read_int_option(section, "maxrunseconds", min=0)
         self.read_int_option(section, "resultcachesize", min=0)
+        self.read_int_option(section, "bloomfiltersize", min=0)
 
     def read_authentication_config(self):
         """Read configuration options in section "authentication"."""
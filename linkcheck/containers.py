@@ -16,6 +16,8 @@
 """
 Special container classes.
 """
+import math
+from array import array
 
 
 class LFUCache(dict):
@@ -102,3 +104,218 @@ class LFUCache(dict):
         """Remove and return a value."""
         value = super().pop()
         return value[1]
+
+
+class FingerprintSet:
+    """Set of 64 bit integer fingerprints, eg. hashes of URLs, stored in
+    an array with open addressing and linear probing. Each fingerprint
+    takes about 13 to 27 bytes at the load factor of 0.3 to 0.6 instead
+    of about 70 bytes in a Python set. Containment checks need no lock
+    while a single thread at a time adds fingerprints, since the table
+    and its mask are replaced together when the table grows."""
+
+    # the table is doubled when more than this fraction of slots is used
+    max_load = 0.6
+
+    def __init__(self, size=1024):
+        """Initialize an empty set.
+
+        @param size: initial number of slots, a power of two
+        @type size: int
+        """
+        if size < 1 or size & (size - 1):
+            raise ValueError("invalid set size %d" % size)
+        # tuple (table, mask), zero marks an empty slot
+        self.slots = (array("Q", bytes(8 * size)), size - 1)
+        self.used = 0
+
+    @staticmethod
+    def get_slot_value(fingerprint):
+        """Return the non-zero value a fingerprint is stored as."""
+        return fingerprint or 1
+
+    @staticmethod
+    def find(slots, value):
+        """Return the slot of the given value or of the empty slot where
+        it would be stored in the given table."""
+        table, mask = slots
+        i = value & mask
+        while True:
+            slot = table[i]
+            if slot == value or not slot:
+                return i
+            i = (i + 1) & mask
+
+    def add(self, fingerprint):
+        """Add a fingerprint.
+
+        @return: True if the fingerprint was not in the set before
+        @rtype: bool
+        """
+        value = self.get_slot_value(fingerprint)
+        slots = self.slots
+        table = slots[0]
+        i = self.find(slots, value)
+        if table[i]:
+            return False
+        table[i] = value
+        self.used += 1
+        if self.used > self.max_load * len(table):
+            self.resize(2 * len(table))
+        return True
+
+    def discard(self, fingerprint):
+        """Remove a fingerprint if it is in the set. The following
+        entries of the probe sequence are shifted back into the gap."""
+        slots = self.slots
+        table, mask = slots
+        i = self.find(slots, self.get_slot_value(fingerprint))
+        if not table[i]:
+            return
+        table[i] = 0
+        self.used -= 1
+        j = i
+        while True:
+            j = (j + 1) & mask
+            value = table[j]
+            if not value:
+                return
+            # move the value if its home slot is not between the gap
+            # and its current slot
+            if (j - (value & mask)) & mask >= (j - i) & mask:
+                table[i] = value
+                table[j] = 0
+                i = j
+
+    def resize(self, size):
+        """Store the fingerprints in a table with the given size. The
+        new table is filled before it replaces the old one."""
+        slots = (array("Q", bytes(8 * size)), size - 1)
+        table = slots[0]
+        for value in self:
+            table[self.find(slots, value)] = value
+        self.slots = slots
+
+    def update(self, other):
+        """Add the fingerprints of another set."""
+        for fingerprint in other:
+            self.add(fingerprint)
+
+    def copy(self):
+        """Return a copy of the set."""
+        other = FingerprintSet.__new__(FingerprintSet)
+        table, mask = self.slots
+        other.slots = (array("Q", table), mask)
+        other.used = self.used
+        return other
+
+    def __contains__(self, fingerprint):
+        """Check if the fingerprint is in the set."""
+        slots = self.slots
+        return bool(slots[0][self.find(slots, self.get_slot_value(fingerprint))])
+
+    def __iter__(self):
+        """Iterate over the stored fingerprints. A fingerprint 0 is
+        returned as 1."""
+        return (value for value in self.slots[0] if value)
+
+    def __len__(self):
+        """Return the number of fingerprints."""
+        return self.used
+
+    def get_memory(self):
+        """Return the size of the table in bytes."""
+        table = self.slots[0]
+        return table.itemsize * len(table)
+
+    def get_error_rate(self):
+        """Return the probability that a new 64 bit fingerprint is
+        falsely reported as contained, ie. collides with a stored one."""
+        return self.used / 2 ** 64
+
+
+class BloomFilter:
+    """Bloom filter of 64 bit integer fingerprints, for checking whether
+    a fingerprint has been added with a fixed amount of memory. A
+    fingerprint that has not been added is reported as contained with
+    a probability that grows with the number of added fingerprints."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        """Initialize an empty filter sized for the given number of
+        fingerprints and false positive rate.
+
+        @param capacity: expected number of fingerprints
+        @type capacity: int
+        @param error_rate: false positive rate at the expected number
+        @type error_rate: float
+        """
+        if capacity < 1:
+            raise ValueError("invalid filter capacity %d" % capacity)
+        numbits = -capacity * math.log(error_rate) / math.log(2) ** 2
+        self.numbits = max(64, int(math.ceil(numbits / 8)) * 8)
+        self.numhashes = max(1, round(self.numbits / capacity * math.log(2)))
+        self.bits = bytearray(self.numbits // 8)
+        self.used = 0
+
+    def get_bits(self, fingerprint):
+        """Return the bit positions of a fingerprint, derived from its
+        two 32 bit halves by double hashing."""
+        low = fingerprint & 0xFFFFFFFF
+        high = (fingerprint >> 32) | 1
+        return [(low + i * high) % self.numbits for i in range(self.numhashes)]
+
+    def add(self, fingerprint):
+        """Add a fingerprint.
+
+        @return: True if the fingerprint was not reported as contained
+        @rtype: bool
+        """
+        bits = self.bits
+        new = False
+        for bit in self.get_bits(fingerprint):
+            mask = 1 << (bit & 7)
+            if not bits[bit >> 3] & mask:
+                bits[bit >> 3] |= mask
+                new = True
+        if new:
+            self.used += 1
+        return new
+
+    def update(self, other):
+        """Add the fingerprints of another filter with the same size."""
+        if (other.numbits, other.numhashes) != (self.numbits, self.numhashes):
+            raise ValueError("Bloom filters have different sizes")
+        bits = int.from_bytes(self.bits, "little") | int.from_bytes(
+            other.bits, "little"
+        )
+        self.bits = bytearray(bits.to_bytes(len(self.bits), "little"))
+        self.used += other.used
+
+    def copy(self):
+        """Return a copy of the filter."""
+        other = BloomFilter.__new__(BloomFilter)
+        other.__dict__.update(self.__dict__)
+        other.bits = bytearray(self.bits)
+        return other
+
+    def __contains__(self, fingerprint):
+        """Check if the fingerprint has probably been added."""
+        bits = self.bits
+        return all(
+            bits[bit >> 3] & (1 << (bit & 7)) for bit in self.get_bits(fingerprint)
+        )
+
+    def __len__(self):
+        """Return the number of added fingerprints that were new."""
+        return self.used
+
+    def get_memory(self):
+        """Return the size of the bit array in bytes."""
+        return len(self.bits)
+
+    def get_error_rate(self):
+        """Return the current probability that a fingerprint that has
+        not been added is reported as contained."""
+        return (1 - math.exp(-self.numhashes * self.used / self.numbits)) ** (
+            self.numhashes
+        )
@@ -20,7 +20,18 @@ import os
 import time
 
 from .. import log, LOG_CHECK, LinkCheckerError, LinkCheckerInterrupt, plugins
-from ..cache import urlqueue, robots_txt, results
+from ..cache import (
+    urlqueue,
+    robots_txt,
+    results,
+    hosts,
+    linkstore,
+    resultstore,
+    budget,
+    connections,
+    dnscache,
+    http2,
+)
 from . import aggregator, console
 
 
@@ -44,11 +55,12 @@ def check_urls(aggregate):
         log.error(LOG_CHECK, _("Error starting log output: %(msg)s.") % dict(msg=msg))
         raise
     try:
-        if not aggregate.urlqueue.empty():
+        if not aggregate.urlqueue.empty() or aggregate.inputs:
             aggregate.start_threads()
         check_url(aggregate)
         aggregate.finish()
         aggregate.end_log_output()
+        aggregate.remove_checkpoint()
     except LinkCheckerInterrupt:
         raise
     except KeyboardInterrupt:
@@ -129,12 +141,75 @@ def abort_now():
         os._exit(3)
 
 
+def get_adapter(config, dns_cache):
+    """Get the transport adapter shared by the request sessions of all
+    threads; the HTTP/2 transport if configured and available. The
+    HTTP/1.1 transport resolves hosts with the given DNS cache."""
+    args = (
+        config["maxconnections"],
+        config["maxconnectionsperhost"],
+        config["connectionidletime"],
+    )
+    if config["http2"]:
+        if http2.has_h2:
+            return http2.Http2Adapter(*args)
+        log.warn(LOG_CHECK, _("httpx with HTTP/2 support not found, using HTTP/1.1"))
+    return connections.SharedAdapter(*args, dns_cache=dns_cache)
+
+
 def get_aggregate(config):
     """Get an aggregator instance with given configuration."""
-    _urlqueue = urlqueue.UrlQueue(max_allowed_urls=config["maxnumurls"])
+    if config["threads"] > 0:
+        max_connections = min(config["threads"], config["maxconnectionsperhost"])
+    else:
+        max_connections = None
+    _hosts = hosts.HostScheduler(max_connections=max_connections)
+    if config["hostfrontier"]:
+        spacing = 1.0 / config["maxrequestspersecond"]
+        frontier = urlqueue.HostFrontier(_hosts, spacing)
+    else:
+        frontier = None
+    if config["maxurlsinmemory"]:
+        frontier = urlqueue.SpillFrontier(
+            frontier if frontier is not None else urlqueue.FifoFrontier(),
+            config["maxurlsinmemory"],
+        )
+    dns_cache = dnscache.DnsCache(config["dnscachetime"])
+    if config["threads"] > 0 and config["dnscachetime"]:
+        # the hosts of URLs to check are resolved in the background
+        prefetch = dns_cache.prefetch
+    else:
+        prefetch = None
+    _urlqueue = urlqueue.UrlQueue(
+        max_allowed_urls=config["maxnumurls"], frontier=frontier, prefetch=prefetch
+    )
     _robots_txt = robots_txt.RobotsTxt(config["useragent"])
     plugin_manager = plugins.PluginManager(config)
-    result_cache = results.ResultCache(config["resultcachesize"])
+    result_cache = results.ResultCache(
+        config["resultcachesize"], config["bloomfiltersize"]
+    )
+    if config["linkstore"]:
+        link_store = linkstore.LinkStore(config["linkstore"])
+    else:
+        link_store = None
+    if config["externcache"]:
+        result_store = resultstore.ResultStore(
+            config["externcache"],
+            config["externcachevalid"],
+            config["externcacheinvalid"],
+        )
+    else:
+        result_store = None
     return aggregator.Aggregate(
-        config, _urlqueue, _robots_txt, plugin_manager, result_cache
+        config,
+        _urlqueue,
+        _robots_txt,
+        plugin_manager,
+        result_cache,
+        _hosts,
+        budget.ContentBudget(config["maxcontentinmemory"]),
+        get_adapter(config, dns_cache),
+        dns_cache,
+        link_store=link_store,
+        result_store=result_store,
     )
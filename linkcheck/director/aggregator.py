@@ -16,28 +16,32 @@
 """
 Aggregate needed object instances for checker threads.
 """
+import os
 import threading
 
 import requests
-import time
 import urllib.parse
-import random
 from .. import log, LOG_CHECK, strformat, LinkCheckerError
 from ..decorators import synchronized
 from ..cache import urlqueue
 from ..htmlutil import loginformsearch
 from ..cookies import from_file
-from . import logger, status, checker, interrupter
+from . import logger, status, checker, checkpoint, interrupter, producer
 
 
 _threads_lock = threading.RLock()
+_sessions_lock = threading.RLock()
 _hosts_lock = threading.RLock()
 _downloadedbytes_lock = threading.RLock()
 
 
-def new_request_session(config, cookies):
-    """Create a new request session."""
+def new_request_session(config, cookies, adapter=None):
+    """Create a new request session. HTTP and HTTPS requests are sent
+    with the given transport adapter, eg. one shared by all sessions."""
     session = requests.Session()
+    if adapter is not None:
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
     if cookies:
         session.cookies = cookies
     session.max_redirects = config["maxhttpredirects"]
@@ -60,19 +64,48 @@ class Aggregate:
     """Store thread-safe data collections for checker threads."""
     wait_time_min_default = 0.1
     wait_time_max_default = 0.6
+    retry_after_max = 60
+    retry_delay_min = 1.0
 
-    def __init__(self, config, urlqueue, robots_txt, plugin_manager, result_cache):
+    def __init__(
+        self,
+        config,
+        urlqueue,
+        robots_txt,
+        plugin_manager,
+        result_cache,
+        hosts,
+        content_budget,
+        adapter,
+        dns_cache,
+        link_store=None,
+        result_store=None,
+    ):
         """Store given link checking objects."""
         self.config = config
         self.urlqueue = urlqueue
         self.logger = logger.Logger(config)
         self.threads = []
+        # URL data iterables queued by producer threads
+        self.inputs = []
         self.request_sessions = {}
         self.robots_txt = robots_txt
         self.plugin_manager = plugin_manager
         self.result_cache = result_cache
-        self.times = {}
+        self.hosts = hosts
+        # count of page content in memory, limiting new downloads
+        self.content_budget = content_budget
+        # connection pool shared by the request sessions of all threads
+        self.adapter = adapter
+        # host name resolutions shared by all threads
+        self.dns_cache = dns_cache
+        # store of validators and links of parsed pages, or None
+        self.link_store = link_store
+        # cache of extern URL results across check runs, or None
+        self.result_store = result_store
         self.maxrated = {}
+        # hosts which do not support HEAD requests
+        self.nohead_hosts = set()
         self.cookies = None
         requests_per_second = config["maxrequestspersecond"]
         self.wait_time_min = 1.0 / requests_per_second
@@ -89,7 +122,7 @@ class Aggregate:
             raise LinkCheckerError(
                 "loginurl is configured but neither user nor password are set"
             )
-        session = new_request_session(self.config, self.cookies)
+        session = new_request_session(self.config, self.cookies, self.adapter)
         log.debug(LOG_CHECK, "Getting login form %s", url)
         kwargs = dict(timeout=self.config["timeout"])
         # XXX: sslverify?  can we reuse HttpUrl.get_request_kwargs()
@@ -115,6 +148,18 @@ class Aggregate:
         if len(self.cookies) == 0:
             raise LinkCheckerError("No cookies set by login URL %s" % url)
 
+    def add_producer(self, items):
+        """Queue the URL data of given iterable, eg. of URLs read from
+        stdin, with a producer thread started by start_threads(), so
+        checking starts with the first URL. Without checker threads the
+        URL data is queued at once."""
+        if self.config["threads"] > 0:
+            self.urlqueue.add_producer()
+            self.inputs.append(items)
+        else:
+            for url_data in items:
+                self.urlqueue.put(url_data)
+
     @synchronized(_threads_lock)
     def start_threads(self):
         """Spawn threads for URL checking and status printing."""
@@ -126,57 +171,101 @@ class Aggregate:
             t = interrupter.Interrupt(self.config["maxrunseconds"])
             t.start()
             self.threads.append(t)
+        if self.config["checkpoint"]:
+            t = checkpoint.Checkpoint(
+                self,
+                self.config["checkpoint"],
+                self.config["checkpoint_wait_seconds"],
+            )
+            t.start()
+            self.threads.append(t)
         num = self.config["threads"]
         if num > 0:
+            # resolve the hosts of queued URLs in the background
+            self.dns_cache.start_prefetch(num)
             for dummy in range(num):
                 t = checker.Checker(
                     self.urlqueue, self.logger, self.add_request_session
                 )
                 self.threads.append(t)
                 t.start()
+            for items in self.inputs:
+                t = producer.Producer(self.urlqueue, items, self.logger)
+                self.threads.append(t)
+                t.start()
         else:
             self.request_sessions[threading.get_ident()] = new_request_session(
-                self.config, self.cookies
+                self.config, self.cookies, self.adapter
             )
             checker.check_urls(self.urlqueue, self.logger)
 
-    @synchronized(_threads_lock)
+    @synchronized(_sessions_lock)
     def add_request_session(self):
         """Add a request session for current thread."""
-        session = new_request_session(self.config, self.cookies)
+        session = new_request_session(self.config, self.cookies, self.adapter)
         self.request_sessions[threading.get_ident()] = session
 
-    @synchronized(_threads_lock)
+    @synchronized(_sessions_lock)
     def get_request_session(self):
         """Get the request session for current thread."""
         return self.request_sessions[threading.get_ident()]
 
-    @synchronized(_hosts_lock)
     def wait_for_host(self, host):
-        """Throttle requests to one host."""
-        t = time.time()
-        if host in self.times:
-            due_time = self.times[host]
-            if due_time > t:
-                wait = due_time - t
-                time.sleep(wait)
-                t = time.time()
-        if host in self.maxrated:
-            wait_time_min, wait_time_max = self.wait_time_min, self.wait_time_max
+        """Throttle requests to one host. Waits until the controller of
+        the host allows another connection, which must be given back
+        with release_host() after the request. Only the slot reservation
+        is synchronized; the wait itself does not block other threads.
+        The request rate of a host adapts to its response times. It may
+        grow up to the configured rate if the host sends a LinkChecker
+        header or its robots.txt has been read, otherwise up to
+        wait_time_min_default. A Crawl-delay from the robots.txt of the
+        host is used as the wait time, if it is longer."""
+        crawldelay = self.robots_txt.get_crawldelay(host)
+        if crawldelay is not None or host in self.maxrated:
+            wait_time_min = self.wait_time_min
         else:
             wait_time_min = max(self.wait_time_min, self.wait_time_min_default)
-            wait_time_max = max(self.wait_time_max, self.wait_time_max_default)
+        rate = self.hosts.get_controller(host).acquire(1.0 / wait_time_min)
+        if crawldelay is not None and crawldelay > 1.0 / rate:
+            wait_time_min = wait_time_max = crawldelay
+        else:
+            wait_time_min = 1.0 / rate
+            wait_time_max = wait_time_min * self.wait_time_max / self.wait_time_min
         log.debug(LOG_CHECK,
                   "Min wait time: %s Max wait time: %s for host: %s",
                   wait_time_min, wait_time_max, host)
-        wait_time = random.uniform(wait_time_min, wait_time_max)
-        self.times[host] = t + wait_time
+        self.hosts.wait(host, wait_time_min, wait_time_max)
+
+    def release_host(self, host, latency=None, congested=False, retry_after=None):
+        """Give back the connection to a host taken by wait_for_host().
+        The response time in seconds and congestion signals, like 429 or
+        503 responses and timeouts, adapt the limits of the host. No
+        further request is sent to the host for retry_after seconds,
+        at most retry_after_max."""
+        if retry_after:
+            self.hosts.delay(host, min(retry_after, self.retry_after_max))
+        self.hosts.get_controller(host).release(latency, congested=congested)
+
+    def get_retry_delay(self, attempts, retry_after=None):
+        """Get the number of seconds to wait before a URL is checked
+        again after a temporary failure. The delay starts at
+        retry_delay_min and doubles with each attempt; a longer
+        Retry-After value is honored up to retry_after_max seconds."""
+        delay = self.retry_delay_min * 2 ** attempts
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, self.retry_after_max)
 
     @synchronized(_hosts_lock)
     def set_maxrated_for_host(self, host):
         """Remove the limit on the maximum request rate for a host."""
         self.maxrated[host] = True
 
+    @synchronized(_hosts_lock)
+    def set_nohead_for_host(self, host):
+        """Send only GET requests to a host."""
+        self.nohead_hosts.add(host)
+
     @synchronized(_threads_lock)
     def print_active_threads(self):
         """Log all currently active threads."""
@@ -215,8 +304,10 @@ class Aggregate:
         self.urlqueue.do_shutdown()
 
     def abort(self):
-        """Print still-active URLs and empty the URL queue."""
+        """Print still-active URLs, write the checkpoint file if configured
+        and empty the URL queue."""
         self.print_active_threads()
+        self.write_checkpoint()
         self.cancel()
         timeout = self.config["aborttimeout"]
         try:
@@ -228,6 +319,25 @@ class Aggregate:
             )
             raise KeyboardInterrupt()
 
+    def write_checkpoint(self):
+        """Write the checkpoint file if configured."""
+        filename = self.config["checkpoint"]
+        if filename and checkpoint.write_checkpoint(self, filename):
+            log.info(
+                LOG_CHECK,
+                _("Checkpoint written to %(filename)s; continue with --resume.")
+                % {"filename": filename},
+            )
+
+    def remove_checkpoint(self):
+        """Remove the checkpoint file after all URLs have been checked."""
+        filename = self.config["checkpoint"]
+        if filename and not self.urlqueue.shutdown:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
     @synchronized(_threads_lock)
     def remove_stopped_threads(self):
         """Remove the stopped threads from the internal thread list."""
@@ -243,6 +353,13 @@ class Aggregate:
             t.stop()
         for t in self.threads:
             t.join(timeout=1.0)
+        # close the kept-alive connections
+        self.adapter.close()
+        self.dns_cache.close()
+        if self.link_store is not None:
+            self.link_store.close()
+        if self.result_store is not None:
+            self.result_store.close()
 
     @synchronized(_threads_lock)
     def is_finished(self):
@@ -259,7 +376,11 @@ class Aggregate:
         """Print ending output to log."""
         kwargs.update(
             dict(
-                downloaded_bytes=self.downloaded_bytes, num_urls=len(self.result_cache),
+                downloaded_bytes=self.downloaded_bytes,
+                num_urls=len(self.result_cache),
+                result_cache=self.result_cache.get_stats(),
+                connections=self.adapter.get_stats(),
+                dns_cache=self.dns_cache.get_stats(),
             )
         )
         self.logger.end_log_output(**kwargs)
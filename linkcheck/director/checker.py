@@ -37,34 +37,62 @@ def check_urls(urlqueue, logger):
 
 
 def check_url(url_data, logger):
-    """Check a single URL with logging."""
+    """Check a single URL with logging. The URL data of a link record
+    is constructed first; duplicate links are skipped."""
+    if url_data.is_record:
+        record, url_data = url_data, url_data.build()
+        if not url_data.aggregate.urlqueue.claim(url_data, record):
+            return
     if url_data.has_result:
         logger.log_url(url_data.to_wire())
     else:
         cache = url_data.aggregate.result_cache
         key = url_data.cache_url
         result = cache.get_result(key)
+        # extern results are stored across check runs
+        store = url_data.aggregate.result_store if url_data.extern[0] else None
+        if result is None and store is not None:
+            result = store.get_result(key)
+            if result is not None:
+                cache.add_result(key, result)
         if result is None:
             # check
             check_start = time.time()
             try:
                 url_data.check()
+                if url_data.retry_after is not None:
+                    # temporary failure; check again later without
+                    # blocking this thread
+                    url_data.aggregate.urlqueue.defer(
+                        url_data.get_retry(), url_data.retry_after
+                    )
+                    return
+                # the parser uses the content after the content plugins,
+                # which release the content they no longer need; a content
+                # type read from the content registers its parser forms
+                url_data.add_content_users(parser.get_content_forms(url_data))
                 do_parse = url_data.check_content()
+                url_data.release_unused_content()
                 url_data.checktime = time.time() - check_start
                 # Add result to cache
                 result = url_data.to_wire()
                 cache.add_result(key, result)
-                for alias in url_data.aliases:
+                if store is not None and url_data.caching:
+                    store.add_result(key, result)
+                for alias, alias_result in url_data.get_alias_results(result):
                     # redirect aliases
-                    cache.add_result(alias, result)
+                    cache.add_result(alias, alias_result)
+                # check queued URLs with these keys next
+                url_data.aggregate.urlqueue.results_cached([key] + url_data.aliases)
                 logger.log_url(result)
                 # parse content recursively
                 # XXX this could add new warnings which should be cached.
                 if do_parse:
                     parser.parse_url(url_data)
             finally:
-                # close/release possible open connection
+                # close/release possible open connection and content
                 url_data.close_connection()
+                url_data.release_content()
         else:
             # copy data from cache and adjust it
             result = copy.copy(result)
@@ -0,0 +1,185 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Store the state of a check run in a checkpoint file and resume from it.
+"""
+import gzip
+import os
+import pickle
+import threading
+
+from .. import log, LOG_CHECK, LinkCheckerError
+from ..cache.urlqueue import SPILL_BATCH_SIZE
+from ..decorators import synchronized
+from . import task
+
+_lock = threading.Lock()
+
+# format version of checkpoint files
+CHECKPOINT_VERSION = 4
+
+
+@synchronized(_lock)
+def write_checkpoint(aggregate, filename):
+    """Write the queued URLs, the seen URLs, the cached results and the
+    logger statistics of the check run to a compressed checkpoint file.
+    URLs being checked are stored as queued URLs without the results of
+    their partial check, since the links they contain might not be
+    queued yet. The statistics and the seen URLs are taken while no URL
+    is done, so URLs being checked can only be counted twice if their
+    result has been logged already. URLs spilled to disk are written as
+    records after the state, one at a time. Nothing is written after the
+    URL queue has been shut down.
+
+    @return: True if the checkpoint has been written
+    @rtype: bool
+    """
+    urlqueue = aggregate.urlqueue
+    if urlqueue.shutdown:
+        return False
+
+    def get_state(active):
+        """Get the statistics, the seen URLs and the cached results
+        without the results of the URLs being checked."""
+        stats = aggregate.logger.get_stats()
+        seen, results = aggregate.result_cache.get_state(
+            url_data.cache_url for url_data in active if url_data.cache_url is not None
+        )
+        return stats, seen, results
+
+    active, urls, spilled, records, (stats, seen, results) = urlqueue.get_urls(
+        get_state
+    )
+    entries = [
+        (url_data.__class__, url_data.to_record(results=False)) for url_data in active
+    ]
+    entries.extend((url_data.__class__, url_data.to_record()) for url_data in urls)
+    state = {
+        "version": CHECKPOINT_VERSION,
+        "urls": entries,
+        "spilled": spilled,
+        "seen": seen,
+        "results": results,
+        "stats": stats,
+        "internlinks": list(aggregate.config["internlinks"]),
+        "maxnumurls": urlqueue.max_allowed_urls,
+        "downloaded_bytes": aggregate.downloaded_bytes,
+    }
+    tmpname = filename + ".tmp"
+    with gzip.open(tmpname, "wb", compresslevel=1) as f:
+        pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+        for entry in records:
+            pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(tmpname, filename)
+    log.debug(
+        LOG_CHECK,
+        "wrote checkpoint %s with %d URLs and %d seen URLs",
+        filename,
+        len(entries) + spilled,
+        len(seen),
+    )
+    return True
+
+
+def read_checkpoint(aggregate, filename):
+    """Restore the state of a check run from a checkpoint file written by
+    write_checkpoint(). The seen URLs and cached results are added to the
+    result cache and the stored URLs are queued again. The logger statistics are
+    continued when the log output starts.
+
+    @raises LinkCheckerError: if the file cannot be read
+    """
+    try:
+        with gzip.open(filename, "rb") as f:
+            state = pickle.load(f)
+            if (
+                not isinstance(state, dict)
+                or state.get("version") != CHECKPOINT_VERSION
+            ):
+                raise LinkCheckerError(
+                    _("Unsupported checkpoint file %(filename)s")
+                    % {"filename": filename}
+                )
+            resume(aggregate, filename, state, f)
+    except (OSError, EOFError, pickle.UnpicklingError) as msg:
+        raise LinkCheckerError(
+            _("Could not read checkpoint file %(filename)s: %(msg)s")
+            % {"filename": filename, "msg": msg}
+        )
+
+
+def resume(aggregate, filename, state, f):
+    """Restore the state read from a checkpoint file and queue the
+    spilled URLs following it in the file."""
+    patterns = {entry["pattern"].pattern for entry in aggregate.config["internlinks"]}
+    for entry in state["internlinks"]:
+        if entry["pattern"].pattern not in patterns:
+            aggregate.config["internlinks"].append(entry)
+    urls = [klass.from_record(record, aggregate) for klass, record in state["urls"]]
+    urlqueue = aggregate.urlqueue
+    # the stored URLs have been counted already
+    urlqueue.max_allowed_urls = None
+    if urls:
+        urlqueue.put_many(urls)
+    # spilled URLs are queued in batches, so that they are spilled again
+    for start in range(0, state["spilled"], SPILL_BATCH_SIZE):
+        num = min(SPILL_BATCH_SIZE, state["spilled"] - start)
+        batch = []
+        for dummy in range(num):
+            klass, record = pickle.load(f)
+            batch.append(klass.from_record(record, aggregate))
+        urlqueue.put_many(batch)
+    urlqueue.max_allowed_urls = state["maxnumurls"]
+    # the stored URLs are queued before they are marked as seen
+    try:
+        aggregate.result_cache.add_state(state["seen"], state["results"])
+    except ValueError:
+        raise LinkCheckerError(
+            _("The checkpoint file %(filename)s has another bloomfiltersize")
+            % {"filename": filename}
+        )
+    aggregate.logger.resumed_stats = state["stats"]
+    aggregate.downloaded_bytes = state["downloaded_bytes"]
+    log.info(
+        LOG_CHECK,
+        _("Resuming with %(urls)d queued URLs and %(results)d checked URLs")
+        % {"urls": len(urls) + state["spilled"], "results": len(state["seen"])},
+    )
+
+
+class Checkpoint(task.LoggedCheckedTask):
+    """Thread that writes a checkpoint file periodically."""
+
+    def __init__(self, aggregate, filename, wait_seconds):
+        """Initialize the checkpoint task.
+
+        @param aggregate: the aggregate of the check run
+        @type aggregate: Aggregate
+        @param filename: name of the checkpoint file
+        @type filename: string
+        @param wait_seconds: interval in seconds to write the checkpoint
+        @type wait_seconds: int
+        """
+        super().__init__(aggregate.logger)
+        self.aggregate = aggregate
+        self.filename = filename
+        self.wait_seconds = wait_seconds
+
+    def run_checked(self):
+        """Write the checkpoint file every wait_seconds."""
+        self.name = "Checkpoint"
+        while not self.stopped(self.wait_seconds):
+            write_checkpoint(self.aggregate, self.filename)
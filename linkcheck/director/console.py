@@ -33,8 +33,14 @@ class StatusLogger:
         """Save file descriptor for logging."""
         self.fd = fd
 
-    def log_status(self, checked, in_progress, queue, duration, num_urls):
-        """Write status message to file descriptor."""
+    def log_status(
+        self, checked, in_progress, queue, duration, num_urls, hosts=None, content=None
+    ):
+        """Write status message to file descriptor. The optional hosts
+        tuple (hosts, throttled, slowest) is the status of the host
+        request controllers, see HostScheduler.status(). The optional
+        content tuple (used, budget) is the number of bytes of page
+        content in memory and their limit, see ContentBudget.status()."""
         msg = _n("%2d thread active", "%2d threads active", in_progress) % in_progress
         self.write("%s, " % msg)
         msg = _n("%5d link queued", "%5d links queued", queue) % queue
@@ -43,6 +49,27 @@ class StatusLogger:
         self.write("%s" % msg)
         msg = _n("%3d URL", "%3d URLs", num_urls) % num_urls
         self.write(" in %s checked, " % msg)
+        if hosts is not None and hosts[1]:
+            num_hosts, throttled, (host, rate, connections) = hosts
+            msg = _n("%d host", "%d hosts", num_hosts) % num_hosts
+            msg = _n("%(throttled)d of %(hosts)s slowed down",
+                     "%(throttled)d of %(hosts)s slowed down",
+                     throttled) % {"throttled": throttled, "hosts": msg}
+            self.write("%s " % msg)
+            msg = _n("(slowest %s: %.2f requests/s, %d connection), ",
+                     "(slowest %s: %.2f requests/s, %d connections), ",
+                     connections) % (host, rate, connections)
+            self.write(msg)
+        if content is not None and any(content):
+            used, max_bytes = content
+            if max_bytes:
+                msg = _("%(used)s of %(max)s content in memory, ") % {
+                    "used": strformat.strsize(used),
+                    "max": strformat.strsize(max_bytes),
+                }
+            else:
+                msg = _("%s content in memory, ") % strformat.strsize(used)
+            self.write(msg)
         msg = _("runtime %s") % strformat.strduration_long(duration)
         self.writeln(msg)
         self.flush()
@@ -14,6 +14,7 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """Logger for aggregator instances"""
+import copy
 import threading
 import _thread
 
@@ -31,13 +32,28 @@ class Logger:
         self.loggers.extend(config['fileoutput'])
         self.verbose = config["verbose"]
         self.warnings = config["warnings"]
+        # statistics of all loggers restored from a checkpoint
+        self.resumed_stats = None
 
     def start_log_output(self):
         """
-        Start output of all configured loggers.
+        Start output of all configured loggers. Statistics restored from
+        a checkpoint are continued.
         """
         for logger in self.loggers:
             logger.start_output()
+        if self.resumed_stats is not None:
+            for logger, stats in zip(self.loggers, self.resumed_stats):
+                logger.stats = stats
+
+    @synchronized(_lock)
+    def get_stats(self):
+        """Return a copy of the statistics of all loggers, eg. to store
+        them in a checkpoint.
+
+        @rtype: list
+        """
+        return [copy.deepcopy(logger.stats) for logger in self.loggers]
 
     def end_log_output(self, **kwargs):
         """
@@ -0,0 +1,54 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+URL input handling.
+"""
+from . import task
+
+# number of queued URLs the producer waits at before queueing more
+MAX_QUEUED_URLS = 1000
+
+
+class Producer(task.LoggedCheckedTask):
+    """Thread putting URL data of an iterable into the URL queue while
+    the URLs are checked, eg. URLs read from stdin. It waits while the
+    queue holds max_queued URLs, so the memory use does not grow with
+    the number of input URLs.
+    """
+
+    def __init__(self, urlqueue, items, logger, max_queued=MAX_QUEUED_URLS):
+        """Store URL queue, URL data iterable and logger. The URL queue
+        must have been told about the producer with add_producer()."""
+        super().__init__(logger)
+        self.urlqueue = urlqueue
+        self.items = items
+        self.max_queued = max_queued
+        self.name = "Producer"
+        # do not wait for blocking input at exit
+        self.daemon = True
+
+    def run_checked(self):
+        """Put URL data into the queue until the iterable is exhausted,
+        the thread is stopped or the queue is shut down."""
+        try:
+            for url_data in self.items:
+                if self.stopped(0):
+                    break
+                if not self.urlqueue.wait_for_space(self.max_queued):
+                    break
+                self.urlqueue.put(url_data)
+        finally:
+            self.urlqueue.producer_done()
@@ -55,4 +55,14 @@ class Status(task.LoggedCheckedTask):
         duration = time.time() - self.start_time
         checked, in_progress, queue = self.aggregator.urlqueue.status()
         num_urls = len(self.aggregator.result_cache)
-        self.logger.log_status(checked, in_progress, queue, duration, num_urls)
+        hosts = self.aggregator.hosts.status()
+        content = self.aggregator.content_budget.status()
+        self.logger.log_status(
+            checked,
+            in_progress,
+            queue,
+            duration,
+            num_urls,
+            hosts=hosts,
+            content=content,
+        )
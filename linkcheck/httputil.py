@@ -13,6 +13,9 @@
 # You should have received a copy of the GNU General Public License along
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import datetime
+import email.utils
+
 
 def x509_to_dict(x509):
     """Parse a x509 pyopenssl object to a dictionary with keys
@@ -51,3 +54,26 @@ def get_content_type(headers):
         # split off not needed extension info
         ptype = ptype.split(';')[0]
     return ptype.strip().lower()
+
+
+def get_retry_after(headers):
+    """
+    Get the number of seconds to wait from the Retry-After header, which
+    is given either in seconds or as HTTP date.
+
+    @return: seconds to wait, or None if the header is missing or invalid
+    @rtype: float or None
+    """
+    value = headers.get('Retry-After', '').strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (date - now).total_seconds())
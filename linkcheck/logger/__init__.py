@@ -83,6 +83,12 @@ class LogStatistics:
         self.avg_number = 0
         # overall downloaded bytes
         self.downloaded_bytes = None
+        # hits, misses and evictions of the result cache
+        self.result_cache = None
+        # reused, new and expired connections of the connection pool
+        self.connections = None
+        # hits, misses and prefetched hosts of the DNS cache
+        self.dns_cache = None
 
     def log_url(self, url_data, do_print):
         """Log URL statistics."""
@@ -294,6 +294,42 @@ class TextLogger(_Logger):
             self.writeln(
                 _("Downloaded: %s.") % strformat.strsize(self.stats.downloaded_bytes)
             )
+        if self.stats.result_cache is not None:
+            self.writeln(
+                _(
+                    "Result cache: %(hits)d hits, %(misses)d misses,"
+                    " %(evictions)d evictions."
+                )
+                % self.stats.result_cache
+            )
+            self.writeln(
+                _(
+                    "Seen URLs: %(seen)d in %(memory)s, false positive"
+                    " rate %(rate).2g."
+                )
+                % dict(
+                    seen=self.stats.result_cache["seen"],
+                    memory=strformat.strsize(self.stats.result_cache["seen_memory"]),
+                    rate=self.stats.result_cache["seen_error_rate"],
+                )
+            )
+        if self.stats.connections is not None:
+            if self.stats.connections["expired"] is None:
+                msg = _("Connections: %(hits)d reused, %(misses)d new.")
+            else:
+                msg = _(
+                    "Connections: %(hits)d reused, %(misses)d new,"
+                    " %(expired)d closed after being idle."
+                )
+            self.writeln(msg % self.stats.connections)
+        if self.stats.dns_cache is not None:
+            self.writeln(
+                _(
+                    "DNS cache: %(hits)d hits, %(misses)d misses,"
+                    " %(prefetched)d hosts prefetched."
+                )
+                % self.stats.dns_cache
+            )
         if self.stats.number > 0:
             self.writeln(
                 _(
@@ -318,6 +354,9 @@ class TextLogger(_Logger):
         """Write end of output info, and flush all output buffers."""
         self.stats.downloaded_bytes = kwargs.get("downloaded_bytes")
         self.stats.num_urls = kwargs.get("num_urls")
+        self.stats.result_cache = kwargs.get("result_cache")
+        self.stats.connections = kwargs.get("connections")
+        self.stats.dns_cache = kwargs.get("dns_cache")
         if self.has_part('stats'):
             self.write_stats()
         if self.has_part('outro'):
@@ -34,15 +34,16 @@ def is_valid_ip(ip):
     return True
 
 
-def resolve_host(host):
+def resolve_host(host, getaddrinfo=socket.getaddrinfo):
     """
     Return list of ip numbers for given host.
 
     @param host: hostname or IP address
+    @param getaddrinfo: function resolving the host, eg. of a DNS cache
     """
     ips = []
     try:
-        for res in socket.getaddrinfo(host, None, 0, socket.SOCK_STREAM):
+        for res in getaddrinfo(host, None, 0, socket.SOCK_STREAM):
             # res is a tuple (address family, socket type, protocol,
             #  canonical name, socket address)
             # add first ip of socket address
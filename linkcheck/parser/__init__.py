@@ -20,9 +20,53 @@ from .. import strformat, url as urlutil
 from ..htmlutil import linkparse
 from ..bookmarks import firefox
 
+# content forms used by the parse functions, see UrlBase.get_raw_content(),
+# UrlBase.get_content() and UrlBase.get_soup(); the other parse functions
+# and the parser plugins use the raw content
+ContentForms = {
+    "html": ("soup",),
+    "wml": ("soup",),
+    "opera": ("text",),
+    "chromium": ("text",),
+    "text": ("text",),
+    "css": ("text",),
+    "firefox": (),
+    "itms_services": (),
+}
+
 
 def parse_url(url_data):
-    """Parse a URL."""
+    """Parse a URL. The found URLs are queued together after parsing.
+    The links stored for unchanged content are queued without parsing.
+    The content of the URL is released after parsing."""
+    url_data.url_batch = []
+    try:
+        if url_data.stored_links is None:
+            _parse_url(url_data)
+            url_data.store_links(url_data.url_batch)
+        else:
+            url_data.add_stored_links()
+    finally:
+        url_data.release_content()
+        batch, url_data.url_batch = url_data.url_batch, None
+        url_data.aggregate.urlqueue.put_many(batch)
+
+
+def get_content_forms(url_data):
+    """Get the content forms the parse function for the URL uses.
+
+    @return: any of "data", "text" and "soup"
+    @rtype: tuple of string
+    """
+    key = get_page_type(url_data)
+    if key is None:
+        return ()
+    return ContentForms.get(key, ("data",))
+
+
+def get_page_type(url_data):
+    """Get the key of the parse function for the URL content, or None
+    if the content type is not parseable."""
     if url_data.is_directory():
         # both ftp and file links represent directories as HTML data
         key = "html"
@@ -37,7 +81,13 @@ def parse_url(url_data):
     else:
         # determine parse routine according to content types
         mime = url_data.content_type
-        key = url_data.ContentMimetypes[mime]
+        key = url_data.ContentMimetypes.get(mime)
+    return key
+
+
+def _parse_url(url_data):
+    """Parse a URL with the parse function for its content."""
+    key = get_page_type(url_data)
     funcname = "parse_" + key
     if funcname in globals():
         globals()[funcname](url_data)
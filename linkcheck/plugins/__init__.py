@@ -53,7 +53,9 @@ class _ConnectionPlugin(_PluginBase):
 class _ContentPlugin(_PluginBase):
     """Plugins run for valid URLs with content."""
 
-    pass
+    # content forms used by check(), any of "data", "text" and "soup";
+    # see UrlBase.get_raw_content(), get_content() and get_soup()
+    content_forms = ("data", "text", "soup")
 
 
 class _ParserPlugin(_PluginBase):
@@ -109,8 +111,20 @@ class PluginManager:
         run_plugins(self.connection_plugins, url_data)
 
     def run_content_plugins(self, url_data):
-        """Run all content plugins."""
-        run_plugins(self.content_plugins, url_data)
+        """Run all content plugins. The plugins applying to the URL are
+        registered as content users first, and each content form is
+        released after the last plugin using it."""
+        plugins = [
+            plugin for plugin in self.content_plugins if plugin.applies_to(url_data)
+        ]
+        for plugin in plugins:
+            url_data.add_content_users(plugin.content_forms)
+        for plugin in plugins:
+            log.debug(LOG_PLUGIN, "Run plugin %s", plugin.__class__.__name__)
+            try:
+                plugin.check(url_data)
+            finally:
+                url_data.remove_content_users(plugin.content_forms)
 
     def run_parser_plugins(self, url_data, pagetype):
         """Run parser plugins for given pagetype."""
@@ -26,6 +26,8 @@ from ..htmlutil import linkparse
 class AnchorCheck(_ContentPlugin):
     """Checks validity of HTML anchors."""
 
+    content_forms = ("soup",)
+
     def applies_to(self, url_data):
         """Check for HTML anchor existence."""
         return url_data.is_html() and url_data.anchor
@@ -34,6 +34,8 @@ from .. import log, LOG_PLUGIN
 class MarkdownCheck(_ContentPlugin):
     """Markdown parsing plugin."""
 
+    content_forms = ("text",)
+
     _filename_re_key = "filename_re"
     _default_filename_re = re.compile(r'.*\.(markdown|md(own)?|mkdn?)$')
 
@@ -33,6 +33,8 @@ class RegexCheck(_ContentPlugin):
     Note that multiple values can be combined in the regular expression,
     for example "(This page has moved|Oracle Application error)"."""
 
+    content_forms = ("text",)
+
     def __init__(self, config):
         """Set warning regex from config."""
         super().__init__(config)
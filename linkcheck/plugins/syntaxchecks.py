@@ -48,6 +48,8 @@ class HtmlSyntaxCheck(_ContentPlugin):
     See https://validator.w3.org/docs/api.html.
     """
 
+    content_forms = ()
+
     def __init__(self, config):
         """Initialize plugin."""
         super().__init__(config)
@@ -87,6 +89,8 @@ class CssSyntaxCheck(_ContentPlugin):
     See https://jigsaw.w3.org/css-validator/manual.html#expert.
     """
 
+    content_forms = ()
+
     def __init__(self, config):
         """Initialize plugin."""
         super().__init__(config)
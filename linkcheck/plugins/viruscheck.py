@@ -27,6 +27,8 @@ class VirusCheck(_ContentPlugin):
     """Checks the page content for virus infections with clamav.
     A local clamav daemon must be installed."""
 
+    content_forms = ("data",)
+
     def __init__(self, config):
         """Initialize clamav configuration."""
         super().__init__(config)
@@ -19,6 +19,7 @@ Robots.txt parser.
 The robots.txt Exclusion Protocol is implemented as specified in
 https://www.robotstxt.org/norobots-rfc.txt
 """
+import math
 import time
 import urllib.parse
 
@@ -216,7 +217,10 @@ class RobotFileParser:
                         )
                     else:
                         try:
-                            entry.crawldelay = max(0, int(line[1]))
+                            delay = float(line[1])
+                            if not math.isfinite(delay):
+                                raise ValueError(line[1])
+                            entry.crawldelay = max(0, delay)
                             state = 2
                         except (ValueError, OverflowError):
                             log.debug(
@@ -291,11 +295,14 @@ class RobotFileParser:
         """Look for a configured crawl delay.
 
         @return: crawl delay in seconds or zero
-        @rtype: integer >= 0
+        @rtype: number >= 0
         """
         for entry in self.entries:
             if entry.applies_to(useragent):
                 return entry.crawldelay
+        # try the default entry last
+        if self.default_entry is not None:
+            return self.default_entry.crawldelay
         return 0
 
     def __str__(self):
@@ -359,7 +366,7 @@ class Entry:
         """
         lines = ["User-agent: %s" % agent for agent in self.useragents]
         if self.crawldelay:
-            lines.append("Crawl-delay: %d" % self.crawldelay)
+            lines.append("Crawl-delay: %g" % self.crawldelay)
         lines.extend([str(line) for line in self.rulelines])
         return "\n".join(lines)
 
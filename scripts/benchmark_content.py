@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Measure the peak memory used while checking and parsing large pages.
+
+A number of local HTML pages with many links each are generated in a
+temporary directory and checked recursively, with the given number of
+checker threads.
+
+Usage: $0 [pages [links per page [threads]]]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import linkcheck.configuration
+import linkcheck.director
+from linkcheck.checker import get_url_from
+
+
+def write_pages(directory, num_pages, num_links):
+    """Write pages linking to each other and to some not existing
+    files."""
+    for page in range(num_pages):
+        with open(os.path.join(directory, "%d.html" % page), "w") as f:
+            f.write("<html><head><title>Page %d</title></head><body>\n" % page)
+            for link in range(num_links):
+                target = (page + link) % num_pages if link % 2 else "x%d" % link
+                f.write('<p>Paragraph %d with <a href="%s.html">link %d</a>'
+                        ' and some text.</p>\n' % (link, target, link))
+            f.write("</body></html>\n")
+
+
+def run(directory, threads):
+    """Check the pages; return peak memory in bytes and seconds."""
+    config = linkcheck.configuration.Configuration()
+    config["threads"] = threads
+    config["status"] = False
+    config["recursionlevel"] = 1
+    config["logger"] = config.logger_new("none")
+    aggregate = linkcheck.director.get_aggregate(config)
+    url = "file://%s/0.html" % directory
+    start_data = get_url_from(url, 0, aggregate, extern=(0, 0))
+    aggregate.urlqueue.put(start_data)
+    for page in range(1, len(os.listdir(directory))):
+        url = "file://%s/%d.html" % (directory, page)
+        aggregate.urlqueue.put(get_url_from(url, 0, aggregate, extern=(0, 0)))
+    tracemalloc.start()
+    start = time.time()
+    linkcheck.director.check_urls(aggregate)
+    duration = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, duration
+
+
+def main(args):
+    num_pages = int(args[0]) if args else 20
+    num_links = int(args[1]) if len(args) > 1 else 5000
+    threads = int(args[2]) if len(args) > 2 else 4
+    with tempfile.TemporaryDirectory() as directory:
+        write_pages(directory, num_pages, num_links)
+        size = os.path.getsize(os.path.join(directory, "0.html"))
+        peak, duration = run(directory, threads)
+    print("%d pages of %.1f MB, %d threads: peak %.1f MB, %.1f seconds"
+          % (num_pages, size / 2 ** 20, threads, peak / 2 ** 20, duration))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Benchmark per-host request throttling with N hosts and M threads.
+
+Each thread repeatedly waits for a request slot of one of the hosts.
+With the per-host scheduler the throughput grows linearly with the
+number of hosts; the former implementation slept while holding one
+global lock and stays at about one request per wait interval.
+
+Usage: $0 [seconds]
+"""
+import sys
+import threading
+import time
+
+from linkcheck.cache.hosts import HostScheduler
+
+# wait time between two requests to the same host
+INTERVAL = 0.02
+
+
+class GlobalLockThrottle:
+    """The former throttling of Aggregate.wait_for_host()."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.times = {}
+
+    def wait(self, host, wait_time_min, wait_time_max):
+        with self.lock:
+            t = time.time()
+            due_time = self.times.get(host, t)
+            if due_time > t:
+                time.sleep(due_time - t)
+                t = time.time()
+            self.times[host] = t + wait_time_min
+
+
+def run(throttle, num_hosts, num_threads, duration):
+    """Return number of requests per second."""
+    counts = [0] * num_threads
+    stop = time.time() + duration
+
+    def worker(num):
+        host = "host%d.example" % (num % num_hosts)
+        while time.time() < stop:
+            throttle.wait(host, INTERVAL, INTERVAL)
+            counts[num] += 1
+
+    threads = [
+        threading.Thread(target=worker, args=(i,)) for i in range(num_threads)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(counts) / duration
+
+
+def main(args):
+    duration = float(args[0]) if args else 1.0
+    print("hosts threads  global lock  per host  ideal (req/s)")
+    for num in (1, 2, 4, 8, 16, 32):
+        old = run(GlobalLockThrottle(), num, num * 2, duration)
+        new = run(HostScheduler(), num, num * 2, duration)
+        print("%5d %7d %12.0f %9.0f %6.0f" % (num, num * 2, old, new, num / INTERVAL))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Measure the memory used by queueing URLs with and without maxurlsinmemory.
+
+Usage: $0 [number of URLs [maxurlsinmemory]]
+"""
+import sys
+import time
+import tracemalloc
+
+import linkcheck.configuration
+import linkcheck.director
+from linkcheck.checker import get_url_from
+
+
+def run(num_urls, max_urls):
+    """Queue and get num_urls URLs; return peak memory in bytes and
+    seconds."""
+    config = linkcheck.configuration.Configuration()
+    config["checkextern"] = True
+    config["maxurlsinmemory"] = max_urls
+    aggregate = linkcheck.director.get_aggregate(config)
+    urlqueue = aggregate.urlqueue
+    tracemalloc.start()
+    start = time.time()
+    for i in range(num_urls):
+        url = "http://example.org/page/%d.html" % i
+        urlqueue.put(get_url_from(url, 1, aggregate, parent_url="http://example.org/"))
+    while not urlqueue.empty():
+        urlqueue.task_done(urlqueue.get())
+    duration = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, duration
+
+
+def main(args):
+    num_urls = int(args[0]) if args else 100000
+    max_urls = int(args[1]) if len(args) > 1 else 1000
+    for limit in (0, max_urls):
+        peak, duration = run(num_urls, limit)
+        print("%d URLs, maxurlsinmemory=%d: peak %.1f MB, %.1f seconds"
+              % (num_urls, limit, peak / 2 ** 20, duration))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Measure the memory used by queued URL objects of the checker classes.
+
+URLs given on the command line or read from stdin are queued as
+checker objects, unlike the links found in pages which are queued as
+LinkRecords.
+
+Usage: $0 [number of URLs]
+"""
+import sys
+import tracemalloc
+
+import linkcheck.configuration
+import linkcheck.director
+from linkcheck.checker import get_url_from
+
+URLS = (
+    "http://example.org/page/%d.html",
+    "file:///tmp/page/%d.html",
+    "mailto:user%d@example.org",
+)
+
+
+def run(num_urls, url):
+    """Queue num_urls URL objects; return bytes per queued URL."""
+    config = linkcheck.configuration.Configuration()
+    config["checkextern"] = True
+    aggregate = linkcheck.director.get_aggregate(config)
+    urlqueue = aggregate.urlqueue
+    # allocate the URL strings before measuring
+    urls = [url % i for i in range(num_urls)]
+    tracemalloc.start()
+    for base_url in urls:
+        urlqueue.put(get_url_from(base_url, 0, aggregate, extern=(0, 0)))
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / num_urls
+
+
+def main(args):
+    num_urls = int(args[0]) if args else 10000
+    for url in URLS:
+        print("%s: %d bytes per queued URL" % (url.split(":")[0], run(num_urls, url)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
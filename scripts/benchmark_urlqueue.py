@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Benchmark queueing the links of pages with put() and put_many().
+
+Several producer threads each queue the links of a number of pages,
+like checker threads parsing pages with many links, while consumer
+threads take URLs from the queue. With put() each link acquires the
+queue mutex and the result cache lock once; put_many() acquires them
+once per page.
+
+Usage: $0 [pages [links per page]]
+"""
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from linkcheck.cache.results import ResultCache
+from linkcheck.cache.urlqueue import Empty, UrlQueue
+
+UrlData = namedtuple(
+    "UrlData", "url cache_url aggregate has_result is_record", defaults=(False,)
+)
+Aggregate = namedtuple("Aggregate", "result_cache")
+
+PRODUCERS = 4
+CONSUMERS = 8
+
+
+def make_pages(num_pages, num_links, aggregate):
+    """Return list of pages with links; half of the links of each page
+    are duplicates of links of other pages."""
+    pages = []
+    for page in range(num_pages):
+        links = []
+        for link in range(num_links):
+            if link % 2:
+                url = "http://example.org/shared/%d" % link
+            else:
+                url = "http://example.org/%d/%d" % (page, link)
+            links.append(UrlData(url, url, aggregate, False))
+        pages.append(links)
+    return pages
+
+
+def run(batch, num_pages, num_links):
+    """Return seconds to queue and get all links."""
+    aggregate = Aggregate(ResultCache(10 ** 8))
+    urlqueue = UrlQueue()
+    pages = make_pages(num_pages, num_links, aggregate)
+    producers_done = threading.Event()
+
+    def produce(num):
+        for links in pages[num::PRODUCERS]:
+            if batch:
+                urlqueue.put_many(links)
+            else:
+                for url_data in links:
+                    urlqueue.put(url_data)
+
+    def consume():
+        while True:
+            try:
+                url_data = urlqueue.get(timeout=0.01)
+            except Empty:
+                if producers_done.is_set():
+                    return
+                continue
+            urlqueue.task_done(url_data)
+
+    producers = [threading.Thread(target=produce, args=(i,)) for i in range(PRODUCERS)]
+    consumers = [threading.Thread(target=consume) for i in range(CONSUMERS)]
+    start = time.time()
+    for t in consumers + producers:
+        t.start()
+    for t in producers:
+        t.join()
+    producers_done.set()
+    for t in consumers:
+        t.join()
+    return time.time() - start
+
+
+def main(args):
+    num_pages = int(args[0]) if args else 200
+    num_links = int(args[1]) if len(args) > 1 else 800
+    print("%d pages with %d links, %d producers, %d consumers"
+          % (num_pages, num_links, PRODUCERS, CONSUMERS))
+    single = run(False, num_pages, num_links)
+    print("put():      %6.2f seconds" % single)
+    batch = run(True, num_pages, num_links)
+    print("put_many(): %6.2f seconds (%.1fx)" % (batch, single / batch))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
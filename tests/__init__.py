@@ -220,6 +220,16 @@ def has_pdflib():
 need_pdflib = _need_func(has_pdflib, "pdflib")
 
 
+@lru_cache(1)
+def has_h2():
+    from linkcheck.cache import http2
+
+    return http2.has_h2
+
+
+need_h2 = _need_func(has_h2, "httpx with h2")
+
+
 @contextmanager
 def _limit_time(seconds):
     """Raises LinkCheckerInterrupt if given number of seconds have passed."""
@@ -0,0 +1,61 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test the content budget.
+"""
+import threading
+import time
+import unittest
+
+from linkcheck.cache.budget import ContentBudget
+
+
+class TestContentBudget(unittest.TestCase):
+    def test_count(self):
+        budget = ContentBudget(0)
+        budget.add(100)
+        budget.add(50)
+        budget.remove(100)
+        self.assertEqual(budget.status(), (50, 0))
+        self.assertEqual(budget.peak, 150)
+        # no limit
+        budget.wait()
+        self.assertEqual(budget.waits, 0)
+
+    def test_below_budget(self):
+        budget = ContentBudget(100)
+        budget.add(99)
+        budget.wait()
+        self.assertEqual(budget.waits, 0)
+
+    def test_wait(self):
+        """ Test, that a download waits until content is released """
+        budget = ContentBudget(100)
+        budget.add(150)
+        done = threading.Event()
+
+        def download():
+            budget.wait()
+            done.set()
+
+        thread = threading.Thread(target=download)
+        thread.start()
+        time.sleep(0.1)
+        self.assertFalse(done.is_set())
+        budget.remove(100)
+        self.assertTrue(done.wait(5))
+        thread.join()
+        self.assertEqual(budget.waits, 1)
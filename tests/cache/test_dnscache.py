@@ -0,0 +1,202 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test the DNS cache.
+"""
+
+import socket
+import threading
+import time
+import traceback
+import unittest
+from unittest.mock import Mock, patch
+
+import dns.message
+import dns.name
+import dns.resolver
+import dns.rrset
+
+from linkcheck.cache.dnscache import DnsCache, get_negative_time
+
+ADDRESSES = [
+    (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", 0)),
+    (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("2001:db8::1", 0, 0, 0)),
+]
+
+
+class CountingResolver:
+    """getaddrinfo() replacement counting its calls."""
+
+    def __init__(self, error=None, delay=0):
+        self.calls = 0
+        self.error = error
+        self.delay = delay
+
+    def __call__(self, host, port, family=0, type=0):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return ADDRESSES
+
+
+class TestDnsCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = DnsCache(300)
+
+    def getaddrinfo(self, resolver, host="Example.org", port=80):
+        with patch.object(socket, "getaddrinfo", resolver):
+            return self.cache.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+
+    def test_cached(self):
+        """ Test, that a host is resolved once for all ports """
+        resolver = CountingResolver()
+        addresses = self.getaddrinfo(resolver)
+        self.assertEqual(addresses[0][4], ("192.0.2.1", 80))
+        self.assertEqual(addresses[1][4], ("2001:db8::1", 80, 0, 0))
+        addresses = self.getaddrinfo(resolver, host="example.org", port=443)
+        self.assertEqual(addresses[0][4], ("192.0.2.1", 443))
+        self.assertEqual(resolver.calls, 1)
+        self.assertEqual(
+            self.cache.get_stats(), dict(hits=1, misses=1, prefetched=0)
+        )
+
+    def test_disabled(self):
+        self.cache = DnsCache(0)
+        resolver = CountingResolver()
+        self.getaddrinfo(resolver)
+        self.getaddrinfo(resolver)
+        self.assertEqual(resolver.calls, 2)
+
+    def test_expired(self):
+        resolver = CountingResolver()
+        self.getaddrinfo(resolver)
+        with patch.object(time, "time", return_value=time.time() + 301):
+            self.getaddrinfo(resolver)
+        self.assertEqual(resolver.calls, 2)
+
+    def test_negative(self):
+        """ Test, that names that do not exist are cached """
+        resolver = CountingResolver(socket.gaierror(socket.EAI_NONAME, "not found"))
+        for dummy in range(2):
+            with self.assertRaises(socket.gaierror):
+                self.getaddrinfo(resolver)
+        self.assertEqual(resolver.calls, 1)
+
+    def test_negative_traceback(self):
+        """ Test, that a cached error is raised without earlier tracebacks """
+        error = socket.gaierror(socket.EAI_NONAME, "not found")
+        resolver = CountingResolver(error)
+        errors = []
+        for dummy in range(3):
+            try:
+                self.getaddrinfo(resolver)
+            except socket.gaierror as exc:
+                errors.append(exc)
+        self.assertIsNot(errors[1], error)
+        self.assertIsNot(errors[1], errors[2])
+        depths = [len(traceback.extract_tb(exc.__traceback__)) for exc in errors]
+        self.assertEqual(depths[1], depths[2])
+
+    def test_temporary_error(self):
+        """ Test, that temporary failures are not cached """
+        resolver = CountingResolver(socket.gaierror(socket.EAI_AGAIN, "try again"))
+        for dummy in range(2):
+            with self.assertRaises(socket.gaierror):
+                self.getaddrinfo(resolver)
+        self.assertEqual(resolver.calls, 2)
+
+    def test_concurrent(self):
+        """ Test, that threads wait for a host resolved by another thread """
+        resolver = CountingResolver(delay=0.2)
+        threads = [
+            threading.Thread(target=self.getaddrinfo, args=(resolver,))
+            for dummy in range(3)
+        ]
+        with patch.object(socket, "getaddrinfo", resolver):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(resolver.calls, 1)
+
+    def test_query_ttl(self):
+        """ Test, that DNS answers are cached for their TTL """
+        rrset = dns.rrset.from_text("example.org.", 10, "IN", "A", "192.0.2.1")
+        answer = Mock(rrset=rrset)
+        with patch.object(dns.resolver, "resolve", return_value=answer) as resolve:
+            self.assertIs(self.cache.query("example.org", "A"), answer)
+            self.cache.query("example.org", "A")
+            self.assertEqual(resolve.call_count, 1)
+            with patch.object(time, "time", return_value=time.time() + 11):
+                self.cache.query("example.org", "A")
+            self.assertEqual(resolve.call_count, 2)
+
+    def test_negative_time_soa(self):
+        """ Test, that NXDOMAIN is cached for the TTL of the SOA record """
+        qname = dns.name.from_text("missing.example.org.")
+        response = dns.message.make_query(qname, "MX")
+        response.authority.append(
+            dns.rrset.from_text(
+                "example.org.", 120, "IN", "SOA",
+                "ns.example.org. admin.example.org. 1 7200 900 1209600 30",
+            )
+        )
+        exc = dns.resolver.NXDOMAIN(qnames=[qname], responses={qname: response})
+        self.assertEqual(get_negative_time(exc, 300), 30)
+        self.assertEqual(get_negative_time(exc, 10), 10)
+        self.assertEqual(get_negative_time(dns.resolver.NoNameservers(), 300), 0)
+
+    def test_prefetch(self):
+        """ Test, that queued hosts are resolved in the background once """
+        resolver = CountingResolver()
+        with patch.object(socket, "getaddrinfo", resolver):
+            self.cache.start_prefetch(2)
+            self.cache.prefetch("http://user@Example.org:8080/")
+            self.cache.prefetch("https://example.org/")
+            self.cache.prefetch("http://192.0.2.1:80/")
+            self.cache.prefetch("mailto:user@example.org")
+            for dummy in range(50):
+                if self.cache.get_stats()["prefetched"]:
+                    break
+                time.sleep(0.05)
+            self.cache.close()
+            addresses = self.cache.getaddrinfo(
+                "example.org", 80, type=socket.SOCK_STREAM
+            )
+        self.assertEqual(addresses[0][4], ("192.0.2.1", 80))
+        self.assertEqual(resolver.calls, 1)
+        self.assertEqual(
+            self.cache.get_stats(), dict(hits=1, misses=1, prefetched=1)
+        )
+
+    def test_prefetch_proxy(self):
+        """ Test, that the hosts of URLs requested through a proxy are
+        not resolved """
+        resolver = CountingResolver()
+        environ = {"http_proxy": "http://proxy.example:3128", "no_proxy": ""}
+        with patch.dict("os.environ", environ), patch.object(
+            socket, "getaddrinfo", resolver
+        ):
+            self.cache.start_prefetch(1)
+            self.cache.prefetch("http://example.org/")
+            for dummy in range(20):
+                if not self.cache.prefetch_queue:
+                    break
+                time.sleep(0.05)
+            self.cache.close()
+        self.assertEqual(resolver.calls, 0)
+        self.assertEqual(self.cache.get_stats()["prefetched"], 0)
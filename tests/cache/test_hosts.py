@@ -0,0 +1,168 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test per-host request scheduling.
+"""
+
+import threading
+import time
+import unittest
+
+import linkcheck.configuration
+import linkcheck.director
+from linkcheck.cache import hosts
+from linkcheck.cache.hosts import HostController, HostScheduler
+
+
+class TestHostScheduler(unittest.TestCase):
+    def setUp(self):
+        self.hosts = HostScheduler()
+
+    def test_reserve_same_host(self):
+        """ Test, that consecutive slots of one host are spaced """
+        first = self.hosts.reserve("example.org", 1.0, 1.0)
+        second = self.hosts.reserve("example.org", 1.0, 1.0)
+        self.assertAlmostEqual(second - first, 1.0)
+        self.assertEqual(len(self.hosts), 1)
+
+    def test_reserve_other_host(self):
+        """ Test, that slots of different hosts are independent """
+        now = time.time()
+        self.hosts.reserve("example.org", 10.0, 10.0)
+        due_time = self.hosts.reserve("example.com", 10.0, 10.0)
+        self.assertLess(due_time - now, 1.0)
+        self.assertEqual(len(self.hosts), 2)
+
+    def test_ready_time(self):
+        self.assertEqual(self.hosts.ready_time("example.org"), 0.0)
+        due_time = self.hosts.reserve("example.org", 2.0, 2.0)
+        self.assertAlmostEqual(self.hosts.ready_time("example.org"), due_time + 2.0)
+
+    def test_wait_does_not_block_other_hosts(self):
+        """
+        Test, that a thread waiting for a slow host does not delay
+        a thread requesting another host.
+        """
+        self.hosts.reserve("slow.example", 5.0, 5.0)
+        waiter = threading.Thread(
+            target=self.hosts.wait, args=("slow.example", 0.0, 0.0), daemon=True
+        )
+        waiter.start()
+        # give the waiting thread time to go to sleep
+        time.sleep(0.1)
+        start = time.time()
+        self.assertEqual(self.hosts.wait("fast.example", 0.0, 0.0), 0.0)
+        self.assertLess(time.time() - start, 1.0)
+        self.assertTrue(waiter.is_alive())
+
+
+class TestHostController(unittest.TestCase):
+    def setUp(self):
+        self.controller = HostController(max_connections=4)
+
+    def request(self, latency, congested=False, max_rate=20.0):
+        rate = self.controller.acquire(max_rate)
+        self.controller.release(latency, congested=congested)
+        return rate
+
+    def test_increase(self):
+        """ Test, that rate and connections grow with steady latency """
+        self.assertEqual(self.request(0.1), hosts.INITIAL_RATE)
+        for dummy in range(30):
+            self.request(0.1)
+        self.assertEqual(self.controller.rate, 20.0)
+        self.assertEqual(self.controller.connections, 4)
+        self.assertFalse(self.controller.is_throttled())
+
+    def test_congested(self):
+        """ Test, that a 429 or 503 response halves the limits """
+        self.request(0.1)
+        rate = self.controller.rate
+        self.request(0.1, congested=True)
+        self.assertEqual(self.controller.rate, rate / 2)
+        self.assertEqual(self.controller.connections, 1)
+        self.assertTrue(self.controller.is_throttled())
+        # decrease at most once per interval
+        self.request(0.1, congested=True)
+        self.assertEqual(self.controller.rate, rate / 2)
+
+    def test_rising_latency(self):
+        """ Test, that a rising average latency decreases the rate """
+        self.request(0.1)
+        for dummy in range(10):
+            self.request(2.0)
+        self.assertTrue(self.controller.is_slow())
+        self.assertLess(self.controller.rate, hosts.INITIAL_RATE)
+
+    def test_connection_limit(self):
+        """ Test, that a thread waits for a free connection """
+        self.controller.acquire(10.0)
+        self.controller.acquire(10.0)
+        waiter = threading.Thread(
+            target=self.controller.acquire, args=(10.0,), daemon=True
+        )
+        waiter.start()
+        waiter.join(0.2)
+        self.assertTrue(waiter.is_alive())
+        self.controller.release(0.1)
+        waiter.join(1.0)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(self.controller.active, 2)
+
+    def test_status(self):
+        scheduler = HostScheduler()
+        scheduler.reserve("example.org", 0.0, 0.0)
+        controller = scheduler.get_controller("example.org")
+        controller.acquire(10.0)
+        controller.release(0.1, congested=True)
+        self.assertEqual(
+            scheduler.status(), (1, 1, ("example.org", 5.0, 1))
+        )
+
+
+class TestCrawlDelay(unittest.TestCase):
+    def setUp(self):
+        config = linkcheck.configuration.Configuration()
+        config["maxrequestspersecond"] = 100
+        self.aggregate = linkcheck.director.get_aggregate(config)
+
+    def get_spacing(self, host):
+        """Return the time between two request slots of given host."""
+        self.aggregate.wait_for_host(host)
+        self.aggregate.release_host(host, latency=0.01)
+        return self.aggregate.hosts.ready_time(host) - time.time()
+
+    def test_crawldelay(self):
+        self.aggregate.robots_txt.crawl_delays["slow.example"] = 2.5
+        self.assertAlmostEqual(self.get_spacing("slow.example"), 2.5, places=1)
+
+    def test_no_crawldelay(self):
+        """ Test, that the rate of the host may grow to the configured rate """
+        self.aggregate.robots_txt.crawl_delays["fast.example"] = 0
+        controller = self.aggregate.hosts.get_controller("fast.example")
+        controller.rate = 100
+        self.assertLessEqual(self.get_spacing("fast.example"), 0.06)
+
+    def test_unknown_robots_txt(self):
+        self.assertGreaterEqual(self.get_spacing("other.example"), 0.09)
+        controller = self.aggregate.hosts.get_controller("other.example")
+        self.assertEqual(controller.max_rate, 10.0)
+
+    def test_retry_after(self):
+        self.aggregate.wait_for_host("busy.example")
+        self.aggregate.release_host("busy.example", congested=True, retry_after=30)
+        ready = self.aggregate.hosts.ready_time("busy.example")
+        self.assertGreater(ready - time.time(), 29)
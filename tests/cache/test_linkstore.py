@@ -0,0 +1,54 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test the store of links of parsed pages.
+"""
+import os
+import tempfile
+import unittest
+
+from linkcheck import LinkCheckerError
+from linkcheck.cache.linkstore import LinkStore, StoredPage
+
+
+class TestLinkStore(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        self.store = LinkStore(self.filename)
+
+    def tearDown(self):
+        self.store.close()
+        os.remove(self.filename)
+
+    def test_put_page(self):
+        """ Test, that stored pages are kept across check runs """
+        url = "http://example.org/"
+        links = [("a.html", url, None, 1, 2, 0, "A", "text/html", "utf-8")]
+        self.assertIsNone(self.store.get_page(url))
+        self.store.put_page(url, StoredPage('"x"', None, "text/html", links))
+        self.store.close()
+        self.store = LinkStore(self.filename)
+        page = self.store.get_page(url)
+        self.assertEqual(page, StoredPage('"x"', None, "text/html", links))
+        self.store.remove_page(url)
+        self.assertIsNone(self.store.get_page(url))
+
+    def test_bad_file(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"no database" * 100)
+        with self.assertRaises(LinkCheckerError):
+            LinkStore(self.filename)
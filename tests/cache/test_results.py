@@ -0,0 +1,87 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test the result cache.
+"""
+import unittest
+
+from linkcheck.cache.results import ResultCache, hash_key
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResultCache(2)
+
+    def test_evict_least_recently_used(self):
+        self.cache.add_result("a", "result a")
+        self.cache.add_result("b", "result b")
+        self.assertEqual(self.cache.get_result("a"), "result a")
+        self.cache.add_result("c", "result c")
+        self.assertIsNone(self.cache.get_result("b"))
+        self.assertEqual(self.cache.get_result("a"), "result a")
+        self.assertEqual(self.cache.get_result("c"), "result c")
+        stats = self.cache.get_stats()
+        self.assertEqual(
+            (stats["hits"], stats["misses"], stats["evictions"]), (3, 1, 1)
+        )
+        self.assertEqual(stats["seen"], 3)
+
+    def test_seen(self):
+        """ Test, that queued and evicted URLs are still known """
+        self.cache.add_result("queued", None)
+        self.assertIsNone(self.cache.get_result("queued"))
+        for key in ("a", "b", "c"):
+            self.cache.add_results({key: "result"})
+        for key in ("queued", "a", "b", "c"):
+            self.assertTrue(self.cache.has_result(key))
+        self.assertIsNone(self.cache.get_result("a"))
+        self.assertFalse(self.cache.has_result("unknown"))
+        self.assertFalse(self.cache.has_result(None))
+        self.assertEqual(len(self.cache), 4)
+
+    def test_state(self):
+        self.cache.add_result("a", "result a")
+        self.cache.add_result("b", "result b")
+        self.cache.add_result("queued", None)
+        seen, results = self.cache.get_state(["b"])
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(results, {hash_key("a"): "result a"})
+        resumed = ResultCache(2)
+        resumed.add_state(seen, results)
+        self.assertEqual(resumed.get_result("a"), "result a")
+        self.assertIsNone(resumed.get_result("b"))
+        self.assertTrue(resumed.has_result("queued"))
+        with self.assertRaises(ValueError):
+            ResultCache(2, 1000).add_state(seen, results)
+
+    def test_bloom_filter(self):
+        cache = ResultCache(2, 1000)
+        cache.add_result("a", "result a")
+        cache.add_result("queued", None)
+        self.assertTrue(cache.has_result("a"))
+        self.assertTrue(cache.has_result("queued"))
+        self.assertFalse(cache.has_result("unknown"))
+        self.assertFalse(cache.has_result(None))
+        cache.add_result(None, None)
+        self.assertEqual(len(cache), 2)
+        self.assertLess(cache.get_stats()["seen_error_rate"], 0.001)
+
+    def test_hash_key(self):
+        self.assertIsNone(hash_key(None))
+        key = "http://example.org/"
+        self.assertEqual(hash_key(key), hash_key("http://example.org/"))
+        self.assertNotEqual(hash_key(key), hash_key("http://example.net/"))
+        self.assertLess(hash_key("http://\udcff/"), 2**64)
@@ -0,0 +1,85 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test the cache of check results across check runs.
+"""
+import os
+import pickle
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from linkcheck.cache.resultstore import ResultStore
+
+
+class Result:
+    """Picklable stand-in for a wire result."""
+
+    def __init__(self, valid):
+        self.valid = valid
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        self.store = ResultStore(self.filename, 100, 10)
+
+    def tearDown(self):
+        self.store.close()
+        os.remove(self.filename)
+
+    def test_add_result(self):
+        """ Test, that results are kept across check runs """
+        self.store.add_result("http://example.org/", Result(True))
+        self.store.close()
+        self.store = ResultStore(self.filename, 100, 10)
+        self.assertTrue(self.store.get_result("http://example.org/").valid)
+        self.assertIsNone(self.store.get_result("http://example.net/"))
+
+    def test_expiry(self):
+        """ Test, that results of invalid URLs expire first """
+        self.store.add_result("valid", Result(True))
+        self.store.add_result("invalid", Result(False))
+        now = time.time()
+        with mock.patch("time.time", return_value=now + 50):
+            self.assertIsNotNone(self.store.get_result("valid"))
+            self.assertIsNone(self.store.get_result("invalid"))
+        with mock.patch("time.time", return_value=now + 200):
+            self.assertIsNone(self.store.get_result("valid"))
+
+    def test_unreadable_result(self):
+        """ Test, that results which cannot be unpickled are removed """
+        data = pickle.dumps(Result(True), pickle.HIGHEST_PROTOCOL)
+        for key, result in (
+            ("garbage", b"no pickle"),
+            ("missing class", data.replace(b"Result", b"Rezult")),
+        ):
+            self.store.update(
+                "INSERT INTO results VALUES (?, ?, ?)", (key, time.time() + 10, result)
+            )
+            self.assertIsNone(self.store.get_result(key))
+            self.assertIsNone(
+                self.store.query("SELECT key FROM results WHERE key = ?", (key,))
+            )
+
+    def test_no_expiry_time(self):
+        """ Test, that results with an expiry time of zero are not stored """
+        store = ResultStore(self.filename, 100, 0)
+        store.add_result("invalid", Result(False))
+        self.assertIsNone(store.get_result("invalid"))
+        store.close()
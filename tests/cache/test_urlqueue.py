@@ -14,14 +14,30 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
+import os
+import threading
 import unittest
+import urllib.parse
 from collections import namedtuple
 
 import linkcheck.configuration
+import linkcheck.director
+from linkcheck.cache import urlqueue
+from linkcheck.cache.hosts import HostScheduler
 from linkcheck.cache.results import ResultCache
-from linkcheck.cache.urlqueue import Empty, NUM_PUTS_CLEANUP, UrlQueue
+from linkcheck.cache.urlqueue import (
+    Empty,
+    FifoFrontier,
+    HostFrontier,
+    SpillFrontier,
+    Timeout,
+    UrlQueue,
+)
+from linkcheck.checker import get_url_from, LinkRecord
 
-UrlData = namedtuple("UrlData", "url cache_url aggregate has_result")
+UrlData = namedtuple(
+    "UrlData", "url cache_url aggregate has_result is_record", defaults=(False,)
+)
 Aggregate = namedtuple("Aggregate", "result_cache")
 
 
@@ -71,7 +87,7 @@ class TestUrlQueue(unittest.TestCase):
         the item and it can be get only once
         """
         self.urlqueue.put(self.urldata1)
-        cached_item = self.result_cache.get_result(self.urldata1)
+        cached_item = self.result_cache.get_result(self.urldata1.cache_url)
         self.assertEqual(cached_item, None)
         self.assertEqual(self.urlqueue.get(), self.urldata1)
         with self.assertRaises(Empty):
@@ -131,30 +147,447 @@ class TestUrlQueue(unittest.TestCase):
         with self.assertRaises(Empty):
             self.assertEqual(self.urlqueue.get(0), None)
 
-    def test_cleanup(self):
-        """
-        Test, that after adding NUM_PUTS_CLEANUP elements
-        the queue is cleaned up.
-        Whether the cleanup is was performed is determined,
-        that element in cache is now on top of the queue.
-        """
-        for i in range(NUM_PUTS_CLEANUP - 1):
-            self.urlqueue.put(
-                UrlData(
-                    url="Bar",
-                    cache_url="Bar address %s" % i,
-                    aggregate=Aggregate(result_cache=self.result_cache),
-                    has_result=False,
-                ),
+    def test_results_cached(self):
+        """
+        Test, that an element whose result got cached is moved
+        to the top of the queue and is returned only once
+        """
+        items = [
+            UrlData(
+                url="Bar",
+                cache_url="Bar address %s" % i,
+                aggregate=Aggregate(result_cache=self.result_cache),
+                has_result=False,
             )
-        self.assertEqual(self.urlqueue.qsize(), NUM_PUTS_CLEANUP - 1)
+            for i in range(3)
+        ]
+        for urldata in items:
+            self.urlqueue.put(urldata)
+        self.result_cache.add_result("Bar address 2", "asdf")
+        self.urlqueue.results_cached(["Bar address 2", "Unknown"])
+        self.assertEqual(self.urlqueue.qsize(), 3)
+        self.assertEqual(self.urlqueue.get(), items[2])
+        self.assertEqual(self.urlqueue.get(), items[0])
+        self.assertEqual(self.urlqueue.get(), items[1])
+        self.assertEqual(self.urlqueue.empty(), True)
+        with self.assertRaises(Empty):
+            self.urlqueue.get(0)
+
+    def test_results_cached_shutdown(self):
+        """ Test, that shutdown counts moved elements once """
+        self.urlqueue.put(self.urldata1)
         urldata = UrlData(
             url="Bar",
-            cache_url="Bar address",
+            cache_url="Bar",
             aggregate=Aggregate(result_cache=self.result_cache),
             has_result=False,
         )
-        self.result_cache.add_result("Bar address 2", "asdf")
         self.urlqueue.put(urldata)
-        self.assertEqual(self.urlqueue.qsize(), NUM_PUTS_CLEANUP)
-        self.assertEqual(self.urlqueue.get().cache_url, "Bar address 2")
+        self.urlqueue.results_cached(["Bar"])
+        self.urlqueue.do_shutdown()
+        self.assertEqual(self.urlqueue.unfinished_tasks, 0)
+
+    def test_put_many(self):
+        """
+        Test, that put_many() queues elements in order, skipping
+        cached elements and duplicates
+        """
+        self.result_cache.add_result("Cached", "asdf")
+        items = [
+            UrlData(
+                url=name,
+                cache_url=name,
+                aggregate=Aggregate(result_cache=self.result_cache),
+                has_result=False,
+            )
+            for name in ("Foo", "Cached", "Bar", "Foo")
+        ]
+        self.urlqueue.put_many(items)
+        self.assertEqual(self.urlqueue.qsize(), 2)
+        self.assertEqual(self.urlqueue.unfinished_tasks, 2)
+        self.assertTrue(self.result_cache.has_result("Bar"))
+        self.assertEqual(self.urlqueue.get(), items[0])
+        self.assertEqual(self.urlqueue.get(), items[2])
+
+    def test_put_many_empty(self):
+        """ Test, that put_many() accepts an empty list """
+        self.urlqueue.put_many([])
+        self.assertEqual(self.urlqueue.empty(), True)
+
+    def test_defer(self):
+        """
+        Test, that a deferred element is returned by get()
+        after its delay, before which the queue is not empty
+        """
+        self.urlqueue.defer(self.urldata1, 0.2)
+        self.assertEqual(self.urlqueue.empty(), False)
+        self.assertEqual(self.urlqueue.qsize(), 1)
+        with self.assertRaises(Empty):
+            self.urlqueue.get(0.05)
+        self.assertEqual(self.urlqueue.get(1), self.urldata1)
+        self.urlqueue.task_done(self.urldata1)
+        self.assertEqual(self.urlqueue.unfinished_tasks, 0)
+
+    def test_defer_order(self):
+        """ Test, that deferred elements are returned by due time """
+        urldata = UrlData(
+            url="Bar",
+            cache_url="Bar",
+            aggregate=Aggregate(result_cache=self.result_cache),
+            has_result=False,
+        )
+        self.urlqueue.defer(self.urldata1, 0.1)
+        self.urlqueue.defer(urldata, 0.0)
+        self.assertEqual(self.urlqueue.get(), urldata)
+        self.assertEqual(self.urlqueue.get(), self.urldata1)
+
+    def test_defer_shutdown(self):
+        """ Test, that shutdown drops deferred elements """
+        self.urlqueue.defer(self.urldata1, 10)
+        self.urlqueue.do_shutdown()
+        self.assertEqual(self.urlqueue.empty(), True)
+        self.assertEqual(self.urlqueue.unfinished_tasks, 0)
+
+    def test_producer(self):
+        """ Test, that join() waits for a registered producer """
+        self.urlqueue.add_producer()
+        with self.assertRaises(Timeout):
+            self.urlqueue.join(0.05)
+        self.urlqueue.producer_done()
+        self.urlqueue.join(0.05)
+
+    def test_wait_for_space(self):
+        """
+        Test, that a producer waits at the maximum size until half
+        of the elements have been removed
+        """
+        items = [
+            UrlData(
+                url=name,
+                cache_url=name,
+                aggregate=Aggregate(result_cache=self.result_cache),
+                has_result=False,
+            )
+            for name in ("Foo", "Bar", "Baz", "Qux")
+        ]
+        self.urlqueue.put_many(items)
+        self.assertTrue(self.urlqueue.wait_for_space(5))
+        waiter = threading.Thread(
+            target=self.urlqueue.wait_for_space, args=(4,), daemon=True
+        )
+        waiter.start()
+        self.urlqueue.get()
+        waiter.join(0.1)
+        self.assertTrue(waiter.is_alive())
+        self.urlqueue.get()
+        self.urlqueue.get()
+        waiter.join(1.0)
+        self.assertFalse(waiter.is_alive())
+
+    def test_producer_shutdown(self):
+        """ Test, that shutdown wakes up and drops producers """
+        self.urlqueue.add_producer()
+        self.urlqueue.put(self.urldata1)
+        self.urlqueue.do_shutdown()
+        self.assertFalse(self.urlqueue.wait_for_space(1))
+        self.urlqueue.producer_done()
+        self.assertEqual(self.urlqueue.unfinished_tasks, 0)
+
+    def test_put_syntax_error_bloom_filter(self):
+        """ Test, that URLs without cache key are queued with a Bloom filter """
+        config = linkcheck.configuration.Configuration()
+        config["bloomfiltersize"] = 1000
+        aggregate = linkcheck.director.get_aggregate(config)
+        url_data = get_url_from("http://exa mple.com:99999/", 0, aggregate)
+        self.assertIsNone(url_data.cache_url)
+        self.assertTrue(aggregate.urlqueue.claim(url_data))
+        aggregate.urlqueue.put(url_data)
+        self.assertEqual(aggregate.urlqueue.qsize(), 1)
+
+
+HostUrlData = namedtuple(
+    "HostUrlData",
+    "url cache_url aggregate has_result urlparts is_record",
+    defaults=(False,),
+)
+
+
+class TestHostFrontier(unittest.TestCase):
+    def setUp(self):
+        self.result_cache = ResultCache(10)
+        self.hosts = HostScheduler()
+        self.urlqueue = UrlQueue(frontier=HostFrontier(self.hosts, 1.0))
+
+    def put(self, url, has_result=False):
+        host = urllib.parse.urlsplit(url).netloc
+        urldata = HostUrlData(
+            url=url,
+            cache_url=url,
+            aggregate=Aggregate(result_cache=self.result_cache),
+            has_result=has_result,
+            urlparts=["http", host, "/", "", ""],
+        )
+        self.urlqueue.put(urldata)
+        return urldata
+
+    def test_fifo_per_host(self):
+        """ Test, that URLs of one host are returned in queue order """
+        first = self.put("http://example.org/1")
+        second = self.put("http://example.org/2")
+        self.assertEqual(self.urlqueue.get(0), first)
+        self.assertEqual(self.urlqueue.get(0), second)
+        with self.assertRaises(Empty):
+            self.urlqueue.get(0)
+
+    def test_ready_host_first(self):
+        """
+        Test, that a URL of a ready host is returned before URLs
+        of a throttled host that were queued earlier
+        """
+        self.hosts.reserve("slow.example", 60.0, 60.0)
+        self.hosts.reserve("slow.example", 60.0, 60.0)
+        slow = self.put("http://slow.example/1")
+        fast = self.put("http://fast.example/1")
+        self.assertEqual(self.urlqueue.get(0), fast)
+        self.assertEqual(self.urlqueue.get(0), slow)
+
+    def test_hosts_interleaved(self):
+        """ Test, that the next URL of a host waits for its next slot """
+        a1 = self.put("http://a.example/1")
+        a2 = self.put("http://a.example/2")
+        b1 = self.put("http://b.example/1")
+        self.assertEqual(self.urlqueue.get(0), a1)
+        # the checker thread reserves the slot for a1
+        self.hosts.reserve("a.example", 1.0, 1.0)
+        self.assertEqual(self.urlqueue.get(0), b1)
+        self.assertEqual(self.urlqueue.get(0), a2)
+
+    def test_has_result_first(self):
+        self.put("http://example.org/1")
+        urldata = self.put("http://example.org/2", has_result=True)
+        self.assertEqual(self.urlqueue.qsize(), 2)
+        self.assertEqual(self.urlqueue.get(0), urldata)
+
+    def test_results_cached(self):
+        """ Test, that a cached URL is returned before a ready host """
+        first = self.put("http://example.org/1")
+        cached = self.put("http://example.org/2")
+        self.urlqueue.results_cached([cached.cache_url])
+        self.assertEqual(self.urlqueue.get(0), cached)
+        self.assertEqual(self.urlqueue.get(0), first)
+        self.assertTrue(self.urlqueue.empty())
+
+    def test_shutdown(self):
+        self.put("http://example.org/1")
+        self.put("http://example.com/1")
+        self.urlqueue.do_shutdown()
+        self.assertTrue(self.urlqueue.empty())
+
+
+class TestSpillFrontier(unittest.TestCase):
+    def setUp(self):
+        config = linkcheck.configuration.Configuration()
+        config["checkextern"] = True
+        self.aggregate = linkcheck.director.get_aggregate(config)
+        self.frontier = SpillFrontier(FifoFrontier(), 4)
+        self.urlqueue = UrlQueue(frontier=self.frontier)
+
+    def put(self, num):
+        urls = []
+        for i in range(num):
+            url = "http://example.org/%d" % i
+            url_data = get_url_from(
+                url, 1, self.aggregate, parent_url="http://example.org/", line=i
+            )
+            self.urlqueue.put(url_data)
+            urls.append(url)
+        return urls
+
+    def test_spill(self):
+        """
+        Test, that URLs exceeding the limit are spilled and
+        returned in queue order
+        """
+        urls = self.put(10)
+        self.assertEqual(len(self.frontier.head), 4)
+        self.assertEqual(self.frontier.spilled, 6)
+        self.assertEqual(self.urlqueue.qsize(), 10)
+        for i, url in enumerate(urls):
+            url_data = self.urlqueue.get(0)
+            self.assertEqual(url_data.url, url)
+            self.assertEqual(url_data.line, i)
+            self.assertIs(url_data.aggregate, self.aggregate)
+            self.assertLessEqual(len(self.frontier.head), 4)
+        self.assertTrue(self.urlqueue.empty())
+        self.assertIsNone(self.frontier.filename)
+
+    def test_spill_to_disk(self):
+        """ Test, that records are written in batches and removed """
+        self.put(urlqueue.SPILL_BATCH_SIZE + 10)
+        filename = self.frontier.filename
+        self.assertTrue(os.path.exists(filename))
+        self.assertEqual(len(self.frontier.pending), 6)
+        self.urlqueue.do_shutdown()
+        self.assertFalse(os.path.exists(filename))
+        self.assertTrue(self.urlqueue.empty())
+
+    def test_get_urls(self):
+        """ Test, that spilled URLs are returned as records of a copy """
+        urls = self.put(10)
+        active, inmemory, spilled, records, state = self.urlqueue.get_urls()
+        self.assertEqual(active, [])
+        self.assertIsNone(state)
+        self.assertEqual([url_data.url for url_data in inmemory], urls[:4])
+        self.assertEqual(spilled, 6)
+        self.assertEqual([record[0] for klass, record in records], urls[4:])
+        self.assertEqual(self.frontier.spilled, 6)
+        self.assertEqual([self.urlqueue.get(0).url for url in urls], urls)
+
+    def test_host_frontier(self):
+        """ Test, that URLs are spilled from a configured host frontier """
+        config = linkcheck.configuration.Configuration()
+        config["hostfrontier"] = True
+        config["maxurlsinmemory"] = 4
+        aggregate = linkcheck.director.get_aggregate(config)
+        frontier = aggregate.urlqueue.queue
+        self.assertIsInstance(frontier, SpillFrontier)
+        self.assertIsInstance(frontier.head, HostFrontier)
+
+    def test_record(self):
+        """ Test, that URL data can be constructed from its record """
+        url_data = get_url_from(
+            " http://example.org/a ", 1, self.aggregate, name="a", line=2
+        )
+        url_data.attempts = 1
+        copy = url_data.__class__.from_record(url_data.to_record(), self.aggregate)
+        self.assertEqual(copy.to_record(), url_data.to_record())
+        self.assertEqual(copy.cache_url, url_data.cache_url)
+        self.assertEqual(copy.warnings, url_data.warnings)
+
+
+class TestLinkRecord(unittest.TestCase):
+    def setUp(self):
+        config = linkcheck.configuration.Configuration()
+        config["checkextern"] = True
+        self.aggregate = linkcheck.director.get_aggregate(config)
+        self.urlqueue = self.aggregate.urlqueue
+
+    def record(self, url, base_ref=None, parent="http://example.org/dir/"):
+        return LinkRecord(
+            url, 1, self.aggregate, parent, base_ref,
+            1, 1, 0, "", "text/html", None,
+        )
+
+    def test_get_host(self):
+        self.assertEqual(self.record("a.html").get_host(), "example.org")
+        self.assertEqual(self.record("//other.example/").get_host(), "example.org")
+        self.assertEqual(
+            self.record("HTTP://Other.example/").get_host(), "other.example"
+        )
+        record = self.record("a.html", base_ref="http://base.example/")
+        self.assertEqual(record.get_host(), "base.example")
+        for url in ("http://u@Other.example:80/", "https://u@other.example:443/"):
+            url_data = self.record(url).build()
+            self.assertEqual(self.record(url).get_host(), url_data.urlparts[1])
+        self.assertEqual(
+            self.record("http://other.example:8080/").get_host(), "other.example:8080"
+        )
+
+    def test_claim(self):
+        """
+        Test, that URL data of a record is built at get() and
+        claimed only once
+        """
+        self.urlqueue.put(self.record("a.html"))
+        self.urlqueue.put(self.record("/dir/a.html"))
+        self.assertEqual(self.urlqueue.qsize(), 2)
+        first = self.urlqueue.get(0).build()
+        self.assertEqual(first.url, "http://example.org/dir/a.html")
+        self.assertTrue(self.urlqueue.claim(first))
+        second = self.urlqueue.get(0).build()
+        self.assertFalse(self.urlqueue.claim(second))
+
+    def test_put_duplicate(self):
+        """ Test, that a link is queued only once until it is claimed """
+        self.urlqueue.put(self.record("a.html"))
+        self.urlqueue.put_many([self.record("a.html"), self.record("b.html")])
+        self.assertEqual(self.urlqueue.qsize(), 2)
+        self.assertEqual(self.urlqueue.unfinished_tasks, 2)
+        record = self.urlqueue.get(0)
+        self.assertTrue(self.urlqueue.claim(record.build(), record))
+        self.urlqueue.put(self.record("a.html", parent="http://example.org/dir/b"))
+        self.assertEqual(self.urlqueue.qsize(), 1)
+
+    def test_put_duplicate_syntax_error(self):
+        """ Test, that links without cache key are queued again """
+        self.urlqueue.put(self.record("http://[/"))
+        record = self.urlqueue.get(0)
+        self.assertTrue(self.urlqueue.claim(record.build(), record))
+        self.urlqueue.put(self.record("http://[/"))
+        self.assertEqual(self.urlqueue.qsize(), 1)
+
+    def test_prefetch(self):
+        """
+        Test, that the URLs of link records are prefetched when they are
+        claimed and will be checked
+        """
+        prefetched = []
+        urlqueue = UrlQueue(prefetch=prefetched.append)
+        self.aggregate.config["checkextern"] = False
+        self.aggregate.config["internlinks"].append(
+            linkcheck.get_link_pat("^http://example.org/")
+        )
+        urlqueue.put_many([self.record("a.html"), self.record("http://other.example/")])
+        self.assertEqual(prefetched, [])
+        for dummy in range(2):
+            record = urlqueue.get(0)
+            self.assertTrue(urlqueue.claim(record.build(), record))
+        self.assertEqual(prefetched, ["http://example.org/dir/a.html"])
+
+    def test_claim_max_allowed_urls(self):
+        urlqueue = UrlQueue(max_allowed_urls=1)
+        self.assertTrue(urlqueue.claim(self.record("a.html").build()))
+        self.assertFalse(urlqueue.claim(self.record("b.html").build()))
+
+    def test_spill(self):
+        """ Test, that records are spilled and read back """
+        frontier = SpillFrontier(FifoFrontier(), 1)
+        urlqueue = UrlQueue(frontier=frontier)
+        records = [self.record("%d.html" % i) for i in range(3)]
+        urlqueue.put_many(records)
+        self.assertEqual(frontier.spilled, 2)
+        for record in records:
+            self.assertEqual(urlqueue.get(0), record)
+
+    def test_get_key(self):
+        """ Test, that links resolved to the same URL share a key """
+        other = "http://example.org/dir/page.html?x=1#top"
+        for url in ("http://example.com/", "//example.com/", "/a.html", "a.html"):
+            self.assertEqual(
+                self.record(url).get_key(), self.record(url, parent=other).get_key()
+            )
+        for url in ("", "?q", "#f", "../a.html", "./", "a%2E/.."):
+            self.assertNotEqual(
+                self.record(url).get_key(), self.record(url, parent=other).get_key()
+            )
+        self.assertNotEqual(
+            self.record("a.html").get_key(),
+            self.record("a.html", parent="http://example.org/").get_key(),
+        )
+        self.assertNotEqual(
+            self.record("/a.html").get_key(),
+            self.record("/a.html", base_ref="http://base.example/").get_key(),
+        )
+
+    def test_put_known_link(self):
+        """
+        Test, that a link with a claimed URL is skipped when it is put
+        again from another page
+        """
+        record = self.record("a.html")
+        self.urlqueue.put(record)
+        url_data = self.urlqueue.get(0).build()
+        self.assertTrue(self.urlqueue.claim(url_data, record))
+        self.urlqueue.put(self.record("a.html", parent="http://example.org/dir/b"))
+        self.urlqueue.put(self.record("c.html", parent="http://example.org/dir/b"))
+        self.assertEqual(self.urlqueue.qsize(), 1)
@@ -0,0 +1,156 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Define an HTTP/2 test server for LinkChecker tests.
+"""
+import mimetypes
+import os
+import shutil
+import socket
+import ssl
+import tempfile
+import threading
+
+import pytest
+
+from . import LinkCheckTest
+from .httpserver import write_certificate
+
+
+class Http2ServerTest(LinkCheckTest):
+    """Start/stop an HTTP/2 server that can be used for testing."""
+
+    def setUp(self):
+        """Start a new HTTP/2 server in a new thread."""
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.certfile = os.path.join(self.tmpdir, "cert.pem")
+        keyfile = os.path.join(self.tmpdir, "key.pem")
+        write_certificate(self.certfile, keyfile)
+        self.server = Http2Server(self.certfile, keyfile)
+        self.port = self.server.port
+
+    def tearDown(self):
+        """Stop the server."""
+        self.server.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def get_url(self, filename):
+        """Get HTTPS URL for filename."""
+        return "https://localhost:%d/tests/checker/data/%s" % (self.port, filename)
+
+
+class Http2Server:
+    """
+    HTTP/2 server answering GET and HEAD requests of files, and
+    redirecting paths starting with /redirect/ to the rest of the path.
+    Each connection is handled in its own thread.
+    """
+
+    def __init__(self, certfile, keyfile):
+        """Listen on a free port of localhost and start accepting
+        connections."""
+        try:
+            import h2.config  # noqa: F401
+        except ImportError:
+            pytest.skip("h2 is not available")
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(certfile, keyfile=keyfile)
+        self.context.set_alpn_protocols(["h2"])
+        self.sock = socket.create_server(("localhost", 0))
+        self.port = self.sock.getsockname()[1]
+        # number of accepted connections and received (method, path)
+        self.connections = 0
+        self.requests = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def serve_forever(self):
+        """Accept connections until the server is stopped."""
+        while True:
+            try:
+                sock, dummy = self.sock.accept()
+            except OSError:
+                break
+            self.connections += 1
+            threading.Thread(target=self.handle, args=(sock,), daemon=True).start()
+
+    def handle(self, sock):
+        """Answer the requests sent over one connection."""
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        try:
+            sock = self.context.wrap_socket(sock, server_side=True)
+        except (OSError, ssl.SSLError):
+            sock.close()
+            return
+        config = h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        conn = h2.connection.H2Connection(config=config)
+        conn.initiate_connection()
+        with sock:
+            try:
+                sock.sendall(conn.data_to_send())
+                while True:
+                    data = sock.recv(65535)
+                    if not data:
+                        break
+                    for event in conn.receive_data(data):
+                        if isinstance(event, h2.events.RequestReceived):
+                            self.respond(conn, event.stream_id, dict(event.headers))
+                    sock.sendall(conn.data_to_send())
+            except OSError:
+                pass
+
+    def respond(self, conn, stream_id, headers):
+        """Send the response of one request."""
+        method, path = headers[":method"], headers[":path"]
+        self.requests.append((method, path))
+        if path.startswith("/redirect/"):
+            conn.send_headers(
+                stream_id,
+                [(":status", "302"), ("location", path[len("/redirect"):])],
+                end_stream=True,
+            )
+            return
+        filename = os.path.join(os.getcwd(), path.lstrip("/"))
+        if not os.path.isfile(filename):
+            conn.send_headers(stream_id, [(":status", "404")], end_stream=True)
+            return
+        with open(filename, "rb") as f:
+            content = f.read()
+        response_headers = [
+            (":status", "200"),
+            ("content-type", mimetypes.guess_type(filename)[0] or "text/plain"),
+            ("content-length", str(len(content))),
+        ]
+        if method == "HEAD":
+            conn.send_headers(stream_id, response_headers, end_stream=True)
+        else:
+            conn.send_headers(stream_id, response_headers)
+            # the test files fit into the initial flow control window
+            size = conn.max_outbound_frame_size
+            for start in range(0, len(content), size):
+                conn.send_data(stream_id, content[start:start + size])
+            conn.end_stream(stream_id)
+
+    def stop(self):
+        """Stop accepting connections."""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
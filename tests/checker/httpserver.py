@@ -17,6 +17,7 @@
 Define http test support classes for LinkChecker tests.
 """
 
+import datetime
 import html
 from http.server import SimpleHTTPRequestHandler, HTTPServer
 from http.client import HTTPConnection, HTTPSConnection
@@ -25,6 +26,12 @@ import time
 import threading
 import urllib.parse
 from io import BytesIO
+
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
 from . import LinkCheckTest
 from .. import get_file
 
@@ -193,6 +200,47 @@ class HttpsServerTest(HttpServerTest):
         return "https://localhost:%d/tests/checker/data/%s" % (self.port, filename)
 
 
+def write_certificate(certfile=None, keyfile=None):
+    """Write a self-signed certificate for localhost and its key, by
+    default to the files used by the HTTPS test server."""
+    key = rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=2048,
+    )
+
+    with open(keyfile or get_file("https_key.pem"), "wb") as f:
+        f.write(key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.TraditionalOpenSSL,
+            encryption_algorithm=serialization.NoEncryption(),
+        ))
+
+    subject = issuer = x509.Name([
+        x509.NameAttribute(NameOID.ORGANIZATION_NAME, "LinkChecker"),
+        x509.NameAttribute(NameOID.COMMON_NAME, "linkchecker.github.io"),
+    ])
+
+    cert = x509.CertificateBuilder().subject_name(
+        subject
+    ).issuer_name(
+        issuer
+    ).public_key(
+        key.public_key()
+    ).serial_number(
+        x509.random_serial_number()
+    ).not_valid_before(
+        datetime.datetime.now(datetime.timezone.utc)
+    ).not_valid_after(
+        datetime.datetime(2119, 1, 2, 3, 4, 5)
+    ).add_extension(
+        x509.SubjectAlternativeName([x509.DNSName("localhost")]),
+        critical=False,
+    ).sign(key, hashes.SHA256())
+
+    with open(certfile or get_file("https_cert.pem"), "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+
+
 def start_server(handler, https=False):
     """Start an HTTP server thread and return its port number."""
     server_address = ("localhost", 0)
@@ -0,0 +1,145 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test checkpoint files.
+"""
+import os
+import tempfile
+from unittest.mock import patch
+
+import linkcheck.director
+from linkcheck import LinkCheckerError
+from linkcheck.checker import get_url_from, LinkRecord
+from linkcheck.checker.httpurl import HttpUrl
+from linkcheck.director import checker
+from linkcheck.director.checkpoint import read_checkpoint, write_checkpoint
+from . import LinkCheckTest, get_test_aggregate
+
+
+class TestCheckpoint(LinkCheckTest):
+    """
+    Test writing a checkpoint and resuming from it.
+    """
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".checkpoint")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_resume(self):
+        """
+        Test, that a resumed check checks the remaining URLs and
+        continues the statistics
+        """
+        expected = self.get_resultlines("file.html")
+        url = self.get_url("file.html")
+        aggregate = get_test_aggregate({}, {"expected": expected})
+        aggregate.urlqueue.put(get_url_from(url, 0, aggregate, extern=(0, 0)))
+        aggregate.logger.start_log_output()
+        # check the first URL only
+        url_data = aggregate.urlqueue.get()
+        checker.check_url(url_data, aggregate.logger)
+        aggregate.urlqueue.task_done(url_data)
+        self.assertTrue(write_checkpoint(aggregate, self.filename))
+        first = aggregate.config["logger"].result
+        self.assertEqual(len([x for x in first if x.startswith("url ")]), 1)
+
+        resumed = get_test_aggregate({}, {"expected": expected})
+        read_checkpoint(resumed, self.filename)
+        self.assertIsNotNone(resumed.result_cache.get_result(url_data.cache_url))
+        self.assertEqual(resumed.urlqueue.qsize(), 2)
+        linkcheck.director.check_urls(resumed)
+        logger = resumed.config["logger"]
+        urls = sorted(x for x in first + logger.result if x.startswith("url "))
+        self.assertEqual(urls, sorted(x for x in expected if x.startswith("url ")))
+        self.assertEqual(logger.stats.number, 2)
+
+    def test_active_url(self):
+        """ Test, that a URL being checked is stored as queued URL """
+        aggregate = get_test_aggregate({}, {"expected": []})
+        url_data = get_url_from(self.get_url("file.txt"), 0, aggregate)
+        aggregate.urlqueue.put(url_data)
+        self.assertIs(aggregate.urlqueue.get(), url_data)
+        aggregate.result_cache.add_result(url_data.cache_url, url_data.to_wire())
+        write_checkpoint(aggregate, self.filename)
+        resumed = get_test_aggregate({}, {"expected": []})
+        read_checkpoint(resumed, self.filename)
+        self.assertEqual(resumed.urlqueue.get().url, url_data.url)
+        self.assertIsNone(resumed.result_cache.get_result(url_data.cache_url))
+
+    def test_active_record(self):
+        """
+        Test, that a claimed link record being checked is stored as its
+        URL data without the results of the partial check
+        """
+        aggregate = get_test_aggregate({}, {"expected": []})
+        parent = self.get_url("file.html")
+        record = LinkRecord(
+            "file.txt", 1, aggregate, parent, None, 1, 1, 0, "", "text/html", None
+        )
+        aggregate.urlqueue.put(record)
+        self.assertIs(aggregate.urlqueue.get(), record)
+        url_data = record.build()
+        self.assertTrue(aggregate.urlqueue.claim(url_data, record))
+        url_data.add_warning("partial check")
+        write_checkpoint(aggregate, self.filename)
+        resumed = get_test_aggregate({}, {"expected": []})
+        read_checkpoint(resumed, self.filename)
+        self.assertEqual(resumed.urlqueue.qsize(), 1)
+        linkcheck.director.check_urls(resumed)
+        logger = resumed.config["logger"]
+        self.assertEqual(logger.stats.number, 1)
+        self.assertIn("url %s" % url_data.base_url, logger.result)
+        self.assertNotIn("warning partial check", logger.result)
+
+    def test_spilled(self):
+        """
+        Test, that spilled URLs are stored without constructing their
+        URL data and are spilled again when resuming
+        """
+        confargs = {"maxurlsinmemory": 2}
+        aggregate = get_test_aggregate(confargs, {"expected": []})
+        urls = ["http://example.org/%d" % i for i in range(5)]
+        for url in urls:
+            aggregate.urlqueue.put(get_url_from(url, 0, aggregate))
+        frontier = aggregate.urlqueue.queue
+        self.assertEqual(frontier.spilled, 3)
+        with patch.object(HttpUrl, "from_record") as from_record:
+            write_checkpoint(aggregate, self.filename)
+        from_record.assert_not_called()
+        self.assertEqual(frontier.spilled, 3)
+        resumed = get_test_aggregate(confargs, {"expected": []})
+        read_checkpoint(resumed, self.filename)
+        self.assertEqual(resumed.urlqueue.queue.spilled, 3)
+        self.assertEqual(
+            [resumed.urlqueue.get(0).url for url in urls],
+            [aggregate.urlqueue.get(0).url for url in urls],
+        )
+
+    def test_shutdown(self):
+        """ Test, that no checkpoint is written after the queue is shut down """
+        aggregate = get_test_aggregate({}, {"expected": []})
+        aggregate.urlqueue.do_shutdown()
+        self.assertFalse(write_checkpoint(aggregate, self.filename))
+
+    def test_bad_file(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"no checkpoint")
+        aggregate = get_test_aggregate({}, {"expected": []})
+        with self.assertRaises(LinkCheckerError):
+            read_checkpoint(aggregate, self.filename)
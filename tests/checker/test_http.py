@@ -67,4 +67,5 @@ class TestHttp(HttpServerTest):
         else:
             result = "valid"
         resultlines.append(result)
-        self.direct(url, resultlines, recursionlevel=0)
+        confargs = dict(maxretries=0)
+        self.direct(url, resultlines, recursionlevel=0, confargs=confargs)
@@ -0,0 +1,98 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test the HTTP/2 transport.
+"""
+import threading
+
+import requests
+
+from .. import get_file, need_h2
+from .http2server import Http2ServerTest
+
+
+class TestHttp2(Http2ServerTest):
+    """Test https: link checking over HTTP/2."""
+
+    def get_confargs(self):
+        return dict(http2=True, sslverify=self.certfile)
+
+    @need_h2
+    def test_file(self):
+        url = self.get_url("file.txt")
+        resultlines = [
+            "url %s" % url,
+            "cache key %s" % url,
+            "real url %s" % url,
+            "valid",
+        ]
+        self.direct(url, resultlines, confargs=self.get_confargs())
+        # the server only speaks HTTP/2
+        self.assertIn(("HEAD", "/tests/checker/data/file.txt"), self.server.requests)
+
+    @need_h2
+    def test_redirect(self):
+        url = "https://localhost:%d/redirect/tests/checker/data/file.txt" % self.port
+        rurl = self.get_url("file.txt")
+        resultlines = [
+            "url %s" % url,
+            "cache key %s" % url,
+            "real url %s" % rurl,
+            "warning Redirected to `%s' status: 302 Found." % rurl,
+            "valid",
+        ]
+        self.direct(url, resultlines, confargs=self.get_confargs())
+
+    @need_h2
+    def test_ssl_cert(self):
+        from linkcheck.cache.http2 import Http2Adapter
+
+        adapter = Http2Adapter(100, 10, 30)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        try:
+            response = session.get(self.get_url("file.txt"), verify=self.certfile)
+            with open(get_file("file.txt"), "rb") as f:
+                self.assertEqual(response.content, f.read())
+            cert = response.raw.get_ssl_object().getpeercert()
+            self.assertIn(("DNS", "localhost"), cert["subjectAltName"])
+        finally:
+            adapter.close()
+
+    @need_h2
+    def test_multiplexing(self):
+        from linkcheck.cache.http2 import Http2Adapter
+
+        adapter = Http2Adapter(100, 10, 30)
+        statuses = []
+
+        def get():
+            session = requests.Session()
+            session.mount("https://", adapter)
+            response = session.get(self.get_url("file.html"), verify=self.certfile)
+            statuses.append(response.status_code)
+
+        threads = [threading.Thread(target=get) for dummy in range(5)]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            adapter.close()
+        self.assertEqual(statuses, [200] * 5)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(adapter.get_stats(), dict(hits=4, misses=1, expired=None))
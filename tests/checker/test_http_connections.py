@@ -0,0 +1,78 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test the connection pool shared by the request sessions.
+"""
+import time
+
+import requests
+
+from linkcheck.cache.connections import SharedAdapter
+from .httpserver import HttpServerTest, NoQueryHttpRequestHandler
+
+
+class KeepAliveHttpRequestHandler(NoQueryHttpRequestHandler):
+    """Handler keeping connections alive."""
+
+
+class TestHttpConnections(HttpServerTest):
+    """Test borrowing kept-alive connections from the shared pool."""
+
+    def __init__(self, methodName="runTest"):
+        super().__init__(methodName=methodName)
+        self.handler = KeepAliveHttpRequestHandler
+
+    def setUp(self):
+        super().setUp()
+        # the server start sets HTTP/1.0, which closes every connection
+        self.handler.protocol_version = "HTTP/1.1"
+        self.adapter = SharedAdapter(100, 10, 30)
+
+    def tearDown(self):
+        # the test server handles one connection at a time
+        self.adapter.close()
+        super().tearDown()
+
+    def get_session(self):
+        session = requests.Session()
+        session.mount("http://", self.adapter)
+        return session
+
+    def get(self, session):
+        response = session.get(self.get_url("file.txt"))
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+    def test_pool_size(self):
+        self.assertEqual(self.adapter.poolmanager.pools._maxsize, 10)
+        self.assertEqual(self.adapter.poolmanager.connection_pool_kw["maxsize"], 10)
+
+    def test_shared(self):
+        self.get(self.get_session())
+        self.get(self.get_session())
+        self.assertEqual(
+            self.adapter.get_stats(), dict(hits=1, misses=1, expired=0)
+        )
+
+    def test_idle(self):
+        self.adapter.idle_time = 0
+        session = self.get_session()
+        self.get(session)
+        time.sleep(0.01)
+        self.get(session)
+        self.assertEqual(
+            self.adapter.get_stats(), dict(hits=0, misses=2, expired=1)
+        )
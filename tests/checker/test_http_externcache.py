@@ -0,0 +1,82 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test caching results of extern http URLs across check runs.
+"""
+import os
+import tempfile
+
+import linkcheck.director
+from linkcheck.checker import get_url_from
+from . import get_test_aggregate
+from .httpserver import HttpServerTest, NoQueryHttpRequestHandler
+
+
+class CountingHttpRequestHandler(NoQueryHttpRequestHandler):
+    """Handler counting the GET and HEAD requests of each path."""
+
+    requests = {}
+
+    def do_GET(self):
+        self.requests[self.path] = self.requests.get(self.path, 0) + 1
+        super().do_GET()
+
+    def do_HEAD(self):
+        self.requests[self.path] = self.requests.get(self.path, 0) + 1
+        super().do_HEAD()
+
+
+class TestHttpExternCache(HttpServerTest):
+    """Test results of http:// links stored in an extern cache."""
+
+    def __init__(self, methodName="runTest"):
+        super().__init__(methodName=methodName)
+        self.handler = CountingHttpRequestHandler
+
+    def setUp(self):
+        super().setUp()
+        self.handler.requests.clear()
+        fd, self.filename = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.filename)
+
+    def check_twice(self, filename, extern):
+        """Check an URL in two check runs and return the number of
+        requests of the URL."""
+        url = self.get_url(filename)
+        resultlines = [
+            "url %s" % url,
+            "cache key %s" % url,
+            "real url %s" % url,
+            "valid",
+        ]
+        for dummy in range(2):
+            confargs = dict(externcache=self.filename, recursionlevel=0)
+            aggregate = get_test_aggregate(confargs, {"expected": resultlines})
+            url_data = get_url_from(url, 0, aggregate, extern=extern)
+            aggregate.urlqueue.put(url_data)
+            linkcheck.director.check_urls(aggregate)
+            self.assertEqual(aggregate.config["logger"].diff, [])
+        return self.handler.requests["/tests/checker/data/%s" % filename]
+
+    def test_extern(self):
+        self.assertEqual(self.check_twice("file.txt", (1, 0)), 1)
+
+    def test_intern(self):
+        self.assertEqual(self.check_twice("file.txt", (0, 0)), 2)
@@ -0,0 +1,122 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test HEAD requests for http:// links whose content is not needed.
+"""
+import linkcheck.director
+from linkcheck.checker import get_url_from
+from . import get_test_aggregate
+from .httpserver import HttpServerTest, NoQueryHttpRequestHandler
+
+
+class HeadHttpRequestHandler(NoQueryHttpRequestHandler):
+    """Handler recording the request methods of each path. HEAD
+    requests are answered with head_status, if it is set."""
+
+    requests = []
+    head_status = None
+
+    def do_GET(self):
+        self.requests.append(("GET", self.path))
+        super().do_GET()
+
+    def do_HEAD(self):
+        self.requests.append(("HEAD", self.path))
+        if self.head_status is None:
+            super().do_HEAD()
+        else:
+            self.send_response(self.head_status)
+            self.end_headers()
+
+
+class TestHttpHead(HttpServerTest):
+    """Test the request methods of http:// links."""
+
+    def __init__(self, methodName="runTest"):
+        super().__init__(methodName=methodName)
+        self.handler = HeadHttpRequestHandler
+
+    def setUp(self):
+        super().setUp()
+        del self.handler.requests[:]
+        self.handler.head_status = None
+
+    def tearDown(self):
+        super().tearDown()
+        self.handler.extensions_map = NoQueryHttpRequestHandler.extensions_map
+
+    def check(self, filenames, extern=(1, 0), confargs=None, valid=True):
+        """Check URLs and return the aggregate and the sent requests."""
+        confargs = dict(confargs or {}, recursionlevel=1)
+        aggregate = get_test_aggregate(confargs, {"expected": []})
+        for filename in filenames:
+            url = self.get_url(filename)
+            aggregate.urlqueue.put(get_url_from(url, 0, aggregate, extern=extern))
+        linkcheck.director.check_urls(aggregate)
+        errors = [
+            line
+            for line in aggregate.config["logger"].result
+            if line.startswith("error")
+        ]
+        if valid:
+            self.assertEqual(errors, [])
+        else:
+            self.assertEqual(len(errors), len(filenames))
+        path = "/tests/checker/data/"
+        requests = [
+            (method, p.replace(path, ""))
+            for method, p in self.handler.requests
+            if p != "/robots.txt"
+        ]
+        return aggregate, requests
+
+    def test_extern(self):
+        requests = self.check(["file.html"])[1]
+        self.assertEqual(requests, [("HEAD", "file.html")])
+
+    def test_intern(self):
+        requests = self.check(["file.txt", "file.html"], extern=(0, 0))[1]
+        self.assertEqual(requests, [("HEAD", "file.txt"), ("GET", "file.html")])
+
+    def test_parseable_content(self):
+        """ Test, that content which turns out to be parseable is
+        downloaded with GET """
+        self.handler.extensions_map = dict(
+            NoQueryHttpRequestHandler.extensions_map, **{".txt": "text/html"}
+        )
+        requests = self.check(["file.txt"], extern=(0, 0))[1]
+        self.assertEqual(requests, [("HEAD", "file.txt"), ("GET", "file.txt")])
+
+    def test_content_plugins(self):
+        confargs = {"enabledplugins": ["AnchorCheck"]}
+        requests = self.check(["file.html"], confargs=confargs)[1]
+        self.assertEqual(requests, [("GET", "file.html")])
+
+    def test_head_not_allowed(self):
+        self.handler.head_status = 405
+        aggregate, requests = self.check(["file.html", "file.txt"])
+        self.assertEqual(
+            requests,
+            [("HEAD", "file.html"), ("GET", "file.html"), ("GET", "file.txt")],
+        )
+        self.assertEqual(aggregate.nohead_hosts, {"localhost:%d" % self.port})
+
+    def test_head_error(self):
+        """ Test, that an error response to HEAD is not repeated with GET """
+        self.handler.head_status = 404
+        aggregate, requests = self.check(["file.html", "file.txt"], valid=False)
+        self.assertEqual(requests, [("HEAD", "file.html"), ("HEAD", "file.txt")])
+        self.assertEqual(aggregate.nohead_hosts, set())
@@ -0,0 +1,53 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test checking unchanged http pages with the links of a previous check.
+"""
+import os
+import tempfile
+
+from .httpserver import HttpServerTest
+
+
+class TestHttpLinkStore(HttpServerTest):
+    """Test conditional GETs of http:// pages stored in a link store."""
+
+    def setUp(self):
+        super().setUp()
+        fd, self.filename = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.filename)
+
+    def test_not_modified(self):
+        confargs = dict(linkstore=self.filename)
+        self.file_test("http_file.html", confargs=confargs)
+        # the unchanged page is not downloaded again
+        url = self.get_url("http_file.html")
+        resultlines = self.get_resultlines("http_file.html")
+        resultlines.insert(
+            resultlines.index("real url %s" % url) + 1,
+            "info Content not modified, checking the stored links.",
+        )
+        self.direct(url, resultlines, recursionlevel=1, confargs=confargs)
+
+    def test_content_plugins(self):
+        """ Test, that no stored links are used with content plugins """
+        confargs = dict(linkstore=self.filename, enabledplugins=["AnchorCheck"])
+        self.file_test("http_file.html", confargs=confargs)
+        self.file_test("http_file.html", confargs=confargs)
@@ -31,6 +31,15 @@ class TestHttpMisc(HttpServerTest):
     def test_html(self):
         self.file_test("sitemapindex.xml")
 
+    def test_sitemap_content_plugin(self):
+        """ Test, that a sitemap whose type is read from the content is
+        parsed after a content plugin used the content """
+        confargs = {
+            "enabledplugins": ["RegexCheck"],
+            "RegexCheck": {"warningregex": "nomatch"},
+        }
+        self.file_test("sitemapindex.xml", confargs=confargs)
+
     def swf_test(self):
         url = self.get_url("test.swf")
         resultlines = [
@@ -16,8 +16,42 @@
 """
 Test http checking.
 """
+from unittest.mock import patch
+
+from linkcheck.cache.hosts import HostScheduler
 from tests import need_network
-from .httpserver import HttpServerTest, CookieRedirectHttpRequestHandler
+from .httpserver import (
+    HttpServerTest,
+    CookieRedirectHttpRequestHandler,
+    NoQueryHttpRequestHandler,
+)
+
+
+class RedirectChainHttpRequestHandler(NoQueryHttpRequestHandler):
+    """Handler redirecting along a chain of URLs, and recording the
+    requested paths."""
+
+    # redirected paths and their redirection targets
+    redirects = {
+        "/chain1": "/chain2",
+        "/chain2": "/tests/checker/data/newurl.html",
+        "/other": "/chain2",
+    }
+    paths = []
+
+    def do_GET(self):
+        """Record the path and redirect chain requests."""
+        self.paths.append(self.path)
+        if self.path in self.redirects:
+            self.send_response(302)
+            self.send_header("Location", self.redirects[self.path])
+            self.end_headers()
+        else:
+            super().do_GET()
+
+    def do_HEAD(self):
+        """Record the path and redirect chain requests."""
+        self.do_GET()
 
 
 class TestHttpRedirect(HttpServerTest):
@@ -105,3 +139,29 @@ class TestHttpRedirect(HttpServerTest):
         # url = "http://httpbin.org/redirect/" + max_redirect --> valid
         # url = "http://httpbin.org/redirect/" + (max_redirect+1) --> error
         pass  # XXX
+
+
+class TestHttpRedirectChain(HttpServerTest):
+    """Test caching of http:// redirection chains."""
+
+    def __init__(self, methodName="runTest"):
+        super().__init__(methodName=methodName)
+        self.handler = RedirectChainHttpRequestHandler
+
+    def test_redirect_chain(self):
+        del self.handler.paths[:]
+        # the crawl delay of the test server is not needed
+        with patch.object(HostScheduler, "wait", return_value=0.0):
+            self.file_test("chain.html", confargs=dict(recursionlevel=1))
+        # each redirection is followed once
+        paths = [path for path in self.handler.paths if path != "/robots.txt"]
+        self.assertEqual(
+            sorted(paths),
+            [
+                "/chain1",
+                "/chain2",
+                "/other",
+                "/tests/checker/data/chain.html",
+                "/tests/checker/data/newurl.html",
+            ],
+        )
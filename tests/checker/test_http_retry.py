@@ -0,0 +1,90 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test retries of http URLs with temporary failures.
+"""
+from linkcheck.checker import get_url_from
+from . import get_test_aggregate
+from .httpserver import HttpServerTest, NoQueryHttpRequestHandler
+
+
+class RetryHttpRequestHandler(NoQueryHttpRequestHandler):
+    """Handler answering /retry/<failures>/<status> with the given status
+    for the given number of requests and with 200 after that."""
+
+    requests = {}
+
+    def do_GET(self):
+        if "retry/" not in self.path:
+            return super().do_GET()
+        self.send_retry_response()
+        self.wfile.write(b"testcontent")
+
+    def do_HEAD(self):
+        if "retry/" not in self.path:
+            return super().do_HEAD()
+        self.send_retry_response()
+
+    def send_retry_response(self):
+        dummy, failures, status = self.path.rsplit("/", 2)
+        count = self.requests.get(self.path, 0)
+        self.requests[self.path] = count + 1
+        if count < int(failures):
+            self.send_response(int(status))
+            self.send_header("Retry-After", "0")
+        else:
+            self.send_response(200)
+        self.end_headers()
+
+
+class TestHttpRetry(HttpServerTest):
+    """Test retries of http:// links."""
+
+    def __init__(self, methodName="runTest"):
+        super().__init__(methodName=methodName)
+        self.handler = RetryHttpRequestHandler
+
+    def test_retry(self):
+        url = "http://localhost:%d/retry/1/429" % self.port
+        resultlines = [
+            "url %s" % url,
+            "cache key %s" % url,
+            "real url %s" % url,
+            "valid",
+        ]
+        self.direct(url, resultlines)
+
+    def test_retries_exceeded(self):
+        url = "http://localhost:%d/retry/3/503" % self.port
+        resultlines = [
+            "url %s" % url,
+            "cache key %s" % url,
+            "real url %s" % url,
+            "error",
+        ]
+        self.direct(url, resultlines, confargs=dict(maxretries=1))
+
+    def test_get_retry(self):
+        aggregate = get_test_aggregate({}, {"expected": []})
+        url = "http://localhost:%d/retry/1/503" % self.port
+        url_data = get_url_from(url, 0, aggregate, extern=(1, 0))
+        internlinks = list(aggregate.config["internlinks"])
+        retry = url_data.get_retry()
+        self.assertIs(type(retry), type(url_data))
+        self.assertEqual(retry.url, url_data.url)
+        self.assertEqual(retry.extern, (1, 0))
+        self.assertEqual(retry.attempts, url_data.attempts + 1)
+        self.assertEqual(aggregate.config["internlinks"], internlinks)
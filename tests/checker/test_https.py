@@ -16,16 +16,15 @@
 """
 Test https.
 """
-import datetime
 from unittest.mock import patch
 
-from cryptography import x509
-from cryptography.x509.oid import NameOID
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
 from OpenSSL import crypto
 
-from .httpserver import HttpsServerTest, CookieRedirectHttpRequestHandler
+from .httpserver import (
+    HttpsServerTest,
+    CookieRedirectHttpRequestHandler,
+    write_certificate,
+)
 from .. import get_file
 
 from linkcheck import httputil
@@ -42,42 +41,7 @@ class TestHttps(HttpsServerTest):
 
     @classmethod
     def setUpClass(cls):
-        key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-        )
-
-        with open(get_file("https_key.pem"), "wb") as f:
-            f.write(key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.TraditionalOpenSSL,
-                encryption_algorithm=serialization.NoEncryption(),
-            ))
-
-        subject = issuer = x509.Name([
-            x509.NameAttribute(NameOID.ORGANIZATION_NAME, "LinkChecker"),
-            x509.NameAttribute(NameOID.COMMON_NAME, "linkchecker.github.io"),
-        ])
-
-        cert = x509.CertificateBuilder().subject_name(
-            subject
-        ).issuer_name(
-            issuer
-        ).public_key(
-            key.public_key()
-        ).serial_number(
-            x509.random_serial_number()
-        ).not_valid_before(
-            datetime.datetime.now(datetime.timezone.utc)
-        ).not_valid_after(
-            datetime.datetime(2119, 1, 2, 3, 4, 5)
-        ).add_extension(
-            x509.SubjectAlternativeName([x509.DNSName("localhost")]),
-            critical=False,
-        ).sign(key, hashes.SHA256())
-
-        with open(get_file("https_cert.pem"), "wb") as f:
-            f.write(cert.public_bytes(serialization.Encoding.PEM))
+        write_certificate()
 
     def test_https(self):
         url = self.get_url("")
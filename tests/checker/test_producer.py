@@ -0,0 +1,56 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test queueing input URLs while checking.
+"""
+import linkcheck.director
+from linkcheck.checker import get_url_from
+from . import LinkCheckTest, get_test_aggregate
+
+
+class TestProducer(LinkCheckTest):
+    """
+    Test URLs queued by a producer thread.
+    """
+
+    def check_input(self, names, threads):
+        """Check the given data files put into the queue by a producer."""
+        urls = ["file://%s/%s" % (self.get_attrs()["curdir"], name) for name in names]
+        resultlines = []
+        for url in urls:
+            nurl = self.norm(url)
+            resultlines.extend(
+                ["url %s" % url, "cache key %s" % nurl, "real url %s" % nurl, "valid"]
+            )
+        confargs = {"recursionlevel": 0, "threads": threads}
+        aggregate = get_test_aggregate(confargs, {"expected": resultlines})
+        aggregate.add_producer(
+            get_url_from(url, 0, aggregate, extern=(0, 0)) for url in urls
+        )
+        linkcheck.director.check_urls(aggregate)
+        logger = aggregate.config["logger"]
+        self.assertEqual(logger.diff, [])
+        self.assertEqual(logger.stats.internal_errors, 0)
+
+    def test_threads(self):
+        names = ["tests/checker/data/file.%s" % ext for ext in ("txt", "asc", "css")]
+        self.check_input(names, 2)
+
+    def test_no_threads(self):
+        self.check_input(["tests/checker/data/file.txt"], 0)
+
+    def test_empty(self):
+        self.check_input([], 2)
@@ -0,0 +1,132 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test the attributes of the URL checker classes.
+"""
+import unittest
+
+from linkcheck import parser
+from linkcheck.checker import get_url_from
+from tests import get_file
+from . import get_test_aggregate
+
+
+class TestUrlData(unittest.TestCase):
+    def setUp(self):
+        self.aggregate = get_test_aggregate({}, {"expected": []})
+
+    def get_url_data(self, url):
+        return get_url_from(url, 0, self.aggregate, extern=(0, 0))
+
+    def test_slots(self):
+        """ Test, that URL objects of all checker classes have no
+        instance dictionary """
+        for url in (
+            "http://example.org/",
+            "https://example.org/",
+            "ftp://example.org/",
+            "file:///tmp/",
+            "mailto:user@example.org",
+            "dns:example.org",
+            "itms-services://?action=download-manifest",
+            "javascript:loadthis()",
+            "foo:bar",
+        ):
+            url_data = self.get_url_data(url)
+            self.assertFalse(hasattr(url_data, "__dict__"), url)
+
+    def test_lazy_attributes(self):
+        url_data = self.get_url_data("http://example.org/")
+        aliases = url_data.aliases
+        self.assertEqual(aliases, [])
+        self.assertIs(url_data.aliases, aliases)
+        self.assertEqual(url_data.headers, {})
+        self.assertIsNone(url_data.ssl_cert)
+        url_data.ssl_cert = {"subject": ()}
+        self.assertEqual(url_data.ssl_cert, {"subject": ()})
+        self.assertFalse(hasattr(url_data, "session"))
+        with self.assertRaises(AttributeError):
+            url_data.nonexistent
+
+    def test_no_http_attributes(self):
+        url_data = self.get_url_data("file:///tmp/")
+        self.assertEqual(url_data.aliases, [])
+        with self.assertRaises(AttributeError):
+            url_data.headers
+        with self.assertRaises(AttributeError):
+            url_data.nonexistent = True
+
+
+class TestContentUsers(unittest.TestCase):
+    def setUp(self):
+        aggregate = get_test_aggregate({}, {"expected": []})
+        self.url_data = get_url_from(get_file("file.html"), 0, aggregate)
+        self.url_data.check()
+
+    def get_content(self):
+        return (self.url_data.data, self.url_data.text, self.url_data.soup)
+
+    def test_release_after_last_user(self):
+        url_data = self.url_data
+        url_data.add_content_users(("soup",))
+        url_data.add_content_users(("text",))
+        url_data.get_content()
+        url_data.remove_content_users(("text",))
+        data, text, soup = self.get_content()
+        self.assertIsNone(data)
+        self.assertIsNone(text)
+        self.assertIsNotNone(soup)
+        url_data.remove_content_users(("soup",))
+        self.assertEqual(self.get_content(), (None, None, None))
+
+    def test_keep_sources(self):
+        """ Test, that the raw data is kept for a user of content which
+        has not been produced yet """
+        url_data = self.url_data
+        url_data.add_content_users(("soup",))
+        url_data.get_raw_content()
+        url_data.release_unused_content()
+        self.assertIsNotNone(url_data.data)
+        url_data.get_soup()
+        url_data.release_unused_content()
+        self.assertIsNone(url_data.data)
+        self.assertIsNotNone(url_data.soup)
+        url_data.release_content()
+        self.assertEqual(self.get_content(), (None, None, None))
+
+    def test_content_budget(self):
+        url_data = self.url_data
+        budget = url_data.aggregate.content_budget
+        used = budget.used
+        data = url_data.get_raw_content()
+        self.assertEqual(budget.used, used + len(data))
+        url_data.get_soup()
+        self.assertEqual(
+            budget.used, used + len(data) * (1 + url_data.SoupSizeFactor)
+        )
+        url_data.release_content()
+        self.assertEqual(budget.used, 0)
+
+    def test_soup_without_text(self):
+        self.url_data.get_soup()
+        self.assertIsNone(self.url_data.text)
+
+    def test_parser_content_forms(self):
+        self.assertEqual(parser.get_content_forms(self.url_data), ("soup",))
+        self.url_data.content_type = "application/x-plist+safari"
+        self.assertEqual(parser.get_content_forms(self.url_data), ("data",))
+        self.url_data.content_type = "application/octet-stream"
+        self.assertEqual(parser.get_content_forms(self.url_data), ())
@@ -0,0 +1,70 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test the compact URL data sent to loggers.
+"""
+import copy
+import pickle
+import unittest
+
+from linkcheck.checker.urlbase import CompactUrlData, urlDataAttr
+
+
+def get_url_data(url, parent_url, cache_url=None):
+    """Return compact URL data with given URL, parent URL and cache key,
+    which is the URL by default."""
+    wired = dict.fromkeys(urlDataAttr)
+    wired.update(
+        valid=True,
+        warnings=[],
+        info=[],
+        name="",
+        title="",
+        content_type="",
+        checktime=0,
+        dltime=-1,
+        size=-1,
+        url=url,
+        cache_url=url if cache_url is None else cache_url,
+        parent_url=parent_url,
+    )
+    return CompactUrlData(wired)
+
+
+class TestCompactUrlData(unittest.TestCase):
+    def test_cache_url(self):
+        """ Test, that an equal cache key shares the URL string """
+        url = "http://example.org/a"
+        cache_url = "".join(["http://example.org/", "a"])
+        self.assertIsNot(cache_url, url)
+        url_data = get_url_data(url, "", cache_url=cache_url)
+        self.assertIs(url_data.cache_url, url_data.url)
+
+    def test_copy(self):
+        url_data = get_url_data("http://example.org/a", "http://example.org/")
+        other = copy.copy(url_data)
+        other.parent_url = "http://example.net/"
+        self.assertEqual(url_data.parent_url, "http://example.org/")
+        self.assertEqual(other.parent_url, "http://example.net/")
+        self.assertEqual(other.url, url_data.url)
+
+    def test_pickle(self):
+        url_data = get_url_data("http://example.org/a", "http://example.org/")
+        state = pickle.dumps(url_data)
+        self.assertIn(b"http://example.org/", state)
+        other = pickle.loads(state)
+        self.assertEqual(other.parent_url, "http://example.org/")
+        self.assertEqual(other.url, "http://example.org/a")
@@ -55,10 +55,24 @@ class TestConfig(TestBase):
         self.assertEqual(config["sslverify"], "/path/to/cacerts.crt")
         self.assertEqual(config["maxnumurls"], 1000)
         self.assertEqual(config["maxrequestspersecond"], 0.1)
+        self.assertTrue(config["hostfrontier"])
+        self.assertEqual(config["maxretries"], 5)
+        self.assertEqual(config["maxurlsinmemory"], 1000)
+        self.assertEqual(config["maxcontentinmemory"], 100000000)
+        self.assertEqual(config["maxconnections"], 50)
+        self.assertEqual(config["maxconnectionsperhost"], 5)
+        self.assertEqual(config["connectionidletime"], 10)
+        self.assertTrue(config["http2"])
+        self.assertEqual(config["dnscachetime"], 60)
+        self.assertEqual(config["linkstore"], "linkstore.sqlite")
+        self.assertEqual(config["externcache"], "externcache.sqlite")
+        self.assertEqual(config["externcachevalid"], 100)
+        self.assertEqual(config["externcacheinvalid"], 10)
         self.assertEqual(config["maxrunseconds"], 1)
         self.assertEqual(config["maxfilesizeparse"], 100)
         self.assertEqual(config["maxfilesizedownload"], 100)
         self.assertEqual(config["resultcachesize"], 9999)
+        self.assertEqual(config["bloomfiltersize"], 1000000)
         # filtering section
         patterns = [x["pattern"].pattern for x in config["externlinks"]]
         for prefix in ("ignore_", "nofollow_"):
@@ -0,0 +1,48 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import os
+import tempfile
+
+from linkcheck.logger.gml import GMLLogger
+
+from .. import TestBase
+from ..checker.test_wire import get_url_data
+
+
+class TestGMLLogger(TestBase):
+    def test_edges(self):
+        fd, filename = tempfile.mkstemp(suffix=".gml")
+        os.close(fd)
+        logger = GMLLogger(filename=filename, fileoutput=1, parts=["realurl"])
+        try:
+            logger.start_output()
+            for url, parent_url in (
+                ("http://example.org/", ""),
+                ("http://example.org/a", "http://example.org/"),
+                ("http://example.org/a", "http://example.org/"),
+                ("http://example.org/b", "http://example.org/a"),
+            ):
+                logger.log_filter_url(get_url_data(url, parent_url), True)
+            logger.end_output()
+            with open(filename) as f:
+                lines = [line.strip() for line in f]
+        finally:
+            os.remove(filename)
+        self.assertEqual(lines.count("node ["), 3)
+        sources = [line for line in lines if line.startswith("source")]
+        targets = [line for line in lines if line.startswith("target")]
+        self.assertEqual(sources, ["source 0", "source 1"])
+        self.assertEqual(targets, ["target 1", "target 2"])
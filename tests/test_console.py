@@ -17,6 +17,8 @@
 Test console operations.
 """
 
+import io
+
 import linkcheck.director.console
 
 from . import TestBase
@@ -27,3 +29,32 @@ class TestConsole(TestBase):
 
     def test_internal_error(self):
         linkcheck.director.console.internal_error()
+
+    def test_log_status(self):
+        fd = io.StringIO()
+        logger = linkcheck.director.console.StatusLogger(fd=fd)
+        hosts = (3, 1, ("example.org", 0.5, 1))
+        logger.log_status(2, 1, 10, 5, 3, hosts=hosts)
+        self.assertIn(
+            "1 of 3 hosts slowed down (slowest example.org: 0.50 requests/s, "
+            "1 connection)", fd.getvalue())
+        fd = io.StringIO()
+        logger = linkcheck.director.console.StatusLogger(fd=fd)
+        hosts = (1, 1, ("example.org", 0.5, 2))
+        logger.log_status(2, 1, 10, 5, 3, hosts=hosts)
+        self.assertIn("1 of 1 host slowed down", fd.getvalue())
+        fd = io.StringIO()
+        logger = linkcheck.director.console.StatusLogger(fd=fd)
+        logger.log_status(2, 1, 10, 5, 3, hosts=(3, 0, None))
+        self.assertNotIn("slowed down", fd.getvalue())
+        self.assertNotIn("content in memory", fd.getvalue())
+
+    def test_log_status_content(self):
+        fd = io.StringIO()
+        logger = linkcheck.director.console.StatusLogger(fd=fd)
+        logger.log_status(2, 1, 10, 5, 3, content=(2048, 0))
+        self.assertIn(" 2KB content in memory, ", fd.getvalue())
+        fd = io.StringIO()
+        logger = linkcheck.director.console.StatusLogger(fd=fd)
+        logger.log_status(2, 1, 10, 5, 3, content=(0, 1024 * 1024))
+        self.assertIn(" 0B of 1.00MB content in memory, ", fd.getvalue())
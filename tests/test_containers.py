@@ -59,3 +59,103 @@ class TestLFUCache(unittest.TestCase):
             self.d[i] = i
         self.d[1001] = 1001
         self.assertTrue(950 <= len(self.d) <= self.size)
+
+
+class TestFingerprintSet(unittest.TestCase):
+    """Test fingerprint set implementation."""
+
+    def setUp(self):
+        self.s = linkcheck.containers.FingerprintSet(8)
+
+    def test_add(self):
+        self.assertTrue(self.s.add(3))
+        self.assertFalse(self.s.add(3))
+        self.assertTrue(self.s.add(0))
+        self.assertIn(3, self.s)
+        self.assertIn(0, self.s)
+        self.assertNotIn(11, self.s)
+        self.assertEqual(len(self.s), 2)
+
+    def test_resize(self):
+        values = [i * 2**40 + i for i in range(1000)]
+        for value in values:
+            self.s.add(value)
+        self.assertEqual(len(self.s), 1000)
+        # fingerprint 0 is stored as 1
+        self.assertEqual(sorted(self.s), [1] + values[1:])
+        self.assertTrue(all(value in self.s for value in values))
+        self.assertLessEqual(self.s.get_memory(), 16 * 1000 * 2)
+
+    def test_resize_contains(self):
+        # readers without lock find all values while the table grows
+        values = list(range(1, 5))
+        for value in values:
+            self.s.add(value)
+        find = self.s.find
+        missing = []
+
+        def check_find(slots, value):
+            # look up the values with the unpatched function
+            self.s.find = find
+            missing.extend(v for v in values if v not in self.s)
+            self.s.find = check_find
+            return find(slots, value)
+
+        self.s.find = check_find
+        self.s.add(5)
+        self.s.find = find
+        self.assertEqual(missing, [])
+        self.assertEqual(len(self.s.slots[0]), 16)
+        self.assertTrue(all(value in self.s for value in values + [5]))
+
+    def test_discard(self):
+        # values with home slots 7 and 0 wrap around the table end
+        values = [7, 15, 8, 23, 1]
+        for value in values:
+            self.s.add(value)
+        for value in values:
+            self.s.discard(value)
+            self.assertNotIn(value, self.s)
+            rest = values[values.index(value) + 1:]
+            self.assertTrue(all(other in self.s for other in rest), rest)
+        self.assertEqual(len(self.s), 0)
+        self.s.discard(42)
+
+    def test_copy_update(self):
+        self.s.add(1)
+        other = self.s.copy()
+        other.add(2)
+        self.assertNotIn(2, self.s)
+        self.s.update(other)
+        self.assertEqual(sorted(self.s), [1, 2])
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Test Bloom filter implementation."""
+
+    def setUp(self):
+        self.f = linkcheck.containers.BloomFilter(1000, 0.01)
+
+    def get_values(self, start, num):
+        """Return num pseudo-random 64 bit values."""
+        return [hash(("value", i)) & 0xFFFFFFFFFFFFFFFF for i in range(start, num)]
+
+    def test_error_rate(self):
+        for value in self.get_values(0, 1000):
+            self.f.add(value)
+        self.assertTrue(all(v in self.f for v in self.get_values(0, 1000)))
+        errors = sum(v in self.f for v in self.get_values(1000, 11000))
+        self.assertLess(errors, 300)
+        self.assertAlmostEqual(self.f.get_error_rate(), 0.01, delta=0.005)
+        self.assertLess(self.f.get_memory(), 2000)
+
+    def test_copy_update(self):
+        self.assertTrue(self.f.add(1))
+        self.assertFalse(self.f.add(1))
+        other = self.f.copy()
+        other.add(2)
+        self.assertNotIn(2, self.f)
+        self.f.update(other)
+        self.assertIn(2, self.f)
+        with self.assertRaises(ValueError):
+            self.f.update(linkcheck.containers.BloomFilter(10))
@@ -0,0 +1,38 @@
+# Copyright (C) 2026 LinkChecker Authors
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Test http utility functions.
+"""
+
+import email.utils
+import time
+import unittest
+
+import linkcheck.httputil
+
+
+class TestHttputil(unittest.TestCase):
+    """Test http utility functions."""
+
+    def test_retry_after(self):
+        get_retry_after = linkcheck.httputil.get_retry_after
+        self.assertIsNone(get_retry_after({}))
+        self.assertIsNone(get_retry_after({"Retry-After": "soon"}))
+        self.assertEqual(get_retry_after({"Retry-After": "120"}), 120)
+        date = email.utils.formatdate(time.time() + 60, usegmt=True)
+        self.assertAlmostEqual(get_retry_after({"Retry-After": date}), 60, delta=2)
+        date = email.utils.formatdate(time.time() - 60, usegmt=True)
+        self.assertEqual(get_retry_after({"Retry-After": date}), 0)
@@ -135,6 +135,28 @@ class TestRobotsTxt(unittest.TestCase):
         del lines[1]
         self.assertEqual(str(self.rp), "\n".join(lines))
 
+    def test_crawldelay3(self):
+        lines = [
+            "User-agent: *",
+            "Crawl-delay: 0.5",
+            "",
+            "User-agent: Blubb",
+            "Crawl-delay: 2.5",
+        ]
+        self.rp.parse(lines)
+        self.assertEqual(self.rp.get_crawldelay("Blubb"), 2.5)
+        self.assertEqual(self.rp.get_crawldelay("Bulla"), 0.5)
+
+    def test_crawldelay4(self):
+        lines = [
+            "User-agent: Blubb",
+            "Crawl-delay: inf",
+        ]
+        self.rp.parse(lines)
+        del lines[1]
+        self.assertEqual(str(self.rp), "\n".join(lines))
+        self.assertEqual(self.rp.get_crawldelay("Blubb"), 0)
+
     def check_urls(self, good, bad, agent="test_robotparser"):
         for url in good:
             self.check_url(agent, url, True)